@@ -0,0 +1,408 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import hashlib
+import json
+import logging
+import os
+import time
+
+import telegram
+
+import cursor
+import deadline
+import delivery
+import diff
+import error_digest
+import homework
+import metrics
+import pipeline
+import state
+
+
+ACCOUNTS_LOADED = 'Загружено аккаунтов: {count}.'
+ACCOUNTS_FILE_ERROR = (
+    'Файл аккаунтов {path} должен содержать список объектов '
+    'с ключами "practicum_token" и "telegram_chat_id"!'
+)
+ACCOUNT_DUPLICATE = (
+    'Аккаунт с чатом {chat_id} и тем же токеном указан в файле {path} '
+    'дважды!'
+)
+ACCOUNT_POLL_ERROR = 'Сбой при опросе аккаунта {chat_id}: {error}'
+POLL_ROUND_DONE = 'Опрошено аккаунтов: {count} за {elapsed:.2f} с.'
+
+MAX_WORKERS = 32
+VALIDATE_WORKERS = 1
+NOTIFY_WORKERS = 4
+
+
+class Account:
+    """Отслеживаемый аккаунт: токен Практикума и чат Telegram."""
+
+    __slots__ = (
+        'token', 'chat_id', 'key', 'timestamp', 'index', 'errors',
+        'inflight', 'delivered'
+    )
+
+    def __init__(self, token, chat_id, timestamp=0):
+        self.token = token
+        self.chat_id = chat_id
+        self.key = account_key(token, chat_id)
+        self.timestamp = timestamp
+        self.reset()
+
+    def reset(self):
+        """Сброс состояния в памяти перед восстановлением из хранилища."""
+        self.index = diff.HomeworkIndex()
+        self.errors = error_digest.ErrorDigest()
+        self.inflight = {}
+        self.delivered = deque()
+
+    @property
+    def headers(self):
+        """Заголовки API-запроса аккаунта."""
+        return {'Authorization': f'OAuth {self.token}'}
+
+
+def account_key(token, chat_id):
+    """Постоянный ключ аккаунта: хеш токена Практикума и чата Telegram.
+
+    У одного чата может быть несколько токенов, поэтому чата для ключа
+    мало, а сам токен в общие базы не попадает.
+    """
+    return hashlib.sha256(f'{token}\0{chat_id}'.encode()).hexdigest()[:32]
+
+
+def load_accounts(path, timestamp=None):
+    """Загрузка реестра аккаунтов из JSON-файла без повторов."""
+    with open(path, encoding='utf-8') as file:
+        records = json.load(file)
+    if timestamp is None:
+        timestamp = int(time.time())
+    try:
+        accounts = [
+            Account(
+                record['practicum_token'],
+                record['telegram_chat_id'],
+                timestamp
+            )
+            for record in records
+        ]
+    except (KeyError, TypeError) as error:
+        raise ValueError(ACCOUNTS_FILE_ERROR.format(path=path)) from error
+    keys = set()
+    for account in accounts:
+        if account.key in keys:
+            raise ValueError(ACCOUNT_DUPLICATE.format(
+                chat_id=account.chat_id,
+                path=path
+            ))
+        keys.add(account.key)
+    logging.info(ACCOUNTS_LOADED.format(count=len(accounts)))
+    return accounts
+
+
+class AccountPoller:
+    """Опрос множества аккаунтов из одного процесса."""
+
+    delivery_wait = 0
+
+    def __init__(self, accounts, bot, max_workers=MAX_WORKERS,
+                 endpoint=None, store=None, delivery=None,
+                 budget=deadline.ITERATION_BUDGET):
+        self.accounts = accounts
+        self.budget = budget
+        self.bot = bot
+        self.delivery = delivery
+        self.endpoint = endpoint
+        self.store = store or state.NullStore()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        for account in accounts:
+            self.restore(account)
+
+    def restore(self, account):
+        """Восстановление сохранённого состояния аккаунта."""
+        saved = self.store.load(account.key)
+        account.index.on_commit = partial(
+            self.store.save_homework, account.key
+        )
+        account.index.restore(saved.homeworks)
+        account.timestamp = saved.from_date or account.timestamp
+        account.errors.restore(saved.error)
+
+    def notify(self, account, message):
+        """Отправка сообщения в чат аккаунта.
+
+        С очередью доставки сообщение считается отправленным, как только
+        оно принято в очередь.
+        """
+        if self.delivery is not None:
+            return self.delivery.submit(
+                account.chat_id, message, wait=self.delivery_wait
+            )
+        return homework.send_chat_message(self.bot, account.chat_id, message)
+
+    def notify_status(self, account, work, verdict):
+        """Отправка нового статуса работы в чат аккаунта.
+
+        Без очереди доставки статус запоминается сразу после отправки.
+        С очередью - только когда она доставит сообщение: до этого работа
+        числится в пути и в очередь повторно не ставится, а после сбоя
+        доставки уведомление повторяется при следующем опросе.
+        """
+        if self.delivery is None:
+            if not self.notify(account, verdict):
+                return False
+            account.index.commit(work)
+            return True
+        key = diff.homework_key(work)
+        current = (work.get('status'), work.get('date_updated'))
+        if account.inflight.get(key) == current:
+            return True
+        if not self.delivery.submit(
+                account.chat_id, verdict, wait=self.delivery_wait,
+                on_done=partial(self.delivered, account, work)):
+            return False
+        account.inflight[key] = current
+        return True
+
+    def delivered(self, account, work, sent):
+        """Итог доставки статуса, из потока очереди доставки."""
+        account.delivered.append((work, sent))
+
+    def settle_deliveries(self, account):
+        """Запоминание статусов, уже доставленных очередью.
+
+        Очередь сообщает итог из своего потока, а индекс аккаунта меняется
+        только в потоке его опроса.
+        """
+        while account.delivered:
+            work, sent = account.delivered.popleft()
+            key = diff.homework_key(work)
+            if account.inflight.get(key) == (
+                    work.get('status'), work.get('date_updated')):
+                del account.inflight[key]
+            if sent:
+                account.index.commit(work)
+
+    def notify_transitions(self, account, homeworks):
+        """Уведомление обо всех работах аккаунта с изменившимся статусом.
+
+        Возвращает True, если изменения были и все они отправлены или
+        приняты в очередь.
+        """
+        changed = account.index.transitions(homeworks)
+        if not changed:
+            logging.debug(homework.STATUS_HAS_NOT_CHANGED)
+            return False
+        for work in reversed(changed):
+            if not self.notify_status(
+                    account, work, homework.format_status(work)):
+                return False
+        return True
+
+    def poll_account(self, account):
+        """Один цикл опроса аккаунта, возвращает признак уведомления."""
+        self.settle_deliveries(account)
+        self.send_digest(account)
+        try:
+            with deadline.budget(self.budget):
+                response = homework.request_homeworks(
+                    account.timestamp, account.headers, self.endpoint
+                )
+                homeworks = homework.timed_check(response)['homeworks']
+                notified = bool(homeworks) and self.notify_transitions(
+                    account, homeworks
+                )
+                self.advance(account, response)
+                return notified
+        except Exception as error:
+            return self.report_error(account, error)
+
+    def report_error(self, account, error):
+        """Учёт сбоя опроса; True, если о нём сообщено в чат."""
+        metrics.ERRORS.inc(type(error).__name__)
+        message = homework.EXCEPTION_ERROR.format(error=error)
+        logging.error(ACCOUNT_POLL_ERROR.format(
+            chat_id=account.chat_id,
+            error=error
+        ))
+        key = account.errors.add(error)
+        if key and self.notify(account, message):
+            account.errors.mark_reported(key)
+            self.store.save_error(account.key, key)
+            return True
+        return False
+
+    def advance(self, account, response):
+        """Сдвиг курсора from_date аккаунта после проверенного ответа."""
+        from_date = cursor.advance(
+            account.timestamp, response,
+            account.index.undelivered(), time.time()
+        )
+        if from_date != account.timestamp:
+            account.timestamp = from_date
+            self.store.save_cursor(account.key, from_date)
+
+    def send_digest(self, account):
+        """Сводка повторяющихся ошибок аккаунта по окончании окна."""
+        digest = account.errors.pop_digest()
+        if digest:
+            self.notify(account, digest)
+
+    def poll_all(self):
+        """Опрос всех аккаунтов с ограниченной параллельностью."""
+        started = time.monotonic()
+        notified = list(self.executor.map(self.poll_account, self.accounts))
+        self.store.maybe_flush()
+        logging.info(POLL_ROUND_DONE.format(
+            count=len(self.accounts),
+            elapsed=time.monotonic() - started
+        ))
+        return notified
+
+    def shutdown(self):
+        """Остановка пула потоков."""
+        self.executor.shutdown(wait=True)
+
+
+class PollJob:
+    """Опрос одного аккаунта, проходящий по этапам конвейера."""
+
+    __slots__ = ('account', 'response', 'verdicts', 'notified')
+
+    def __init__(self, account):
+        self.account = account
+        self.response = None
+        self.verdicts = ()
+        self.notified = False
+
+
+class PipelinePoller(AccountPoller):
+    """Опрос аккаунтов конвейером: запрос, проверка, уведомление.
+
+    У каждого этапа свой пул потоков; очереди между этапами ограничены,
+    а очередь доставки при переполнении ждёт места, поэтому медленный
+    Telegram замедляет запросы к API.
+    """
+
+    def __init__(self, accounts, bot, fetch_workers=MAX_WORKERS,
+                 validate_workers=VALIDATE_WORKERS,
+                 notify_workers=NOTIFY_WORKERS,
+                 queue_size=pipeline.QUEUE_SIZE, **kwargs):
+        super().__init__(accounts, bot, max_workers=1, **kwargs)
+        self.delivery_wait = self.budget
+        self.pipeline = pipeline.Pipeline([
+            pipeline.Stage('fetch', self.fetch, fetch_workers, queue_size),
+            pipeline.Stage(
+                'validate', self.validate, validate_workers, queue_size
+            ),
+            pipeline.Stage('notify', self.deliver, notify_workers, queue_size),
+        ], on_error=self.stage_failed)
+
+    def fetch(self, job):
+        """Этап запроса к API."""
+        self.settle_deliveries(job.account)
+        self.send_digest(job.account)
+        with deadline.budget(self.budget):
+            job.response = homework.request_homeworks(
+                job.account.timestamp, job.account.headers, self.endpoint
+            )
+        return job
+
+    def validate(self, job):
+        """Этап проверки ответа и подготовки текстов уведомлений."""
+        homeworks = homework.timed_check(job.response)['homeworks']
+        if homeworks:
+            job.verdicts = [
+                (work, homework.format_status(work))
+                for work in reversed(job.account.index.transitions(homeworks))
+            ]
+        return job
+
+    def deliver(self, job):
+        """Этап отправки уведомлений и сдвига курсора."""
+        account = job.account
+        with deadline.budget(self.budget):
+            for work, verdict in job.verdicts:
+                if not self.notify_status(account, work, verdict):
+                    break
+            else:
+                job.notified = bool(job.verdicts)
+            self.advance(account, job.response)
+
+    def stage_failed(self, stage, job, error):
+        """Сбой любого этапа обрабатывается как сбой опроса аккаунта."""
+        job.notified = self.report_error(job.account, error)
+
+    def poll_all(self):
+        """Опрос всех аккаунтов через конвейер."""
+        started = time.monotonic()
+        jobs = [PollJob(account) for account in self.accounts]
+        for job in jobs:
+            self.pipeline.submit(job)
+        self.pipeline.join()
+        self.store.maybe_flush()
+        logging.info(POLL_ROUND_DONE.format(
+            count=len(jobs),
+            elapsed=time.monotonic() - started
+        ))
+        return [job.notified for job in jobs]
+
+    def shutdown(self):
+        """Остановка потоков конвейера."""
+        self.pipeline.stop()
+        super().shutdown()
+
+
+def pipeline_settings():
+    """Параллельность этапов и размер очередей из переменных окружения."""
+    return {
+        'fetch_workers': int(os.getenv('PIPELINE_FETCH_WORKERS', MAX_WORKERS)),
+        'validate_workers': int(
+            os.getenv('PIPELINE_VALIDATE_WORKERS', VALIDATE_WORKERS)
+        ),
+        'notify_workers': int(
+            os.getenv('PIPELINE_NOTIFY_WORKERS', NOTIFY_WORKERS)
+        ),
+        'queue_size': int(
+            os.getenv('PIPELINE_QUEUE_SIZE', pipeline.QUEUE_SIZE)
+        ),
+    }
+
+
+def main(path):
+    """Основная логика работы бота в мультиаккаунтном режиме."""
+    if not homework.TELEGRAM_TOKEN:
+        logging.critical(homework.TOKENS_ERROR.format(
+            env_vars=['TELEGRAM_TOKEN']
+        ))
+        raise ValueError(homework.TOKENS_ERROR.format(
+            env_vars=['TELEGRAM_TOKEN']
+        ))
+    bot = telegram.Bot(token=homework.TELEGRAM_TOKEN)
+    queue = delivery.DeliveryQueue(bot)
+    metrics.REGISTRY.gauge(
+        'homework_delivery_queue_depth',
+        'Сообщения, ожидающие отправки в Telegram.',
+        lambda: queue.depth
+    )
+    accounts = load_accounts(path)
+    shard_db = os.getenv('SHARD_DB')
+    poller = PipelinePoller(
+        [] if shard_db else accounts, bot,
+        store=state.open_store(os.getenv('STATE_DB')),
+        delivery=queue,
+        **pipeline_settings()
+    )
+    if shard_db:
+        import shard
+        shard.run(poller, accounts, shard_db)
+        return
+    wake_at = time.monotonic()
+    while True:
+        metrics.LOOP_LAG.observe(max(0, time.monotonic() - wake_at))
+        poller.poll_all()
+        wake_at = time.monotonic() + homework.RETRY_PERIOD
+        time.sleep(homework.RETRY_PERIOD)
@@ -0,0 +1,186 @@
+"""Склейка одинаковых запросов к API домашки и кэш ответов.
+
+Запуск общего прокси для нескольких процессов бота:
+API_PROXY_PORT=8899 python api_cache.py
+и в процессах бота API_PROXY_URL=http://127.0.0.1:8899/.
+"""
+from http import HTTPStatus
+import logging
+import os
+import threading
+import time
+
+from cachetools import TTLCache
+
+import metrics
+
+
+PROXY_LISTENING = 'Кэширующий прокси API на порту {port}, upstream {url}.'
+PROXY_UPSTREAM_ERROR = 'Ошибка запроса к API через прокси: {error}'
+
+CACHE_TTL = 5.0
+CACHE_SIZE = 1024
+PROXY_PORT = 8899
+FORWARDED_HEADERS = ('Authorization',)
+
+CACHE_REQUESTS = metrics.REGISTRY.counter(
+    'homework_api_cache_requests_total',
+    'Запросы к API домашки через кэш по результату.',
+    'result'
+)
+
+
+class Call:
+    """Выполняющийся запрос, результата которого ждут остальные."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Одновременные вызовы с одним ключом выполняются один раз."""
+
+    def __init__(self):
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def do(self, key, function):
+        """Результат function() и признак, что он получен чужим вызовом."""
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = function()
+            return call.result, False
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            call.done.set()
+
+
+def request_key(url, headers=None, params=None):
+    """Ключ запроса: адрес, токен и параметры без учёта порядка."""
+    headers = headers or {}
+    return (
+        url,
+        tuple(headers.get(name) for name in FORWARDED_HEADERS),
+        tuple(sorted((params or {}).items())),
+    )
+
+
+class CachingSession:
+    """Сессия с общим кэшем ответов и склейкой одинаковых запросов.
+
+    Кэшируются только ответы 200; ошибки получают лишь те, кто ждал
+    того же запроса одновременно.
+    """
+
+    def __init__(self, session, ttl=CACHE_TTL, maxsize=CACHE_SIZE,
+                 timer=time.monotonic):
+        self.session = session
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl, timer=timer)
+        self.cache_lock = threading.Lock()
+        self.flight = SingleFlight()
+        self.counters = dict.fromkeys(('hit', 'miss', 'coalesced'), 0)
+
+    def count(self, result):
+        with self.cache_lock:
+            self.counters[result] += 1
+        CACHE_REQUESTS.inc(result)
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        """GET-запрос с ответом из кэша, если он ещё свежий.
+
+        Кэш хранит ответы целиком, поэтому stream не передаётся дальше:
+        iter_content такого ответа отдаёт уже прочитанное тело.
+        """
+        kwargs.pop('stream', None)
+        key = request_key(url, headers, params)
+        with self.cache_lock:
+            response = self.cache.get(key)
+        if response is not None:
+            self.count('hit')
+            return response
+        response, coalesced = self.flight.do(
+            key, lambda: self.fetch(key, url, headers, params, **kwargs)
+        )
+        self.count('coalesced' if coalesced else 'miss')
+        return response
+
+    def fetch(self, key, url, headers, params, **kwargs):
+        response = self.session.get(
+            url, headers=headers, params=params, **kwargs
+        )
+        if response.status_code == HTTPStatus.OK:
+            with self.cache_lock:
+                self.cache[key] = response
+        return response
+
+    def stats(self):
+        """Попадания, промахи и склеенные запросы."""
+        with self.cache_lock:
+            return dict(self.counters, size=len(self.cache))
+
+
+class ProxyClient:
+    """Сессия, отправляющая запросы к API через общий прокси."""
+
+    def __init__(self, session, proxy_url):
+        self.session = session
+        self.proxy_url = proxy_url
+
+    def get(self, url, **kwargs):
+        return self.session.get(self.proxy_url, **kwargs)
+
+
+def serve_proxy(cache, upstream, port=PROXY_PORT, host='127.0.0.1'):
+    """Запуск кэширующего прокси в фоновом потоке."""
+    import http_endpoints
+    server = http_endpoints.start(
+        http_endpoints.ProxyHandler, 'api-proxy', (host, port),
+        cache=cache, upstream=upstream
+    )
+    logging.info(PROXY_LISTENING.format(
+        port=server.server_port,
+        url=upstream
+    ))
+    return server
+
+
+def wrap_session(session):
+    """Сессия бота с учётом API_PROXY_URL и API_CACHE_TTL."""
+    proxy_url = os.getenv('API_PROXY_URL')
+    if proxy_url:
+        return ProxyClient(session, proxy_url)
+    ttl = float(os.getenv('API_CACHE_TTL', 0))
+    if ttl > 0:
+        return CachingSession(session, ttl=ttl)
+    return session
+
+
+if __name__ == '__main__':
+    import homework
+    import http_session
+
+    logging.basicConfig(level=logging.INFO)
+    serve_proxy(
+        CachingSession(
+            http_session.ApiSession.from_env(),
+            ttl=float(os.getenv('API_CACHE_TTL', CACHE_TTL))
+        ),
+        homework.ENDPOINT,
+        int(os.getenv('API_PROXY_PORT', PROXY_PORT))
+    )
+    threading.Event().wait()
@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+from functools import partial
+import logging
+import os
+import time
+
+import telegram
+
+import audio
+import cursor
+import deadline
+import diff
+import error_digest
+from exceptions import DeadlineExceeded
+import homework
+import metrics
+import scheduler
+import state
+
+
+async def run_blocking(context, func, *args):
+    """Блокирующий вызов в пуле потоков в контексте context.
+
+    Пул потоков не наследует контекст задачи, а с ним и бюджет итерации,
+    поэтому вызов выполняется в явно переданной копии контекста.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        None, context.run, func, *args
+    )
+
+
+async def deliver(bot, outbox):
+    """Доставка сообщений из очереди в Telegram."""
+    while True:
+        message, result, context = await outbox.get()
+        try:
+            sent = await run_blocking(
+                context, homework.send_message, bot, message
+            )
+        except Exception as error:
+            if not result.done():
+                result.set_exception(error)
+            continue
+        if not result.done():
+            result.set_result(sent)
+
+
+async def send(outbox, message):
+    """Постановка сообщения в очередь и ожидание результата отправки.
+
+    Сообщение отправляется в пределах бюджета вызывающей задачи.
+    """
+    result = asyncio.get_running_loop().create_future()
+    await outbox.put((message, result, contextvars.copy_context()))
+    return await result
+
+
+async def send_report(outbox, message):
+    """Отправка сообщения об ошибке в пределах ERROR_REPORT_BUDGET.
+
+    Как и homework.send_report, не бросает исключений: истёкший бюджет
+    считается неудачной отправкой.
+    """
+    with deadline.budget(deadline.ERROR_REPORT_BUDGET):
+        try:
+            return await send(outbox, message)
+        except DeadlineExceeded as error:
+            logging.error(homework.SEND_MESSAGE_ERROR.format(
+                message=message,
+                error=error
+            ))
+            return False
+
+
+def fetch_changes(index, timestamp):
+    """Запрос к API и поиск изменившихся работ, в пуле потоков.
+
+    Потоковый ответ читается из сети по мере перебора работ, поэтому
+    перебор тоже выполняется здесь, а не в цикле событий. Возвращает
+    ответ, статус первой работы и изменившиеся работы.
+    """
+    response = homework.timed_check(homework.poll_api(timestamp))
+    homeworks = response['homeworks']
+    if not homeworks:
+        return response, None, []
+    return response, homeworks[0]['status'], index.transitions(homeworks)
+
+
+async def notify_transitions(index, changed, outbox, player):
+    """Уведомление обо всех работах с изменившимся статусом."""
+    if not changed:
+        logging.debug(homework.STATUS_HAS_NOT_CHANGED)
+        return False
+    for work in reversed(changed):
+        if not await send(outbox, homework.format_status(work)):
+            return False
+        player.play(work['status'])
+        index.commit(work)
+    return True
+
+
+async def poll(outbox, player):
+    """Опрос API домашки без блокировки цикла событий."""
+    poll_scheduler = scheduler.from_env(homework.RETRY_PERIOD)
+    chat_id = homework.TELEGRAM_CHAT_ID
+    store = await run_blocking(
+        contextvars.copy_context(), state.open_store, os.getenv('STATE_DB')
+    )
+    saved = await run_blocking(
+        contextvars.copy_context(), store.load, chat_id
+    )
+    index = diff.HomeworkIndex(on_commit=partial(store.save_homework, chat_id))
+    index.restore(saved.homeworks)
+    timestamp = saved.from_date or int(time.time())
+    errors = error_digest.ErrorDigest()
+    errors.restore(saved.error)
+    status = None
+    budget = float(os.getenv('ITERATION_BUDGET', deadline.ITERATION_BUDGET))
+    watchdog = deadline.Watchdog(2 * budget).start()
+    try:
+        wake_at = time.monotonic()
+        while True:
+            metrics.LOOP_LAG.observe(max(0, time.monotonic() - wake_at))
+            watchdog.beat()
+            last_error = None
+            try:
+                with deadline.budget(budget):
+                    response, head, changed = await run_blocking(
+                        contextvars.copy_context(),
+                        fetch_changes, index, timestamp
+                    )
+                    if head is not None:
+                        status = head
+                        await notify_transitions(
+                            index, changed, outbox, player
+                        )
+                    from_date = cursor.advance(
+                        timestamp, response, index.undelivered(),
+                        time.time()
+                    )
+                    if from_date != timestamp:
+                        timestamp = from_date
+                        store.save_cursor(chat_id, timestamp)
+            except Exception as error:
+                last_error = error
+                metrics.ERRORS.inc(type(error).__name__)
+                message = homework.EXCEPTION_ERROR.format(error=error)
+                logging.exception(message)
+                key = errors.add(error)
+                if key and await send_report(outbox, message):
+                    errors.mark_reported(key)
+                    store.save_error(chat_id, key)
+            finally:
+                watchdog.idle()
+                digest = errors.pop_digest()
+                if digest:
+                    await send_report(outbox, digest)
+                await run_blocking(
+                    contextvars.copy_context(), store.maybe_flush
+                )
+                delay = poll_scheduler.delay(status, last_error)
+                wake_at = time.monotonic() + delay
+                await asyncio.sleep(delay)
+    finally:
+        watchdog.stop()
+        await run_blocking(contextvars.copy_context(), store.close)
+
+
+async def main_async():
+    """Основная логика работы бота на asyncio."""
+    homework.check_tokens()
+    bot = telegram.Bot(token=homework.TELEGRAM_TOKEN)
+    player = audio.AudioWorker(
+        homework.SOUNDS_PATH, homework.HOMEWORK_VERDICTS
+    )
+    outbox = asyncio.Queue()
+    delivery = asyncio.create_task(deliver(bot, outbox))
+    try:
+        await poll(outbox, player)
+    finally:
+        delivery.cancel()
+        await asyncio.gather(delivery, return_exceptions=True)
+
+
+def main():
+    """Запуск бота в режиме asyncio."""
+    asyncio.run(main_async())
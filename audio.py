@@ -0,0 +1,157 @@
+import logging
+import os
+import queue
+import sys
+import threading
+
+
+AUDIO_BACKEND_SELECTED = 'Звуковой движок: {backend}.'
+SOUND_NOT_FOUND = 'Не найден звуковой файл {path}: {error}'
+SOUND_QUEUE_FULL = 'Очередь звуков переполнена, звук {status} пропущен.'
+SOUND_PLAY_ERROR = 'Ошибка при проигрывании звука {status}: {error}'
+SOUND_PLAY_TIMEOUT = 'Звук {status} не доигран за {timeout} с, брошен.'
+SOUND_DEVICE_STALLED = 'Звук {status} пропущен: устройство ещё занято.'
+
+QUEUE_SIZE = 8
+PLAY_TIMEOUT = 10.0
+
+
+class NullBackend:
+    """Движок без звука для серверов без аудиоустройства."""
+
+    def play(self, path, data):
+        """Ничего не проигрывает."""
+
+
+class PlaysoundBackend:
+    """Проигрывание через playsound.
+
+    playsound умеет играть только файлы, поэтому ему передаётся путь,
+    а предзагруженные данные остаются для движков, играющих из памяти.
+    """
+
+    def __init__(self):
+        from playsound import playsound
+        self.playsound = playsound
+
+    def play(self, path, data):
+        """Проигрывание файла."""
+        self.playsound(path)
+
+
+def has_audio_device():
+    """Есть ли в окружении куда выводить звук."""
+    if sys.platform in ('darwin', 'win32'):
+        return True
+    return bool(os.getenv('DISPLAY') or os.getenv('PULSE_SERVER'))
+
+
+def select_backend(name=None):
+    """Выбор звукового движка, на сервере без звука — заглушка."""
+    name = name or os.getenv('AUDIO_BACKEND')
+    if name is None:
+        name = 'playsound' if has_audio_device() else 'null'
+    backend = NullBackend()
+    if name == 'playsound':
+        try:
+            backend = PlaysoundBackend()
+        except ImportError as error:
+            logging.warning(SOUND_PLAY_ERROR.format(status='*', error=error))
+    logging.info(AUDIO_BACKEND_SELECTED.format(
+        backend=type(backend).__name__
+    ))
+    return backend
+
+
+class AudioWorker:
+    """Фоновое проигрывание звуков статусов через ограниченную очередь."""
+
+    def __init__(self, sounds_path, statuses, backend=None,
+                 maxsize=QUEUE_SIZE, play_timeout=PLAY_TIMEOUT):
+        self.backend = backend or select_backend()
+        self.play_timeout = play_timeout
+        self.stalled = None
+        self.paths = {
+            status: os.path.join(sounds_path, status + '.mp3')
+            for status in statuses
+        }
+        self.buffers = {}
+        for status, path in self.paths.items():
+            try:
+                with open(path, 'rb') as file:
+                    self.buffers[status] = file.read()
+            except OSError as error:
+                logging.error(SOUND_NOT_FOUND.format(path=path, error=error))
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.queued = set()
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(
+            target=self.run, name='audio', daemon=True
+        )
+        self.thread.start()
+
+    def play(self, status):
+        """Постановка звука в очередь без ожидания проигрывания.
+
+        Звук, который уже ждёт в очереди, повторно не добавляется.
+        """
+        if status not in self.buffers:
+            return False
+        with self.lock:
+            if status in self.queued:
+                return False
+            try:
+                self.queue.put_nowait(status)
+            except queue.Full:
+                logging.warning(SOUND_QUEUE_FULL.format(status=status))
+                return False
+            self.queued.add(status)
+        return True
+
+    def run(self):
+        """Цикл фонового потока."""
+        while True:
+            status = self.queue.get()
+            if status is None:
+                return
+            with self.lock:
+                self.queued.discard(status)
+            self.play_with_timeout(status)
+
+    def play_with_timeout(self, status):
+        """Проигрывание, которое не держит очередь дольше play_timeout.
+
+        Зависшее проигрывание прервать нельзя, поэтому оно бросается,
+        а звуки пропускаются, пока устройство не освободится.
+        """
+        if self.stalled is not None and self.stalled.is_alive():
+            logging.warning(SOUND_DEVICE_STALLED.format(status=status))
+            return False
+        playback = threading.Thread(
+            target=self.play_sound, args=(status,), name='playback',
+            daemon=True
+        )
+        playback.start()
+        playback.join(self.play_timeout)
+        if playback.is_alive():
+            self.stalled = playback
+            logging.error(SOUND_PLAY_TIMEOUT.format(
+                status=status,
+                timeout=self.play_timeout
+            ))
+            return False
+        return True
+
+    def play_sound(self, status):
+        try:
+            self.backend.play(self.paths[status], self.buffers[status])
+        except Exception as error:
+            logging.error(SOUND_PLAY_ERROR.format(
+                status=status,
+                error=error
+            ))
+
+    def stop(self):
+        """Остановка фонового потока после уже поставленных звуков."""
+        self.queue.put(None)
+        self.thread.join()
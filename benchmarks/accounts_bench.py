@@ -0,0 +1,55 @@
+"""Память и пропускная способность мультиаккаунтного опроса.
+
+Запуск: python benchmarks/accounts_bench.py [1000 10000]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import accounts  # noqa: E402
+import homework  # noqa: E402
+from http_session import ApiSession  # noqa: E402
+from stubs import PracticumStub  # noqa: E402
+
+
+class NullBot:
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        pass
+
+
+def homeworks_for(token, from_date):
+    return [{'homework_name': f'hw_{token}', 'status': 'reviewing'}]
+
+
+def run(count, max_workers=64):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    registry = [accounts.Account(f'token{i}', i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    state_bytes = sum(
+        stat.size_diff for stat in after.compare_to(before, 'filename')
+    )
+    homework.API_SESSION = ApiSession(pool_size=max_workers)
+    with PracticumStub(homeworks_for) as stub:
+        poller = accounts.AccountPoller(
+            registry, NullBot(), max_workers=max_workers, endpoint=stub.url
+        )
+        started = time.perf_counter()
+        poller.poll_all()
+        elapsed = time.perf_counter() - started
+        poller.shutdown()
+    stats = homework.API_SESSION.stats()
+    print(
+        f'accounts={count} bytes/account={state_bytes / count:.0f} '
+        f'polls/s={count / elapsed:.0f} round={elapsed:.2f}s '
+        f'connections={stats["connections"]} reused={stats["reused"]}'
+    )
+
+
+if __name__ == '__main__':
+    for count in map(int, sys.argv[1:] or (1000, 10000)):
+        run(count)
@@ -0,0 +1,106 @@
+"""Размер ответов API за месяц опроса с двигающимся курсором.
+
+Запуск: python benchmarks/cursor_bench.py [--days 30] [--freeze-cursor]
+
+Каждые --new-every часов у студента появляется работа, через два часа её
+принимают. API, как настоящий, отдаёт все работы, обновлённые не раньше
+from_date. --freeze-cursor воспроизводит прежнее поведение на тихих днях:
+from_date не двигается, окно растёт с начала опроса.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telegram  # noqa: E402
+
+import clock  # noqa: E402
+import cursor  # noqa: E402
+import homework  # noqa: E402
+
+START = 1_700_000_000
+DAY = 24 * 60 * 60
+REVIEW_TIME = 2 * 60 * 60
+
+
+class MonthApi:
+    """API домашки в памяти; запоминает размер каждого ответа."""
+
+    def __init__(self, virtual_clock, new_every):
+        self.clock = virtual_clock
+        self.new_every = new_every
+        self.sizes = []
+
+    def homeworks(self, from_date):
+        now = self.clock.now
+        homeworks = []
+        number = 0
+        while START + number * self.new_every <= now:
+            created = START + number * self.new_every
+            status, updated = 'reviewing', created
+            if created + REVIEW_TIME <= now:
+                status, updated = 'approved', created + REVIEW_TIME
+            if updated >= from_date:
+                homeworks.append({
+                    'id': number,
+                    'homework_name': f'hw{number}',
+                    'status': status,
+                    'date_updated': datetime.fromtimestamp(
+                        updated, timezone.utc
+                    ).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                })
+            number += 1
+        return homeworks[::-1]
+
+    def get(self, url=None, headers=None, params=None, **kwargs):
+        body = json.dumps({
+            'homeworks': self.homeworks(int(params['from_date'])),
+            'current_date': int(self.clock.now),
+        }).encode()
+        self.sizes.append((self.clock.now, len(body)))
+        return clock.RecordedResponse(200, body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--new-every', type=float, default=4,
+                        help='часов между новыми работами')
+    parser.add_argument('--freeze-cursor', action='store_true')
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    os.environ['AUDIO_BACKEND'] = 'null'
+    virtual_clock = clock.VirtualClock(
+        start=START, until=START + args.days * DAY
+    )
+    api = MonthApi(virtual_clock, args.new_every * 60 * 60)
+    homework.RETRY_PERIOD = 600
+    homework.TELEGRAM_TOKEN = '1234:abcdefg'
+    homework.TELEGRAM_CHAT_ID = '12345'
+    homework.PRACTICUM_TOKEN = 'sometoken'
+    homework.API_SESSION = api
+    homework.send_message = lambda bot, message: True
+    telegram.Bot = lambda token: None
+    if args.freeze_cursor:
+        cursor.advance = lambda from_date, *args, **kwargs: from_date
+    with clock.install(virtual_clock):
+        try:
+            homework.main()
+        except clock.SimulationFinished:
+            pass
+    days = {}
+    for moment, size in api.sizes:
+        days.setdefault(int((moment - START) // DAY), []).append(size)
+    print('день  опросов  средний ответ, байт  максимум, байт')
+    for day, sizes in sorted(days.items()):
+        if day in (0, 1, 7, 14, 21) or day == max(days):
+            print(f'{day + 1:>4}  {len(sizes):>7}  '
+                  f'{sum(sizes) / len(sizes):>19.0f}  {max(sizes):>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""Нагрузочный бенчмарк цикла main() против локальных заглушек.
+
+Запуск: python benchmarks/load_bench.py --polls 2000 --payload 50 \
+    --api-latency 0.001 --api-errors 0.05 --output benchmarks/results.jsonl
+
+Время внутри main() виртуальное: time.sleep() только сдвигает часы, поэтому
+недели опроса проходят за секунды. Результат дописывается строкой JSON.
+"""
+import argparse
+from datetime import datetime, timezone
+from functools import partial
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import telegram  # noqa: E402
+
+import clock as virtual_time  # noqa: E402
+import homework  # noqa: E402
+from http_session import ApiSession  # noqa: E402
+import metrics  # noqa: E402
+from stubs import PracticumStub, TelegramStub  # noqa: E402
+
+STATUSES = ('reviewing', 'rejected', 'approved')
+START = 1_700_000_000
+
+
+class Scenario:
+    """Работы студента: каждые change_every секунд меняется одна работа."""
+
+    def __init__(self, size, change_every, clock):
+        self.size = size
+        self.change_every = change_every
+        self.clock = clock
+
+    def change_time(self, change):
+        return START + (change + 1) * self.change_every
+
+    def changes(self):
+        return int((self.clock.now - START) // self.change_every)
+
+    def homeworks_for(self, token, from_date):
+        changes = self.changes()
+        homeworks = []
+        for number in range(self.size):
+            updated, status = START - 1, 'reviewing'
+            if changes > number:
+                last = changes - 1 - (changes - 1 - number) % self.size
+                updated = self.change_time(last)
+                status = STATUSES[(last // self.size + 1) % len(STATUSES)]
+            if updated < from_date:
+                continue
+            homeworks.append({
+                'id': number,
+                'homework_name': f'hw{number}',
+                'status': status,
+                'date_updated': datetime.fromtimestamp(
+                    updated, timezone.utc
+                ).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            })
+        homeworks.sort(key=lambda item: item['date_updated'], reverse=True)
+        return homeworks
+
+    def latency(self, received_at, text):
+        number = int(text.split('"hw')[1].split('"')[0])
+        change = self.changes_before(received_at, number)
+        return received_at - self.change_time(change)
+
+    def changes_before(self, moment, number):
+        changes = int((moment - START) // self.change_every)
+        return changes - 1 - (changes - 1 - number) % self.size
+
+
+def percentile(values, share):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def average_ms(histogram):
+    if not histogram.count:
+        return None
+    return round(histogram.sum / histogram.count * 1000, 3)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    clock = virtual_time.VirtualClock(start=START, max_sleeps=args.polls - 1)
+    scenario = Scenario(args.payload, args.change_every, clock)
+    practicum = PracticumStub(
+        scenario.homeworks_for, clock=clock.time,
+        latency=args.api_latency, error_rate=args.api_errors
+    )
+    bot_api = TelegramStub(
+        clock=clock.time,
+        latency=args.telegram_latency, error_rate=args.telegram_errors
+    )
+    os.environ['AUDIO_BACKEND'] = 'null'
+    homework.ENDPOINT = practicum.url
+    homework.TELEGRAM_TOKEN = '1234:abcdefg'
+    homework.TELEGRAM_CHAT_ID = '12345'
+    homework.PRACTICUM_TOKEN = 'sometoken'
+    homework.HEADERS = {'Authorization': 'OAuth sometoken'}
+    homework.API_SESSION = ApiSession(retry_statuses={})
+    telegram.Bot = partial(telegram.Bot, base_url=bot_api.base_url)
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    with practicum, bot_api, virtual_time.install(clock):
+        try:
+            homework.main()
+        except virtual_time.SimulationFinished:
+            pass
+    elapsed = time.perf_counter() - started
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    latencies = [
+        scenario.latency(received_at, text)
+        for received_at, text in bot_api.received
+        if text and '"hw' in text
+    ]
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'params': vars(args),
+        'polls': args.polls,
+        'wall_seconds': round(elapsed, 3),
+        'polls_per_second': round(args.polls / elapsed, 1),
+        'virtual_seconds': clock.now - START,
+        'notifications': len(latencies),
+        'messages': len(bot_api.received),
+        'latency_p50': percentile(latencies, 0.5),
+        'latency_p90': percentile(latencies, 0.9),
+        'latency_p99': percentile(latencies, 0.99),
+        'api_latency_avg_ms': average_ms(metrics.API_LATENCY),
+        'telegram_send_avg_ms': average_ms(metrics.TELEGRAM_LATENCY),
+        'cpu_seconds': round(
+            usage.ru_utime + usage.ru_stime
+            - usage_before.ru_utime - usage_before.ru_stime, 3
+        ),
+        'peak_rss_kb': usage.ru_maxrss,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polls', type=int, default=2000)
+    parser.add_argument('--payload', type=int, default=50,
+                        help='число работ у студента')
+    parser.add_argument('--change-every', type=int, default=65,
+                        help='виртуальных секунд между сменами статуса')
+    parser.add_argument('--api-latency', type=float, default=0.0)
+    parser.add_argument('--api-errors', type=float, default=0.0)
+    parser.add_argument('--telegram-latency', type=float, default=0.0)
+    parser.add_argument('--telegram-errors', type=float, default=0.0)
+    parser.add_argument('--output', default=os.path.join(
+        ROOT_DIR, 'benchmarks', 'results.jsonl'
+    ))
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    logging.disable(logging.CRITICAL)
+    args = parse_args()
+    result = run(args)
+    with open(args.output, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(result, ensure_ascii=False) + '\n')
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,75 @@
+"""Стоимость вызова логгера в потоке опроса.
+
+Запуск: python benchmarks/logging_bench.py [--calls 20000]
+
+Сравниваются: прямая запись в файл и stdout, фоновый поток записи и
+запись, отброшенная прореживанием. stdout перенаправляется в /dev/null.
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import log_pipeline  # noqa: E402
+
+FORMAT = '%(asctime)s, %(levelname)s, %(funcName)s, %(message)s'
+
+
+def measure(logger, calls, level=logging.INFO):
+    """Среднее время одного вызова, мкс."""
+    started = time.perf_counter()
+    for number in range(calls):
+        logger.log(level, 'Статус работы %s: %s', number, 'reviewing')
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def make_logger(name, handler):
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--calls', type=int, default=20000)
+    args = parser.parse_args()
+    devnull = open(os.devnull, 'w')
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bot.log')
+        direct = [logging.FileHandler(path + '.direct', encoding='utf-8'),
+                  logging.StreamHandler(devnull)]
+        for handler in direct:
+            handler.setFormatter(logging.Formatter(FORMAT))
+        direct_logger = make_logger('bench.direct', direct[0])
+        direct_logger.addHandler(direct[1])
+        print(f'Прямая запись:     {measure(direct_logger, args.calls):.1f} мкс')
+
+        handler = log_pipeline.start(
+            [log_pipeline.file_handler(path), logging.StreamHandler(devnull)],
+            FORMAT,
+            sampling=log_pipeline.SamplingFilter(burst=args.calls),
+        )
+        queued_logger = make_logger('bench.queued', handler)
+        print(f'Фоновый поток:     {measure(queued_logger, args.calls):.1f} мкс')
+        started = time.perf_counter()
+        log_pipeline.stop(handler.listener)
+        print(f'Дозапись очереди:  {time.perf_counter() - started:.2f} с')
+
+        sampled_logger = make_logger('bench.sampled', log_pipeline.start(
+            [logging.NullHandler()], sampling=log_pipeline.SamplingFilter()
+        ))
+        print(f'Прореженная:       {measure(sampled_logger, args.calls):.1f} мкс')
+        for logger in (direct_logger, queued_logger, sampled_logger):
+            for handler in logger.handlers:
+                handler.close()
+    devnull.close()
+
+
+if __name__ == '__main__':
+    main()
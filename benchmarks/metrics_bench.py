@@ -0,0 +1,30 @@
+"""Стоимость записи одного события в метрики.
+
+Запуск: python benchmarks/metrics_bench.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics  # noqa: E402
+
+NUMBER = 1_000_000
+
+
+def main():
+    registry = metrics.Registry()
+    histogram = registry.histogram('latency', 'Задержка.')
+    counter = registry.counter('errors_total', 'Ошибки.', 'exception')
+    cases = {
+        'histogram.observe': lambda: histogram.observe(0.3),
+        'counter.inc': lambda: counter.inc('ConnectionError'),
+    }
+    for name, case in cases.items():
+        seconds = timeit.timeit(case, number=NUMBER)
+        print(f'{name}: {seconds / NUMBER * 1e9:.0f} ns/event')
+
+
+if __name__ == '__main__':
+    main()
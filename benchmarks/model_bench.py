@@ -0,0 +1,87 @@
+"""Память на одну отслеживаемую работу: кортежи строк и model.Tracked.
+
+Запуск: python benchmarks/model_bench.py [--items 100000] [--accounts 100]
+
+Работы приходят из JSON, как в ответе API, и запоминаются индексом
+каждого аккаунта после уведомления. Прежний индекс хранил по ключу
+(id, название) кортеж (статус, дата) из строк ответа. tracemalloc
+считает всё, что остаётся в памяти после того, как ответы удалены.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import diff  # noqa: E402
+import homework  # noqa: E402
+
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+
+
+class TupleIndex:
+    """Прежнее хранение: словарь кортежей строк из ответа."""
+
+    def __init__(self):
+        self.items = {}
+
+    def commit(self, work):
+        self.items[diff.homework_key(work)] = (
+            work.get('status'), work.get('date_updated')
+        )
+
+
+def response(account, count):
+    return json.dumps({'homeworks': [
+        {
+            'id': account * count + number,
+            'status': STATUSES[number % len(STATUSES)],
+            'homework_name': f'student{account}__hw{number:03}_final.zip',
+            'reviewer_comment': 'Всё хорошо.',
+            'date_updated': (
+                f'2024-{number % 12 + 1:02}-{number % 28 + 1:02}'
+                f'T{number % 24:02}:{number % 60:02}:{account % 60:02}Z'
+            ),
+            'lesson_name': 'Спринт',
+        }
+        for number in range(count)
+    ]}).encode()
+
+
+def measure(index_class, bodies):
+    """Байт на работу, оставшихся в индексах после разбора ответов."""
+    gc.collect()
+    tracemalloc.start()
+    indexes = []
+    for body in bodies:
+        index = index_class()
+        for work in json.loads(body)['homeworks']:
+            index.commit(work)
+        indexes.append(index)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return retained / sum(len(index.items) for index in indexes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--accounts', type=int, default=100)
+    args = parser.parse_args()
+    per_account = args.items // args.accounts
+    bodies = [
+        response(account, per_account) for account in range(args.accounts)
+    ]
+    before = measure(TupleIndex, bodies)
+    after = measure(diff.HomeworkIndex, bodies)
+    print(f'items={per_account * args.accounts} accounts={args.accounts}')
+    print(f'tuples:  {before:.0f} B/homework')
+    print(f'tracked: {after:.0f} B/homework ({after / before:.0%})')
+
+
+if __name__ == '__main__':
+    main()
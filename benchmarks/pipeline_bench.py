@@ -0,0 +1,108 @@
+"""Конвейер опроса аккаунтов против пула потоков при медленном Telegram.
+
+Запуск: python benchmarks/pipeline_bench.py [--accounts 2000] \
+    [--telegram-latency 0.01] [--notify-workers 4] [--queue-size 100]
+
+В каждом раунде у всех аккаунтов меняется статус, так что каждый опрос
+заканчивается отправкой. Для конвейера печатается время работы
+и ожидания каждого этапа и наибольшая глубина очередей.
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import accounts  # noqa: E402
+import homework  # noqa: E402
+from http_session import ApiSession  # noqa: E402
+import pipeline  # noqa: E402
+from stubs import PracticumStub  # noqa: E402
+
+STATUSES = ('reviewing', 'approved')
+
+
+class SlowBot:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        time.sleep(self.latency)
+
+
+class Rounds:
+    """Статус всех работ меняется каждый раунд."""
+
+    def __init__(self):
+        self.number = 0
+
+    def homeworks_for(self, token, from_date):
+        return [{'id': int(token[5:]), 'homework_name': f'hw_{token}',
+                 'status': STATUSES[self.number % len(STATUSES)]}]
+
+
+def watch_depth(peaks, stop):
+    while not stop.is_set():
+        for name, stage in list(pipeline.STAGES.items()):
+            peaks[name] = max(peaks.get(name, 0), stage.queue.qsize())
+        time.sleep(0.005)
+
+
+def run(name, poller, rounds, count):
+    peaks = {}
+    stop = threading.Event()
+    threading.Thread(target=watch_depth, args=(peaks, stop),
+                     daemon=True).start()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for number in range(2):
+        rounds.number = number
+        poller.poll_all()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    stop.set()
+    poller.shutdown()
+    print(f'{name}: polls/s={2 * count / elapsed:.0f} '
+          f'peak_memory={peak / 1024:.0f} KiB')
+    for stage in ('fetch', 'validate', 'notify'):
+        if stage in peaks:
+            print(f'  {stage}: busy={pipeline.STAGE_BUSY.values[stage]:.2f}s '
+                  f'blocked={pipeline.STAGE_BLOCKED.values.get(stage, 0):.2f}s '
+                  f'max_queue={peaks[stage]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--accounts', type=int, default=2000)
+    parser.add_argument('--telegram-latency', type=float, default=0.01)
+    parser.add_argument('--fetch-workers', type=int, default=32)
+    parser.add_argument('--notify-workers', type=int, default=4)
+    parser.add_argument('--queue-size', type=int, default=100)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    homework.API_SESSION = ApiSession(pool_size=args.fetch_workers)
+    rounds = Rounds()
+    bot = SlowBot(args.telegram_latency)
+    with PracticumStub(rounds.homeworks_for) as stub:
+        registry = [accounts.Account(f'token{i}', i)
+                    for i in range(args.accounts)]
+        run('threads', accounts.AccountPoller(
+            registry, bot, max_workers=args.fetch_workers, endpoint=stub.url
+        ), rounds, args.accounts)
+        registry = [accounts.Account(f'token{i}', i)
+                    for i in range(args.accounts)]
+        run('pipeline', accounts.PipelinePoller(
+            registry, bot, endpoint=stub.url,
+            fetch_workers=args.fetch_workers,
+            notify_workers=args.notify_workers,
+            queue_size=args.queue_size
+        ), rounds, args.accounts)
+
+
+if __name__ == '__main__':
+    main()
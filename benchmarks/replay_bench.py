@@ -0,0 +1,61 @@
+"""Скорость воспроизведения записи ответов API.
+
+Запуск: python benchmarks/replay_bench.py --polls 1000000
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recorder  # noqa: E402
+
+STATUSES = ('reviewing', 'rejected', 'approved')
+
+
+def write_recording(path, polls):
+    writer = recorder.Recorder(path, chunk_size=10_000)
+    for poll in range(polls):
+        homeworks = []
+        if poll % 50 == 0:
+            homeworks.append({
+                'id': poll,
+                'homework_name': f'hw{poll % 20}',
+                'status': STATUSES[poll % 3],
+                'date_updated': '2023-11-15T00:00:00Z',
+            })
+        writer.record(
+            1_700_000_000 + poll * 600, 200, 0.12, 1_700_000_000,
+            json.dumps({'homeworks': homeworks, 'current_date': poll})
+        )
+    writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--polls', type=int, default=1_000_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'api.jsonl.gz')
+        write_recording(path, args.polls)
+        size = os.path.getsize(path)
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        stats = recorder.replay(path)
+        elapsed = time.perf_counter() - started
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f'файл: {size / 1024 / 1024:.1f} МБ, '
+          f'{size / args.polls:.1f} байт на опрос')
+    print(f'воспроизведение: {stats["polls"]} опросов за {elapsed:.1f} с, '
+          f'{stats["polls"] / elapsed:.0f} опросов/с')
+    print(f'прирост пикового RSS: {(rss_after - rss_before) / 1024:.1f} МБ')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Время холодного старта: от импорта homework до первого опроса API.
+
+Запуск: python benchmarks/startup_bench.py [--runs 10] [--max-ms 500]
+
+Каждый запуск - отдельный процесс Python, который импортирует бот,
+выполняет настройку как при запуске скрипта и делает один опрос заглушки
+API. Медианы дописываются строкой JSON в results.jsonl; с --max-ms
+бенчмарк завершается с ошибкой, если медиана до первого опроса больше.
+"""
+import argparse
+from datetime import datetime, timezone
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+STARTUP_REGRESSION = (
+    'Медиана до первого опроса {first_poll_ms} мс больше порога {max_ms} мс.'
+)
+
+
+def child():
+    """Один холодный старт; печатает замеры в stdout."""
+    started = time.perf_counter()
+    import homework
+    imported = time.perf_counter()
+    import clock
+    homework.configure()
+    homework.setup_session()
+    homework.ENDPOINT = os.environ['BENCH_ENDPOINT']
+    virtual_clock = clock.VirtualClock(start=time.time(), max_sleeps=0)
+    with clock.install(virtual_clock, homework):
+        try:
+            homework.main()
+        except clock.SimulationFinished:
+            pass
+    polled = time.perf_counter()
+    print(json.dumps({
+        'import_ms': (imported - started) * 1000,
+        'first_poll_ms': (polled - started) * 1000,
+        'modules': len(sys.modules),
+    }))
+
+
+def run(args):
+    # Бот импортируется только в дочерних процессах.
+    from load_bench import git_revision
+    from stubs import PracticumStub
+    environment = dict(
+        os.environ,
+        PRACTICUM_TOKEN='sometoken', TELEGRAM_TOKEN='1234:abcdefg',
+        TELEGRAM_CHAT_ID='12345', AUDIO_BACKEND='null',
+        PYTHONPATH=ROOT_DIR,
+    )
+    samples = []
+    with PracticumStub() as practicum:
+        environment['BENCH_ENDPOINT'] = practicum.url
+        for _ in range(args.runs):
+            started = time.perf_counter()
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child'],
+                env=environment, capture_output=True, text=True, check=True
+            ).stdout
+            sample = json.loads(output.strip().splitlines()[-1])
+            sample['process_ms'] = (time.perf_counter() - started) * 1000
+            samples.append(sample)
+    return {
+        'benchmark': 'startup',
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'runs': args.runs,
+        **{
+            key: round(statistics.median(
+                sample[key] for sample in samples
+            ), 1)
+            for key in ('import_ms', 'first_poll_ms', 'process_ms', 'modules')
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--max-ms', type=float,
+                        help='порог медианы до первого опроса')
+    parser.add_argument('--child', action='store_true',
+                        help=argparse.SUPPRESS)
+    parser.add_argument('--output', default=os.path.join(
+        ROOT_DIR, 'benchmarks', 'results.jsonl'
+    ))
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.child:
+        child()
+        sys.exit()
+    result = run(args)
+    with open(args.output, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(result, ensure_ascii=False) + '\n')
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.max_ms and result['first_poll_ms'] > args.max_ms:
+        sys.exit(STARTUP_REGRESSION.format(
+            max_ms=args.max_ms, first_poll_ms=result['first_poll_ms']
+        ))
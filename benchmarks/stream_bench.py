@@ -0,0 +1,111 @@
+"""Пиковая память разбора большого ответа API: целиком и потоком.
+
+Запуск: python benchmarks/stream_bench.py [--items 20000] [--comment 1000]
+
+Ответ имитирует догрузку с from_date=0: все работы новые для индекса.
+Тело отдаётся частями по мере чтения, как у requests с stream=True;
+content собирает его целиком, как при обычном запросе. Память считает
+tracemalloc: от запроса до сдвига курсора.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cursor  # noqa: E402
+import diff  # noqa: E402
+import homework  # noqa: E402
+import json_stream  # noqa: E402
+
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+
+
+class LazyResponse:
+    """Ответ API, тело которого генерируется при чтении."""
+
+    status_code = 200
+
+    def __init__(self, items, comment):
+        self.items = items
+        self.comment = comment
+
+    def chunks(self):
+        yield b'{"homeworks": ['
+        for number in range(self.items):
+            work = {
+                'id': number,
+                'status': STATUSES[number % len(STATUSES)],
+                'homework_name': f'student__hw{number:05}.zip',
+                'reviewer_comment': self.comment,
+                'date_updated': f'2024-{number % 12 + 1:02}-01T12:00:00Z',
+                'lesson_name': f'Спринт {number // 100}',
+            }
+            yield (b',' if number else b'') + json.dumps(
+                work, ensure_ascii=False
+            ).encode()
+        yield b'], "current_date": 1700000000}'
+
+    def iter_content(self, chunk_size=1):
+        buffer = b''
+        for part in self.chunks():
+            buffer += part
+            if len(buffer) >= chunk_size:
+                yield buffer
+                buffer = b''
+        yield buffer
+
+    @property
+    def content(self):
+        return b''.join(self.chunks())
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        """Соединения нет: освобождать нечего."""
+
+
+def poll():
+    """Один опрос основного цикла до сдвига курсора."""
+    response = homework.check_response(homework.poll_api(0))
+    index = diff.HomeworkIndex()
+    changed = index.transitions(response['homeworks'])
+    cursor.advance(0, response)
+    return len(changed)
+
+
+def measure(stream, items, comment):
+    homework.API_STREAM = stream
+    homework.requests.get = lambda **kwargs: LazyResponse(items, comment)
+    tracemalloc.start()
+    started = time.perf_counter()
+    changed = poll()
+    duration = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert changed == items
+    return peak, duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=20000)
+    parser.add_argument('--comment', type=int, default=1000,
+                        help='длина комментария ревьюера в символах')
+    args = parser.parse_args()
+    comment = 'Отличная работа! ' * (args.comment // 17)
+    size = sum(map(len, LazyResponse(args.items, comment).chunks()))
+    print(f'items={args.items} body={size / 2**20:.1f} MiB '
+          f'chunk={json_stream.CHUNK_SIZE // 1024} KiB')
+    for name, stream in (('json', False), ('stream', True)):
+        peak, duration = measure(stream, args.items, comment)
+        print(f'{name:>6}: peak={peak / 2**20:.1f} MiB '
+              f'time={duration * 1000:.0f} ms')
+
+
+if __name__ == '__main__':
+    main()
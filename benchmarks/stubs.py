@@ -0,0 +1,122 @@
+"""Локальные заглушки API Практикума и Telegram Bot API для бенчмарков."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def reply(self, code, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP-сервер в фоновом потоке с задержкой и долей ошибок."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, handler, latency=0.0, error_rate=0.0, seed=0):
+        super().__init__(('127.0.0.1', 0), handler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/'
+
+    def simulate(self):
+        """Задержка ответа; True, если нужно ответить ошибкой."""
+        if self.latency:
+            time.sleep(self.latency)
+        return self.random.random() < self.error_rate
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class PracticumHandler(StubHandler):
+
+    def do_GET(self):
+        if self.server.simulate():
+            self.reply(500, {})
+            return
+        token = self.headers.get('Authorization', '').split()[-1]
+        query = parse_qs(urlparse(self.path).query)
+        from_date = int(query.get('from_date', ['0'])[0])
+        self.reply(200, {
+            'homeworks': self.server.homeworks_for(token, from_date),
+            'current_date': int(self.server.clock()),
+        })
+
+
+class PracticumStub(StubServer):
+    """Заглушка API домашки: работы отдаёт функция homeworks_for."""
+
+    def __init__(self, homeworks_for=None, clock=time.time, **kwargs):
+        super().__init__(PracticumHandler, **kwargs)
+        self.homeworks_for = homeworks_for or (lambda token, from_date: [])
+        self.clock = clock
+
+
+class TelegramHandler(StubHandler):
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.server.simulate():
+            self.reply(500, {'ok': False, 'error_code': 500,
+                             'description': 'Internal Server Error'})
+            return
+        if self.headers.get('Content-Type', '').startswith(
+                'application/json'):
+            data = json.loads(body or b'{}')
+        else:
+            data = {
+                key: values[0] for key, values in parse_qs(
+                    body.decode()
+                ).items()
+            }
+        self.server.received.append((self.server.clock(), data.get('text')))
+        self.reply(200, {'ok': True, 'result': {
+            'message_id': len(self.server.received),
+            'date': int(time.time()),
+            'chat': {'id': int(data.get('chat_id', 0)), 'type': 'private'},
+            'text': data.get('text'),
+        }})
+
+
+class TelegramStub(StubServer):
+    """Заглушка Telegram Bot API: запоминает время и текст сообщений."""
+
+    def __init__(self, clock=time.time, **kwargs):
+        super().__init__(TelegramHandler, **kwargs)
+        self.clock = clock
+        self.received = []
+
+    @property
+    def base_url(self):
+        return self.url + 'bot'
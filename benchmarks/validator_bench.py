@@ -0,0 +1,86 @@
+"""Проверка ответа API: скомпилированная схема против проверки по работам.
+
+Запуск: python benchmarks/validator_bench.py [--items 10000] [--repeat 20]
+
+Прежний путь - проверка верхнего уровня ответа и parse_status для каждой
+работы, которая по одной находит KeyError или ValueError. Он проверяет
+только status и homework_name, поэтому рядом замерена и проверка по одной
+работе тех же полей, что у схемы. Новый путь - validate_homeworks,
+который проверяет все работы по схеме.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import homework  # noqa: E402
+import validator  # noqa: E402
+
+STATUSES = tuple(homework.HOMEWORK_VERDICTS)
+
+
+def payload(count):
+    return {
+        'homeworks': [
+            {
+                'id': number,
+                'status': STATUSES[number % len(STATUSES)],
+                'homework_name': f'student__hw{number:05}.zip',
+                'reviewer_comment': 'Всё хорошо.',
+                'date_updated': f'2024-{number % 12 + 1:02}-01T12:00:00Z',
+                'lesson_name': f'Спринт {number // 100}',
+            }
+            for number in range(count)
+        ],
+        'current_date': 1_700_000_000,
+    }
+
+
+def per_item(response):
+    """Прежний путь: верхний уровень и parse_status каждой работы."""
+    if not isinstance(response, dict) or 'homeworks' not in response:
+        raise TypeError
+    homeworks = response['homeworks']
+    if not isinstance(homeworks, list):
+        raise TypeError
+    for work in homeworks:
+        homework.parse_status(work)
+
+
+def per_item_schema(response):
+    """Проверка по одной работе тех же полей, что у схемы."""
+    for index, work in enumerate(response['homeworks']):
+        if validator.describe(homework.HOMEWORK_SCHEMA, index, work):
+            raise ValueError
+
+
+def compiled(response):
+    """Новый путь: проверка всех работ скомпилированной схемой."""
+    if homework.validate_homeworks(response['homeworks']):
+        raise ValueError
+
+
+def best(function, response, repeat):
+    return min(timeit.repeat(
+        lambda: function(response), number=1, repeat=repeat
+    ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    response = payload(args.items)
+    new = best(compiled, response, args.repeat)
+    print(f'items={args.items} compiled={new * 1000:.2f} ms')
+    for function in (per_item, per_item_schema):
+        old = best(function, response, args.repeat)
+        print(f'{function.__name__}={old * 1000:.2f} ms '
+              f'speedup={old / new:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
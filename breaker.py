@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+
+from exceptions import CircuitOpen
+import metrics
+
+
+CIRCUIT_STATE_CHANGED = 'Предохранитель {name}: {old} -> {new}.'
+CIRCUIT_OPEN_ERROR = (
+    'Сервис {name} недоступен, запросы приостановлены; '
+    'пробный запрос раз в {interval:.0f} с.'
+)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+FAILURE_THRESHOLD = 5
+PROBE_INTERVAL = 60.0
+
+BREAKERS = {}
+
+metrics.REGISTRY.gauge(
+    'homework_circuit_state',
+    'Состояние предохранителя: 0 - закрыт, 1 - проба, 2 - открыт.',
+    lambda: {
+        name: STATE_VALUES[breaker.state]
+        for name, breaker in list(BREAKERS.items())
+    },
+    'dependency'
+)
+CIRCUIT_REJECTED = metrics.REGISTRY.counter(
+    'homework_circuit_rejected_total',
+    'Вызовы, не выполненные из-за открытого предохранителя.',
+    'dependency'
+)
+
+
+class CircuitBreaker:
+    """Предохранитель внешней зависимости.
+
+    После failure_threshold сбоев подряд вызовы отклоняются; через
+    probe_interval пропускается один пробный вызов, и его успех
+    закрывает предохранитель, а сбой снова открывает.
+    """
+
+    def __init__(self, name, failure_threshold=FAILURE_THRESHOLD,
+                 probe_interval=PROBE_INTERVAL, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.lock = threading.Lock()
+
+    def switch(self, state):
+        if state == self.state:
+            return
+        logging.warning(CIRCUIT_STATE_CHANGED.format(
+            name=self.name,
+            old=self.state,
+            new=state
+        ))
+        self.state = state
+
+    def allow(self):
+        """Можно ли выполнить вызов сейчас."""
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.probe_interval:
+                    return False
+                self.switch(HALF_OPEN)
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def check(self):
+        """CircuitOpen, если вызов сейчас выполнять нельзя."""
+        if not self.allow():
+            CIRCUIT_REJECTED.inc(self.name)
+            raise CircuitOpen(CIRCUIT_OPEN_ERROR.format(
+                name=self.name,
+                interval=self.probe_interval
+            ))
+
+    def succeeded(self):
+        """Учёт успешного вызова."""
+        with self.lock:
+            self.failures = 0
+            self.probing = False
+            self.switch(CLOSED)
+
+    def failed(self):
+        """Учёт сбоя зависимости."""
+        with self.lock:
+            self.failures += 1
+            self.probing = False
+            if (self.state == HALF_OPEN
+                    or self.failures >= self.failure_threshold):
+                self.opened_at = self.clock()
+                self.switch(OPEN)
+
+
+class NullBreaker:
+    """Предохранитель, который всегда пропускает вызовы."""
+
+    state = CLOSED
+
+    def allow(self):
+        return True
+
+    def check(self):
+        """Ничего не проверяет."""
+
+    def succeeded(self):
+        """Ничего не учитывает."""
+
+    def failed(self):
+        """Ничего не учитывает."""
+
+
+def from_env(name):
+    """Предохранитель с порогом и интервалом проб из окружения."""
+    breaker = CircuitBreaker(
+        name,
+        failure_threshold=int(
+            os.getenv('BREAKER_FAILURES', FAILURE_THRESHOLD)
+        ),
+        probe_interval=float(
+            os.getenv('BREAKER_PROBE_INTERVAL', PROBE_INTERVAL)
+        ),
+    )
+    BREAKERS[name] = breaker
+    return breaker
@@ -0,0 +1,119 @@
+from contextlib import contextmanager
+import json
+import time
+
+
+class SimulationFinished(Exception):
+    """Виртуальное время или записанные ответы закончились."""
+
+
+class VirtualClock:
+    """Часы с интерфейсом модуля time, где sleep только сдвигает время.
+
+    perf_counter остаётся настоящим: им измеряется работа самого кода.
+    """
+
+    perf_counter = staticmethod(time.perf_counter)
+
+    def __init__(self, start=None, until=None, max_sleeps=None):
+        self.now = time.time() if start is None else start
+        self.until = until
+        self.max_sleeps = max_sleeps
+        self.sleeps = 0
+        self.finished = False
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def advance(self, seconds):
+        """Сдвиг времени вперёд без учёта как сна."""
+        self.now += max(0, seconds)
+
+    def advance_to(self, moment):
+        """Перевод часов на момент, если он ещё не наступил."""
+        self.now = max(self.now, moment)
+
+    def finish(self):
+        """Остановка симуляции при следующем вызове sleep."""
+        self.finished = True
+
+    def sleep(self, seconds):
+        if self.finished or (
+            self.max_sleeps is not None and self.sleeps >= self.max_sleeps
+        ):
+            raise SimulationFinished
+        self.sleeps += 1
+        self.advance(seconds)
+        if self.until is not None and self.now >= self.until:
+            self.now = self.until
+            self.finished = True
+
+
+@contextmanager
+def install(clock, *modules):
+    """Подмена модуля time у модулей бота на время блока with."""
+    if not modules:
+        import homework
+        modules = (homework,)
+    previous = [module.time for module in modules]
+    for module in modules:
+        module.time = clock
+    try:
+        yield clock
+    finally:
+        for module, original in zip(modules, previous):
+            module.time = original
+
+
+class RecordedResponse:
+    """Ответ API, восстановленный из записи."""
+
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.content = body.encode() if isinstance(body, str) else body
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ReplayDriver:
+    """Прогон цикла бота по записанным ответам в виртуальном времени.
+
+    Записи - кортежи (момент, код ответа, тело, ...), например из
+    recorder.read_records. Драйвер подставляется вместо HTTP-сессии
+    и переводит часы на момент каждого ответа.
+    """
+
+    def __init__(self, records, clock=None):
+        self.records = iter(records)
+        self.clock = clock or VirtualClock(start=0)
+        self.served = 0
+
+    def get(self, url=None, headers=None, params=None, **kwargs):
+        try:
+            moment, status_code, body = next(self.records)[:3]
+        except StopIteration:
+            self.clock.finish()
+            return RecordedResponse(200, b'{"homeworks": []}')
+        self.served += 1
+        self.clock.advance_to(moment)
+        return RecordedResponse(status_code, body)
+
+    def run(self, main=None, module=None):
+        """Запуск main() до конца записи; возвращает число ответов."""
+        if module is None:
+            import homework
+            module = homework
+        previous_session = module.API_SESSION
+        module.API_SESSION = self
+        try:
+            with install(self.clock, module):
+                (main or module.main)()
+        except SimulationFinished:
+            pass
+        finally:
+            module.API_SESSION = previous_session
+        return self.served
@@ -0,0 +1,32 @@
+import logging
+
+
+CLOCK_SKEW = (
+    'current_date API ({current}) опережает местные часы на {skew} с, '
+    'курсор ограничен.'
+)
+
+OVERLAP = 60
+MAX_SKEW = 300
+
+
+def advance(from_date, response, held=False, now=None, overlap=OVERLAP,
+            max_skew=MAX_SKEW):
+    """from_date следующего запроса после проверенного ответа API.
+
+    Окно перекрывается с предыдущим на overlap секунд, чтобы не потерять
+    работы, обновлённые на границе окна; повторы отсекает индекс статусов.
+    Курсор не двигается назад, не уходит вперёд местных часов больше чем
+    на max_skew и стоит на месте, пока есть недоставленные уведомления.
+    """
+    current = response.get('current_date')
+    if held or isinstance(current, bool) or not isinstance(
+            current, (int, float)):
+        return from_date
+    if now is not None and current > now + max_skew:
+        logging.warning(CLOCK_SKEW.format(
+            current=current,
+            skew=int(current - now)
+        ))
+        current = now + max_skew
+    return max(from_date, int(current) - overlap)
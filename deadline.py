@@ -0,0 +1,145 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import sys
+import threading
+import time
+import traceback
+
+from exceptions import DeadlineExceeded
+import metrics
+
+
+DEADLINE_EXCEEDED = 'Бюджет итерации {budget} с исчерпан: {operation}.'
+ITERATION_STALLED = (
+    'Итерация цикла идёт уже {elapsed:.0f} с (порог {threshold} с), '
+    'стек потока:\n{stack}'
+)
+
+ITERATION_BUDGET = 60.0
+ERROR_REPORT_BUDGET = 10.0
+
+STALLED_ITERATIONS = metrics.REGISTRY.counter(
+    'homework_stalled_iterations_total',
+    'Итерации цикла, превысившие порог сторожа.'
+)
+
+_current = ContextVar('deadline', default=None)
+
+
+class Deadline:
+    """Срок, к которому должна закончиться текущая итерация."""
+
+    def __init__(self, budget, clock=time.monotonic):
+        self.budget = budget
+        self.clock = clock
+        self.expires_at = clock() + budget
+
+    def remaining(self):
+        return self.expires_at - self.clock()
+
+    def check(self, operation):
+        """Исключение, если бюджет уже исчерпан."""
+        if self.remaining() <= 0:
+            raise DeadlineExceeded(DEADLINE_EXCEEDED.format(
+                budget=self.budget,
+                operation=operation
+            ))
+
+    def reserve(self, seconds, operation):
+        """Исключение, если пауза seconds не закончится до срока."""
+        if seconds >= self.remaining():
+            raise DeadlineExceeded(DEADLINE_EXCEEDED.format(
+                budget=self.budget,
+                operation=operation
+            ))
+
+    def timeout(self, limit, operation):
+        """Таймаут вызова: не больше limit и не дольше остатка бюджета."""
+        self.check(operation)
+        return min(limit, self.remaining())
+
+
+@contextmanager
+def budget(seconds, clock=time.monotonic):
+    """Бюджет времени для вызовов внутри блока with."""
+    token = _current.set(Deadline(seconds, clock))
+    try:
+        yield _current.get()
+    finally:
+        _current.reset(token)
+
+
+def current():
+    """Действующий срок или None вне бюджета."""
+    return _current.get()
+
+
+def timeout(limit, operation):
+    """Таймаут для блокирующего вызова с учётом действующего срока."""
+    deadline = _current.get()
+    if deadline is None:
+        return limit
+    return deadline.timeout(limit, operation)
+
+
+def raise_if_expired(operation):
+    """DeadlineExceeded, если срок действует и уже прошёл."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check(operation)
+
+
+class Watchdog:
+    """Фоновая проверка, что итерация цикла не зависла."""
+
+    def __init__(self, threshold, interval=None, clock=time.monotonic):
+        self.threshold = threshold
+        self.interval = interval or max(threshold / 4, 0.01)
+        self.clock = clock
+        self.started_at = None
+        self.reported = False
+        self.thread_id = None
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(
+            target=self.run, name='watchdog', daemon=True
+        )
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def beat(self):
+        """Начало итерации в вызывающем потоке."""
+        self.thread_id = threading.get_ident()
+        self.reported = False
+        self.started_at = self.clock()
+
+    def idle(self):
+        """Итерация закончилась, цикл ждёт следующей."""
+        self.started_at = None
+
+    def check(self):
+        """Запись зависшей итерации, не чаще раза за итерацию."""
+        started_at = self.started_at
+        if started_at is None or self.reported:
+            return False
+        elapsed = self.clock() - started_at
+        if elapsed < self.threshold:
+            return False
+        self.reported = True
+        STALLED_ITERATIONS.inc()
+        frame = sys._current_frames().get(self.thread_id)
+        logging.warning(ITERATION_STALLED.format(
+            elapsed=elapsed,
+            threshold=self.threshold,
+            stack=''.join(traceback.format_stack(frame)) if frame else ''
+        ))
+        return True
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,204 @@
+from collections import OrderedDict
+import logging
+import threading
+import time
+
+import homework
+
+
+DELIVERY_QUEUE_FULL = (
+    'Очередь отправки переполнена, сообщение в чат {chat_id} пропущено.'
+)
+DELIVERY_FAILED = 'Не удалось доставить {count} сообщ. в чат {chat_id}.'
+MESSAGES_COALESCED = 'Объединено сообщений для чата {chat_id}: {count}.'
+
+CHAT_RATE = 1.0
+CHAT_BURST = 1
+GLOBAL_RATE = 30.0
+GLOBAL_BURST = 30
+QUEUE_SIZE = 1000
+MESSAGE_MAX_LENGTH = 4096
+MESSAGE_SEPARATOR = '\n\n'
+
+
+class TokenBucket:
+    """Ограничитель частоты «ведро токенов»."""
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+
+    def refill(self):
+        """Пополнение токенов за прошедшее время."""
+        now = self.clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated) * self.rate
+        )
+        self.updated = now
+
+    def delay(self):
+        """Сколько секунд ждать до появления токена."""
+        self.refill()
+        if self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self):
+        """Списание одного токена."""
+        self.tokens -= 1
+
+
+class DeliveryQueue:
+    """Фоновая отправка сообщений с ограничением частоты.
+
+    Сообщения, ждущие отправки в один чат, склеиваются в одно. Итог
+    отправки сообщается функции on_done(sent) из фонового потока.
+    """
+
+    def __init__(self, bot, chat_rate=CHAT_RATE, global_rate=GLOBAL_RATE,
+                 maxsize=QUEUE_SIZE, send=None, clock=time.monotonic):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.maxsize = maxsize
+        self.send = send or homework.send_chat_message
+        self.clock = clock
+        self.global_bucket = TokenBucket(global_rate, GLOBAL_BURST, clock)
+        self.chat_buckets = {}
+        self.pending = OrderedDict()
+        self.depth = 0
+        self.counters = dict.fromkeys(
+            ('queued', 'sent', 'failed', 'dropped', 'coalesced'), 0
+        )
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(
+            target=self.run, name='delivery', daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, chat_id, message, wait=0, on_done=None):
+        """Постановка сообщения в очередь, False при переполнении.
+
+        С wait переполненная очередь ждёт места до wait секунд. on_done
+        вызывается после попытки отправки с её результатом.
+        """
+        with self.condition:
+            if wait and self.depth >= self.maxsize:
+                self.condition.wait_for(
+                    lambda: self.depth < self.maxsize, wait
+                )
+            if self.depth >= self.maxsize:
+                self.counters['dropped'] += 1
+                logging.warning(DELIVERY_QUEUE_FULL.format(chat_id=chat_id))
+                return False
+            self.pending.setdefault(chat_id, []).append(
+                (message, self.clock(), on_done)
+            )
+            self.depth += 1
+            self.counters['queued'] += 1
+            self.condition.notify()
+        return True
+
+    def bucket(self, chat_id):
+        """Ограничитель частоты для чата."""
+        if chat_id not in self.chat_buckets:
+            self.chat_buckets[chat_id] = TokenBucket(
+                self.chat_rate, CHAT_BURST, self.clock
+            )
+        return self.chat_buckets[chat_id]
+
+    def next_ready(self):
+        """Чат, в который можно отправить сейчас, или время ожидания."""
+        wait = self.global_bucket.delay()
+        if wait:
+            return None, wait
+        for chat_id in self.pending:
+            bucket = self.bucket(chat_id)
+            chat_wait = bucket.delay()
+            if not chat_wait:
+                bucket.consume()
+                self.global_bucket.consume()
+                return chat_id, 0
+            wait = chat_wait if not wait else min(wait, chat_wait)
+        return None, wait
+
+    def take(self, chat_id):
+        """Склейка ждущих сообщений чата в пределах лимита длины."""
+        messages = self.pending.pop(chat_id)
+        length = len(messages[0][0])
+        count = 1
+        while count < len(messages):
+            length += len(MESSAGE_SEPARATOR) + len(messages[count][0])
+            if length > MESSAGE_MAX_LENGTH:
+                break
+            count += 1
+        batch, rest = messages[:count], messages[count:]
+        if rest:
+            self.pending[chat_id] = rest
+            self.pending.move_to_end(chat_id)
+        return batch
+
+    def run(self):
+        """Цикл фонового потока отправки."""
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                chat_id, wait = self.next_ready()
+                if chat_id is None:
+                    self.condition.wait(wait)
+                    continue
+                batch = self.take(chat_id)
+            self.deliver(chat_id, batch)
+            with self.condition:
+                self.depth -= len(batch)
+                self.condition.notify_all()
+
+    def deliver(self, chat_id, batch):
+        """Отправка склеенного сообщения и учёт задержки."""
+        if len(batch) > 1:
+            self.counters['coalesced'] += len(batch) - 1
+            logging.debug(MESSAGES_COALESCED.format(
+                chat_id=chat_id,
+                count=len(batch)
+            ))
+        text = MESSAGE_SEPARATOR.join(message for message, _, _ in batch)
+        sent = self.send(self.bot, chat_id, text)
+        if sent:
+            self.counters['sent'] += 1
+        else:
+            self.counters['failed'] += 1
+            logging.error(DELIVERY_FAILED.format(
+                chat_id=chat_id,
+                count=len(batch)
+            ))
+        latency = self.clock() - batch[0][1]
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        for _, _, on_done in batch:
+            if on_done is not None:
+                on_done(sent)
+
+    def stats(self):
+        """Счётчики очереди: глубина, отправки и задержка доставки."""
+        with self.condition:
+            stats = dict(self.counters, depth=self.depth)
+        delivered = stats['sent'] + stats['failed']
+        stats['latency_avg'] = (
+            self.latency_total / delivered if delivered else 0.0
+        )
+        stats['latency_max'] = self.latency_max
+        return stats
+
+    def join(self, timeout=None):
+        """Ожидание опустошения очереди."""
+        deadline = None if timeout is None else self.clock() + timeout
+        while self.depth:
+            if deadline is not None and self.clock() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
@@ -0,0 +1,121 @@
+import json_stream
+import model
+
+
+def homework_key(homework):
+    """Ключ работы в индексе: id и название."""
+    return homework.get('id'), homework.get('homework_name')
+
+
+def fingerprint(homeworks):
+    """Дешёвый отпечаток ответа API.
+
+    API отдаёт работы от последней обновлённой к самой старой, поэтому
+    любое изменение статуса меняет первую работу списка.
+    """
+    if not homeworks:
+        return 0, None
+    return summary(len(homeworks), homeworks[0])
+
+
+def summary(count, head):
+    """Отпечаток по числу работ и первой из них."""
+    if not count:
+        return 0, None
+    return (
+        count,
+        homework_key(head),
+        head.get('status'),
+        head.get('date_updated'),
+    )
+
+
+class HomeworkIndex:
+    """Индекс последних известных статусов работ.
+
+    ordered=False отключает остановку на работах старше уже отправленных:
+    нужно, когда работы приходят не по порядку (push-обновления).
+    Статусы хранятся записями model.Tracked по ключу model.slot.
+    """
+
+    __slots__ = (
+        'ordered', 'items', 'watermark', 'fingerprint', 'pending', 'on_commit'
+    )
+
+    def __init__(self, on_commit=None, ordered=True):
+        self.ordered = ordered
+        self.items = {}
+        self.watermark = None
+        self.fingerprint = None
+        self.pending = None
+        self.on_commit = on_commit
+
+    def restore(self, items):
+        """Восстановление индекса из сохранённого состояния.
+
+        items - словарь {(id, название): (статус, дата)}, как в хранилище.
+        """
+        for (homework_id, name), (status, date_updated) in items.items():
+            self.items[model.slot(homework_id, name)] = model.Tracked(
+                name, status, date_updated
+            )
+        dates = [date for _, date in items.values() if date is not None]
+        if self.watermark is not None:
+            dates.append(self.watermark)
+        if dates:
+            self.watermark = max(dates)
+
+    def transitions(self, homeworks):
+        """Работы, статус которых изменился с прошлого опроса.
+
+        Поток работ (json_stream.Homeworks) перебирается до конца, и его
+        отпечаток сравнивается уже после этого.
+        """
+        streamed = isinstance(homeworks, json_stream.Homeworks)
+        if not streamed:
+            current = fingerprint(homeworks)
+            if current == self.fingerprint:
+                return []
+        changed = []
+        for homework in homeworks:
+            date_updated = homework.get('date_updated')
+            if (self.ordered and date_updated is not None
+                    and self.watermark is not None
+                    and date_updated < self.watermark):
+                break
+            homework_id, name = homework_key(homework)
+            tracked = self.items.get(model.slot(homework_id, name))
+            if tracked is None or not tracked.matches(
+                    name, homework.get('status'), date_updated):
+                changed.append(homework)
+        if streamed:
+            homeworks.drain()
+            current = summary(homeworks.count, homeworks.head)
+            if current == self.fingerprint:
+                return []
+        self.pending = [current, len(changed)]
+        if not changed:
+            self.fingerprint = current
+        return changed
+
+    def commit(self, homework):
+        """Запоминание статуса работы после успешного уведомления."""
+        key = homework_key(homework)
+        status = homework.get('status')
+        date_updated = homework.get('date_updated')
+        self.items[model.slot(*key)] = model.Tracked(
+            key[1], status, date_updated
+        )
+        if self.on_commit is not None:
+            self.on_commit(key, status, date_updated)
+        if date_updated is not None and (
+                self.watermark is None or date_updated > self.watermark):
+            self.watermark = date_updated
+        if self.pending:
+            self.pending[1] -= 1
+            if not self.pending[1]:
+                self.fingerprint = self.pending[0]
+
+    def undelivered(self):
+        """Остались ли изменения, уведомление о которых не доставлено."""
+        return bool(self.pending and self.pending[1])
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+import re
+import time
+
+
+DIGEST_HEADER = 'Сводка ошибок за последние {minutes} мин:'
+DIGEST_LINE = '{name} x {count}: {message}'
+DIGEST_OTHER = 'Прочие ошибки x {count}'
+
+WINDOW = 600
+MAX_FINGERPRINTS = 50
+MESSAGE_LENGTH = 200
+LINE_MESSAGE_LENGTH = 100
+
+NORMALIZERS = (
+    (re.compile(r'OAuth \S+'), 'OAuth <token>'),
+    (re.compile(r'https?://\S+'), '<url>'),
+    (re.compile(r'0x[0-9a-fA-F]+'), '<hex>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<n>'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def normalize(message):
+    """Текст ошибки без меняющихся от вызова к вызову деталей."""
+    for pattern, replacement in NORMALIZERS:
+        message = pattern.sub(replacement, message)
+    return message.strip()[:MESSAGE_LENGTH]
+
+
+def fingerprint(error):
+    """Отпечаток исключения: класс и нормализованный текст."""
+    return f'{type(error).__name__}: {normalize(str(error))}'
+
+
+class ErrorDigest:
+    """Счётчики ошибок по отпечаткам в скользящем окне.
+
+    О новой ошибке сообщается сразу, о её повторах - одной сводкой
+    в конце окна. Число отпечатков ограничено: самые давние вытесняются
+    в строку «прочие ошибки».
+    """
+
+    def __init__(self, window=WINDOW, max_fingerprints=MAX_FINGERPRINTS,
+                 clock=time.monotonic):
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.other = 0
+        self.window_started = clock()
+
+    def restore(self, key):
+        """Отпечаток, о котором уже сообщено до перезапуска."""
+        if key:
+            self.entries[key] = [0, 0, True]
+
+    def add(self, error):
+        """Учёт ошибки; отпечаток, если о ней нужно сообщить сразу."""
+        key = fingerprint(error)
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= self.max_fingerprints:
+                _, evicted = self.entries.popitem(last=False)
+                self.other += evicted[0] - evicted[1]
+            entry = self.entries[key] = [0, 0, False]
+        else:
+            self.entries.move_to_end(key)
+        entry[0] += 1
+        return None if entry[2] else key
+
+    def mark_reported(self, key):
+        """Сообщение об ошибке доставлено."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            entry[1] = entry[0]
+            entry[2] = True
+
+    def pop_digest(self):
+        """Текст сводки, если окно закончилось и были повторы."""
+        if self.clock() - self.window_started < self.window:
+            return None
+        lines = [
+            DIGEST_LINE.format(
+                name=key.split(':', 1)[0],
+                count=count,
+                message=key.split(': ', 1)[-1][:LINE_MESSAGE_LENGTH]
+            )
+            for key, (count, reported, _) in sorted(
+                self.entries.items(), key=lambda item: -item[1][0]
+            )
+            if count > reported
+        ]
+        if self.other:
+            lines.append(DIGEST_OTHER.format(count=self.other))
+        self.roll()
+        if not lines:
+            return None
+        return '\n'.join(
+            [DIGEST_HEADER.format(minutes=round(self.window / 60))] + lines
+        )
+
+    def roll(self):
+        """Новое окно: затихшие ошибки забываются, счётчики обнуляются."""
+        self.window_started = self.clock()
+        self.other = 0
+        for key in [key for key, entry in self.entries.items()
+                    if not entry[0]]:
+            del self.entries[key]
+        for entry in self.entries.values():
+            entry[0] = entry[1] = 0
@@ -4,3 +4,17 @@ class HTTPStatusNotOK(Exception):
 
 class ResponseError(Exception):
     pass
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class InvalidHomeworks(ValueError):
+    def __init__(self, message, violations=()):
+        super().__init__(message)
+        self.violations = list(violations)
@@ -1,16 +1,38 @@
+import atexit
+from functools import partial
 from http import HTTPStatus
 import logging
 import os
 import sys
 import time
 
-from dotenv import load_dotenv
-from playsound import playsound
-import requests
-import telegram
+if __name__ == '__main__':
+    # Модули бота импортируют homework: при запуске скрипта они должны
+    # получить этот модуль, а не загрузить второй, не настроенный.
+    sys.modules.setdefault('homework', sys.modules[__name__])
 
-from exceptions import HTTPStatusNotOK, ResponseError
+import api_cache
+import audio
+import breaker
+import cursor
+import deadline
+import diff
+import error_digest
+from exceptions import (
+    DeadlineExceeded, HTTPStatusNotOK, InvalidHomeworks, ResponseError
+)
+import json_stream
+import lazy
+import log_pipeline
+import metrics
+import model
+import recorder
+import scheduler
+import state
+import validator
 
+requests = lazy.module('requests')
+telegram = lazy.module('telegram')
 
 EXCEPTION_ERROR = 'Сбой в работе программы: {error}'
 TOKENS_ERROR = 'Не валидные переменные окружения: {env_vars}!'
@@ -23,6 +45,10 @@ HOMEWORKS_NOT_LIST_ERROR = (
 )
 HOMEWORKS_NOT_IN_DICT_ERROR = 'Ключ "homeworks" отсутствует в словаре!'
 HOMEWORK_NAME_NOT_IN_DICT_ERROR = 'Ключ "homework_name" отсутсвует в словаре!'
+HOMEWORKS_INVALID_ERROR = (
+    'Работы в ответе API не соответствуют схеме, нарушений {count}:\n'
+    '{violations}'
+)
 JSON_ERROR = (
     'Сервер прислал ответ с ошибкой: {key}: {error}'
     'Параметры запроса:\n'
@@ -50,10 +76,13 @@ STATUS_HAS_CHANGED = ('Изменился статус проверки рабо
 STATUS_HAS_NOT_CHANGED = 'Статус проверки не изменился.'
 SEND_MESSAGE_SUCCESS = 'Успешная отправка сообщения: {message}.'
 SEND_MESSAGE_ERROR = 'Ошибка при отправке сообщения: {message}\n{error}'
+SEND_MESSAGE_SKIPPED = (
+    'Telegram недоступен, сообщение не отправлено: {message}'
+)
+API_OPERATION = 'запрос к API домашки'
+SEND_OPERATION = 'отправка сообщения в Telegram'
 
 
-load_dotenv()
-
 ENV_VARS = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
 
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
@@ -71,9 +100,44 @@ HOMEWORK_VERDICTS = {
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
 }
+model.register_statuses(HOMEWORK_VERDICTS)
+
+HOMEWORK_SCHEMA = (
+    validator.Field('id', int),
+    validator.Field('homework_name', str, required=True),
+    validator.Field('status', HOMEWORK_VERDICTS, required=True),
+    validator.Field('date_updated', validator.DATE),
+)
+validate_homeworks = validator.compile_items(HOMEWORK_SCHEMA)
+VIOLATIONS_SHOWN = 10
 
 SOUNDS_PATH = 'sounds/'
 
+API_TIMEOUT = 15
+TELEGRAM_TIMEOUT = 10
+
+API_SESSION = None
+API_RECORDER = None
+API_STREAM = False
+API_BREAKER = breaker.NullBreaker()
+TELEGRAM_BREAKER = breaker.NullBreaker()
+
+
+def configure():
+    """Чтение .env и токенов один раз при запуске скрипта.
+
+    Вызывается в блоке __main__ до выбора режима, а не в main():
+    настройку читают и main(), и режимы accounts, async_bot и
+    push_server, а main() не затирает токены, заданные атрибутами модуля.
+    """
+    global PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, HEADERS
+    from dotenv import load_dotenv
+    load_dotenv()
+    PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
+    TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
+    TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+    HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+
 
 def check_tokens():
     """Проверка токенов."""
@@ -85,11 +149,29 @@ def check_tokens():
 
 def send_message(bot, message):
     """Отправка сообщения бота в Telegram."""
+    return send_chat_message(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_chat_message(bot, chat_id, message):
+    """Отправка сообщения бота в указанный чат Telegram."""
+    timeout = deadline.timeout(TELEGRAM_TIMEOUT, SEND_OPERATION)
+    if not TELEGRAM_BREAKER.allow():
+        logging.warning(SEND_MESSAGE_SKIPPED.format(message=message))
+        return False
+    started = time.perf_counter()
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        bot.send_message(chat_id=chat_id, text=message, timeout=timeout)
+        TELEGRAM_BREAKER.succeeded()
+        metrics.TELEGRAM_LATENCY.observe(time.perf_counter() - started)
         logging.info(SEND_MESSAGE_SUCCESS.format(message=message))
         return True
     except telegram.error.TelegramError as error:
+        if isinstance(error, telegram.error.NetworkError):
+            TELEGRAM_BREAKER.failed()
+        else:
+            TELEGRAM_BREAKER.succeeded()
+        if isinstance(error, telegram.error.TimedOut):
+            deadline.raise_if_expired(SEND_OPERATION)
         logging.exception(SEND_MESSAGE_ERROR.format(
             message=message,
             error=error
@@ -99,21 +181,81 @@ def send_message(bot, message):
 
 def get_api_answer(timestamp):
     """Выполнение API-запроса."""
-    params = {
-        'url': ENDPOINT,
-        'headers': HEADERS,
-        'params': {'from_date': timestamp}
+    return request_homeworks(timestamp, HEADERS)
+
+
+def poll_api(timestamp):
+    """Запрос основного цикла: с потоковым разбором при API_STREAM."""
+    if API_STREAM:
+        return stream_homeworks(timestamp, HEADERS)
+    return get_api_answer(timestamp)
+
+
+def request_params(timestamp, headers, endpoint=None):
+    """Параметры запроса к API домашки."""
+    return {
+        'url': endpoint or ENDPOINT,
+        'headers': headers,
+        'params': {'from_date': timestamp},
+        'timeout': deadline.timeout(API_TIMEOUT, API_OPERATION)
     }
+
+
+def send_request(params, **options):
+    """GET-запрос к API через предохранитель; ответ и время запроса.
+
+    Любое исключение запроса, в том числе DeadlineExceeded из паузы
+    перед повтором, учитывается как сбой: иначе пробный запрос остался
+    бы без итога, и предохранитель больше не пропустил бы ни одного.
+    """
+    API_BREAKER.check()
+    started = time.perf_counter()
     try:
-        response = requests.get(**params)
+        response = (API_SESSION or requests).get(**params, **options)
     except requests.RequestException as error:
-        raise ConnectionError(REQUEST_ERROR.format(error=error, **params))
+        raise request_failed(error, params)
+    except Exception:
+        API_BREAKER.failed()
+        raise
+    return response, time.perf_counter() - started
+
+
+def request_failed(error, params):
+    """Учёт сбоя запроса предохранителем и ошибка для вызывающего.
+
+    Сбой после истечения бюджета итерации становится DeadlineExceeded:
+    requests сообщает о таймауте чтения тела как о ConnectionError.
+    """
+    API_BREAKER.failed()
+    if isinstance(error, (requests.Timeout, requests.ConnectionError)):
+        deadline.raise_if_expired(API_OPERATION)
+    return ConnectionError(REQUEST_ERROR.format(error=error, **params))
+
+
+def stream_chunks(response, params):
+    """Части тела потокового ответа со сбоями, как у send_request."""
+    try:
+        yield from response.iter_content(json_stream.CHUNK_SIZE)
+    except requests.RequestException as error:
+        response.close()
+        raise request_failed(error, params)
+
+
+def check_status_code(response, params):
+    """Учёт кода ответа предохранителем и ошибка, если он не 200."""
     response_code = response.status_code
+    if response_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        API_BREAKER.failed()
+    else:
+        API_BREAKER.succeeded()
     if response_code != HTTPStatus.OK:
         raise HTTPStatusNotOK(RESPONSE_CODE_ERROR.format(
-            response_code,
+            code=response_code,
             **params))
-    json = response.json()
+
+
+def check_error_keys(json, params):
+    """Ошибка, если сервер прислал ключ error или code."""
     for key in ['error', 'code']:
         if key in json:
             raise ResponseError(
@@ -123,11 +265,60 @@ def get_api_answer(timestamp):
                     **params
                 )
             )
+
+
+def request_homeworks(timestamp, headers, endpoint=None):
+    """Выполнение API-запроса с заголовками конкретного аккаунта."""
+    params = request_params(timestamp, headers, endpoint)
+    response, duration = send_request(params)
+    content = getattr(response, 'content', b'')
+    metrics.API_LATENCY.observe(duration)
+    metrics.API_RESPONSE_SIZE.observe(len(content))
+    if API_RECORDER:
+        API_RECORDER.record(
+            time.time(), response.status_code, duration, timestamp, content
+        )
+    check_status_code(response, params)
+    json = response.json()
+    check_error_keys(json, params)
     return json
 
 
+def stream_homeworks(timestamp, headers, endpoint=None):
+    """API-запрос, тело ответа которого разбирается по частям.
+
+    Работы проверяются по схеме по мере перебора, от них остаются только
+    поля схемы. Ключи error и code, размер ответа и нарушения схемы
+    проверяются, когда ответ разобран до конца.
+    """
+    params = request_params(timestamp, headers, endpoint)
+    response, duration = send_request(params, stream=True)
+    metrics.API_LATENCY.observe(duration)
+    try:
+        check_status_code(response, params)
+    except HTTPStatusNotOK:
+        response.close()
+        raise
+    return json_stream.HomeworkStream(
+        stream_chunks(response, params),
+        check=partial(validator.describe, HOMEWORK_SCHEMA),
+        keep=[field.name for field in HOMEWORK_SCHEMA],
+        on_end=partial(finish_stream, params),
+        close=response.close
+    )
+
+
+def finish_stream(params, stream):
+    """Проверки потокового ответа после его полного разбора."""
+    metrics.API_RESPONSE_SIZE.observe(stream.size)
+    check_error_keys(stream.fields, params)
+    raise_violations(stream.violations)
+
+
 def check_response(response):
     """Проверка HTTP-ответа."""
+    if isinstance(response, json_stream.HomeworkStream):
+        return check_stream(response)
     if not isinstance(response, dict):
         raise TypeError(RESPONSE_NOT_DICT_ERROR.format(
             response_type=type(response)
@@ -139,9 +330,45 @@ def check_response(response):
         raise TypeError(HOMEWORKS_NOT_LIST_ERROR.format(
             homeworks_type=type(homeworks)
         ))
+    raise_violations(validate_homeworks(homeworks))
     return response
 
 
+def timed_check(response):
+    """check_response с учётом времени проверки в PARSE_TIME."""
+    started = time.perf_counter()
+    response = check_response(response)
+    metrics.PARSE_TIME.observe(time.perf_counter() - started)
+    return response
+
+
+def check_stream(response):
+    """Проверка потокового ответа до разбора работ.
+
+    Работы проверяет сам поток по мере перебора.
+    """
+    if response.fields is None:
+        raise TypeError(RESPONSE_NOT_DICT_ERROR.format(
+            response_type=type(response.value)
+        ))
+    if 'homeworks' not in response:
+        raise KeyError(HOMEWORKS_NOT_IN_DICT_ERROR)
+    if not response.array:
+        raise TypeError(HOMEWORKS_NOT_LIST_ERROR.format(
+            homeworks_type=type(response.fields['homeworks'])
+        ))
+    return response
+
+
+def raise_violations(violations):
+    """Ошибка InvalidHomeworks со всеми нарушениями схемы, если они есть."""
+    if violations:
+        raise InvalidHomeworks(HOMEWORKS_INVALID_ERROR.format(
+            count=len(violations),
+            violations='\n'.join(violations[:VIOLATIONS_SHOWN])
+        ), violations)
+
+
 def parse_status(homework):
     """Получение статуса проверки домашнего задания."""
     status = homework['status']
@@ -149,54 +376,193 @@ def parse_status(homework):
         raise KeyError(HOMEWORK_NAME_NOT_IN_DICT_ERROR)
     if status not in HOMEWORK_VERDICTS:
         raise ValueError(STATUS_VALUE_ERROR.format(status=status))
+    return format_status(homework)
+
+
+def format_status(homework):
+    """Сообщение о статусе работы, уже прошедшей проверку по схеме.
+
+    Работы из check_response проверены целиком, поэтому проверки
+    parse_status для них не повторяются.
+    """
     return STATUS_HAS_CHANGED.format(
-        homework_name=homework["homework_name"],
-        verdict=HOMEWORK_VERDICTS[status]
+        homework_name=homework['homework_name'],
+        verdict=HOMEWORK_VERDICTS[homework['status']]
     )
 
 
+def send_status(bot, player, homework, verdict):
+    """Отправка нового статуса работы со звуковым сигналом."""
+    if not send_message(bot, verdict):
+        return False
+    player.play(homework['status'])
+    return True
+
+
+def notify_transitions(index, homeworks, notify):
+    """Уведомление обо всех работах с изменившимся статусом.
+
+    Возвращает True, если изменения были и все они доставлены.
+    """
+    changed = index.transitions(homeworks)
+    if not changed:
+        logging.debug(STATUS_HAS_NOT_CHANGED)
+        return False
+    for homework in reversed(changed):
+        if not notify(homework, format_status(homework)):
+            return False
+        index.commit(homework)
+    return True
+
+
+def send_report(bot, message):
+    """Отправка сообщения об ошибке в пределах ERROR_REPORT_BUDGET.
+
+    Вызывается из обработчика ошибок цикла, поэтому не бросает
+    исключений: истёкший бюджет считается неудачной отправкой.
+    """
+    with deadline.budget(deadline.ERROR_REPORT_BUDGET):
+        try:
+            return send_message(bot, message)
+        except DeadlineExceeded as error:
+            logging.error(SEND_MESSAGE_ERROR.format(
+                message=message,
+                error=error
+            ))
+            return False
+
+
+def send_digest(bot, errors):
+    """Отправка сводки повторяющихся ошибок по окончании окна."""
+    digest = errors.pop_digest()
+    if digest:
+        send_report(bot, digest)
+
+
+def setup_session():
+    """Подключение общей HTTP-сессии с пулом соединений и кэшем."""
+    global API_SESSION
+    import http_session
+    session = http_session.ApiSession.from_env()
+    http_session.export_stats(session)
+    atexit.register(session.log_stats)
+    API_SESSION = api_cache.wrap_session(session)
+
+
+def setup_breakers():
+    """Включение предохранителей для API домашки и Telegram."""
+    global API_BREAKER, TELEGRAM_BREAKER
+    API_BREAKER = breaker.from_env('practicum')
+    TELEGRAM_BREAKER = breaker.from_env('telegram')
+
+
+def setup_stream():
+    """Потоковый разбор ответов API при API_PARSE_MODE=stream.
+
+    Запись ответов в файл требует тела целиком, поэтому с ней поток
+    не включается.
+    """
+    global API_STREAM
+    API_STREAM = (
+        os.getenv('API_PARSE_MODE') == 'stream' and not API_RECORDER
+    )
+
+
+def setup_recorder():
+    """Включение записи ответов API в файл из API_RECORD_FILE."""
+    global API_RECORDER
+    API_RECORDER = recorder.open_recorder(os.getenv('API_RECORD_FILE'))
+    if API_RECORDER:
+        atexit.register(API_RECORDER.close)
+
+
 def main():
     """Основная логика работы бота."""
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
 
-    timestamp = int(time.time())
-    previous_verdict = ''
-    previous_message = ''
+    player = audio.AudioWorker(SOUNDS_PATH, HOMEWORK_VERDICTS)
+    poll_scheduler = scheduler.from_env(RETRY_PERIOD)
+    store = state.open_store(os.getenv('STATE_DB'))
+    saved = store.load(TELEGRAM_CHAT_ID)
+    index = diff.HomeworkIndex(
+        on_commit=partial(store.save_homework, TELEGRAM_CHAT_ID)
+    )
+    index.restore(saved.homeworks)
+    timestamp = saved.from_date or int(time.time())
+    errors = error_digest.ErrorDigest(clock=time.monotonic)
+    errors.restore(saved.error)
+    status = None
+    budget = float(os.getenv('ITERATION_BUDGET', deadline.ITERATION_BUDGET))
+    watchdog = deadline.Watchdog(2 * budget).start()
+    wake_at = time.monotonic()
     while True:
+        metrics.LOOP_LAG.observe(max(0, time.monotonic() - wake_at))
+        watchdog.beat()
+        last_error = None
         try:
-            response = get_api_answer(timestamp)
-            homeworks = check_response(response)['homeworks']
-            if not homeworks:
-                continue
-            status = homeworks[0]['status']
-            verdict = parse_status(homeworks[0])
-            if previous_verdict != verdict and send_message(bot, verdict):
-                playsound(SOUNDS_PATH + status + '.mp3')
-                timestamp = response.get('current_date', timestamp)
-                previous_verdict = verdict
-            else:
-                logging.debug(STATUS_HAS_NOT_CHANGED)
+            with deadline.budget(budget):
+                response = poll_api(timestamp)
+                homeworks = timed_check(response)['homeworks']
+                if homeworks:
+                    status = homeworks[0]['status']
+                    notify_transitions(
+                        index, homeworks, partial(send_status, bot, player)
+                    )
+                from_date = cursor.advance(
+                    timestamp, response, index.undelivered(), time.time()
+                )
+                if from_date != timestamp:
+                    timestamp = from_date
+                    store.save_cursor(TELEGRAM_CHAT_ID, timestamp)
         except Exception as error:
+            last_error = error
+            metrics.ERRORS.inc(type(error).__name__)
             message = EXCEPTION_ERROR.format(error=error)
             logging.exception(message)
-            if message != previous_message and send_message(bot, message):
-                previous_message = message
+            key = errors.add(error)
+            if key and send_report(bot, message):
+                errors.mark_reported(key)
+                store.save_error(TELEGRAM_CHAT_ID, key)
         finally:
-            time.sleep(RETRY_PERIOD)
+            watchdog.idle()
+            send_digest(bot, errors)
+            store.maybe_flush()
+            delay = poll_scheduler.delay(status, last_error)
+            wake_at = time.monotonic() + delay
+            time.sleep(delay)
 
 
 if __name__ == '__main__':
     logging.basicConfig(
         level=logging.INFO,
-        format=('%(asctime)s, '
-                '%(levelname)s, '
-                '%(funcName)s, '
-                '%(lineno)d, '
-                '%(message)s'
-                ),
-        handlers=[logging.FileHandler(__file__ + '.log'),
-                  logging.StreamHandler(sys.stdout)]
+        handlers=[log_pipeline.start(
+            [log_pipeline.file_handler(__file__ + '.log'),
+             logging.StreamHandler(sys.stdout)],
+            ('%(asctime)s, '
+             '%(levelname)s, '
+             '%(funcName)s, '
+             '%(lineno)d, '
+             '%(message)s'
+             )
+        )]
     )
+    configure()
+    setup_session()
+    setup_breakers()
+    setup_recorder()
+    setup_stream()
+    if os.getenv('METRICS_PORT'):
+        metrics.serve(int(os.getenv('METRICS_PORT')))
 
-    main()
+    if os.getenv('ACCOUNTS_FILE'):
+        import accounts
+        accounts.main(os.getenv('ACCOUNTS_FILE'))
+    elif '--async' in sys.argv or os.getenv('BOT_MODE') == 'async':
+        import async_bot
+        async_bot.main()
+    elif os.getenv('INGEST_MODE') == 'push':
+        import push_server
+        push_server.main()
+    else:
+        main()
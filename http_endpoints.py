@@ -0,0 +1,86 @@
+"""HTTP-обработчики сервера метрик и кэширующего прокси.
+
+Вынесены из metrics и api_cache, чтобы http.server не загружался при
+импорте бота, которому эти серверы не нужны.
+"""
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+import api_cache
+import metrics
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Отдача метрик по GET /metrics."""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.server.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', metrics.CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """Передача GET-запросов в API домашки через общий кэш."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == '/stats':
+            self.reply(HTTPStatus.OK, json.dumps(
+                self.server.cache.stats()
+            ).encode(), 'application/json')
+            return
+        headers = {
+            name: self.headers[name]
+            for name in api_cache.FORWARDED_HEADERS if name in self.headers
+        }
+        try:
+            response = self.server.cache.get(
+                self.server.upstream,
+                headers=headers,
+                params=dict(parse_qsl(parts.query)),
+            )
+        except Exception as error:
+            logging.error(api_cache.PROXY_UPSTREAM_ERROR.format(error=error))
+            self.reply(HTTPStatus.BAD_GATEWAY, str(error).encode())
+            return
+        self.reply(
+            response.status_code, response.content,
+            response.headers.get('Content-Type', 'application/json')
+        )
+
+    def reply(self, status, body, content_type='text/plain'):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start(handler, name, address, **attributes):
+    """HTTP-сервер в фоновом потоке; attributes доступны обработчику."""
+    server = ThreadingHTTPServer(address, handler)
+    server.daemon_threads = True
+    for key, value in attributes.items():
+        setattr(server, key, value)
+    threading.Thread(
+        target=server.serve_forever, name=name, daemon=True
+    ).start()
+    return server
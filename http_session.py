@@ -0,0 +1,169 @@
+import logging
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import deadline
+import metrics
+
+
+SESSION_STATS = (
+    'HTTP-сессия: запросов {requests}, соединений {connections}, '
+    'переиспользовано {reused}.'
+)
+RETRY_STATUSES_ERROR = (
+    'Неверный формат API_RETRY_STATUSES: {value}! '
+    'Ожидается "код:попытки,код:попытки".'
+)
+RETRY_OPERATION = 'повтор запроса к API через {wait:.1f} с'
+
+POOL_SIZE = 10
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = {429: 2, 500: 2, 502: 3, 503: 3, 504: 3}
+
+
+class StatusRetry(Retry):
+    """Политика повторов с отдельным лимитом для каждого кода ответа."""
+
+    def __init__(self, *args, status_limits=None, **kwargs):
+        self.status_limits = dict(status_limits or {})
+        if status_limits is not None:
+            kwargs.setdefault('status_forcelist', set(self.status_limits))
+        super().__init__(*args, **kwargs)
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.status_limits = self.status_limits
+        return retry
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if not super().is_retry(method, status_code, has_retry_after):
+            return False
+        limit = self.status_limits.get(status_code)
+        if limit is None:
+            return True
+        attempts = sum(
+            1 for request in self.history if request.status == status_code
+        )
+        return attempts < limit
+
+    def sleep(self, response=None):
+        """Пауза перед повтором, если она укладывается в бюджет итерации.
+
+        Пауза из Retry-After или экспоненциальной задержки, которая
+        не успеет закончиться до срока, сразу даёт DeadlineExceeded.
+        """
+        limit = deadline.current()
+        if limit is not None:
+            wait = None
+            if self.respect_retry_after_header and response is not None:
+                wait = self.get_retry_after(response)
+            if wait is None:
+                wait = self.get_backoff_time()
+            limit.reserve(wait, RETRY_OPERATION.format(wait=wait))
+        super().sleep(response)
+
+
+class ApiSession:
+    """Долгоживущая HTTP-сессия с пулом соединений и повторами."""
+
+    def __init__(self, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT,
+                 read_timeout=READ_TIMEOUT, retry_statuses=None,
+                 backoff_factor=BACKOFF_FACTOR):
+        if retry_statuses is None:
+            retry_statuses = RETRY_STATUSES
+        self.timeout = (connect_timeout, read_timeout)
+        self.retry = StatusRetry(
+            total=max(retry_statuses.values(), default=0),
+            connect=max(retry_statuses.values(), default=0),
+            read=0,
+            backoff_factor=backoff_factor,
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False,
+            status_limits=retry_statuses,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=self.retry,
+        )
+        self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    @classmethod
+    def from_env(cls):
+        """Создание сессии по переменным окружения."""
+        return cls(
+            pool_size=int(os.getenv('API_POOL_SIZE', POOL_SIZE)),
+            connect_timeout=float(
+                os.getenv('API_CONNECT_TIMEOUT', CONNECT_TIMEOUT)
+            ),
+            read_timeout=float(os.getenv('API_READ_TIMEOUT', READ_TIMEOUT)),
+            retry_statuses=parse_retry_statuses(
+                os.getenv('API_RETRY_STATUSES')
+            ),
+        )
+
+    def get(self, url, timeout=None, **kwargs):
+        """GET-запрос через пул соединений.
+
+        Число в timeout ограничивает сверху настроенные таймауты
+        подключения и чтения.
+        """
+        if isinstance(timeout, (int, float)):
+            timeout = tuple(min(limit, timeout) for limit in self.timeout)
+        return self.session.get(url, timeout=timeout or self.timeout, **kwargs)
+
+    def stats(self):
+        """Статистика переиспользования соединений."""
+        pools = self.adapter.poolmanager.pools
+        requests_count = connections = 0
+        for key in pools.keys():
+            pool = pools[key]
+            requests_count += pool.num_requests
+            connections += pool.num_connections
+        return {
+            'requests': requests_count,
+            'connections': connections,
+            'reused': requests_count - connections,
+        }
+
+    def log_stats(self):
+        """Логирование статистики соединений."""
+        logging.info(SESSION_STATS.format(**self.stats()))
+
+    def close(self):
+        """Закрытие всех соединений пула."""
+        self.session.close()
+
+
+def export_stats(session, registry=metrics.REGISTRY):
+    """Статистика соединений сессии в метриках, с меткой kind."""
+    return registry.gauge(
+        'homework_api_session_connections',
+        'Запросы к API через сессию, открытые и переиспользованные '
+        'соединения.',
+        session.stats,
+        'kind'
+    )
+
+
+def parse_retry_statuses(value):
+    """Разбор строки вида "502:3,503:3" в словарь лимитов повторов."""
+    if not value:
+        return None
+    try:
+        return {
+            int(code): int(limit)
+            for code, limit in (
+                item.split(':') for item in value.split(',') if item
+            )
+        }
+    except ValueError as error:
+        raise ValueError(RETRY_STATUSES_ERROR.format(value=value)) from error
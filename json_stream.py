@@ -0,0 +1,274 @@
+"""Потоковый разбор ответа API домашки.
+
+Тело ответа читается частями, а работы из массива "homeworks" разбираются
+по одной по мере перебора, поэтому в памяти одновременно находятся часть
+тела и одна работа, а не весь ответ. Остальные ключи верхнего уровня
+(current_date, error, code) разбираются целиком.
+"""
+import codecs
+import json
+import re
+
+
+UNEXPECTED_CHAR = 'Ожидался один из символов {expected}'
+KEY_NOT_STRING = 'Ключ объекта должен быть строкой'
+EXTRA_DATA = 'Лишние данные после ответа'
+
+CHUNK_SIZE = 64 * 1024
+HOMEWORKS = 'homeworks'
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+DECODER = json.JSONDecoder()
+END = object()
+
+
+class Reader:
+    """Текст JSON, подгружаемый частями по мере разбора."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.position = 0
+        self.size = 0
+        self.exhausted = False
+
+    def more(self):
+        """Подгрузка следующей части тела; False, если оно прочитано."""
+        if self.exhausted:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.exhausted = True
+            text = self.decoder.decode(b'', final=True)
+        else:
+            self.size += len(chunk)
+            text = self.decoder.decode(chunk)
+        self.text = self.text[self.position:] + text
+        self.position = 0
+        return True
+
+    def peek(self):
+        """Следующий символ после пробелов; пустая строка в конце тела."""
+        while True:
+            self.position = WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.more():
+                return ''
+
+    def expect(self, expected):
+        """Пропуск одного из символов expected."""
+        char = self.peek()
+        if not char or char not in expected:
+            raise self.error(UNEXPECTED_CHAR.format(expected=expected))
+        self.position += 1
+        return char
+
+    def value(self):
+        """Следующее значение JSON целиком.
+
+        Значение у конца прочитанной части принимается, только если тело
+        прочитано: иначе число могло оборваться на границе частей.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            else:
+                if end < len(self.text) or self.exhausted:
+                    self.position = end
+                    return value
+            self.more()
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.text, self.position)
+
+
+class Homeworks:
+    """Работы потокового ответа; перебрать их можно один раз.
+
+    Как и список, даёт проверку на пустоту и первую работу по индексу 0.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def __iter__(self):
+        stream = self.stream
+        while True:
+            item = stream.buffered.pop() if stream.buffered else (
+                stream.next_item()
+            )
+            if item is END:
+                return
+            yield item
+
+    def __bool__(self):
+        self.stream.peek_item()
+        return self.stream.head is not None
+
+    def __getitem__(self, index):
+        if index != 0 or not self:
+            raise IndexError(index)
+        return self.stream.head
+
+    @property
+    def count(self):
+        return self.stream.count
+
+    @property
+    def head(self):
+        return self.stream.head
+
+    def drain(self):
+        """Разбор оставшихся работ и ключей ответа без их хранения."""
+        self.stream.drain()
+
+
+class HomeworkStream:
+    """Ответ API, работы которого разбираются по мере перебора.
+
+    check(index, item) возвращает нарушения схемы в работе: они
+    накапливаются в violations, а сама работа пропускается. keep
+    оставляет в работах только перечисленные ключи. on_end(stream)
+    вызывается, когда объект ответа разобран до конца. close()
+    освобождает соединение: в конце разбора и при любой ошибке. Если
+    ответ не объект, fields равно None, а разобранное значение лежит
+    в value.
+    """
+
+    def __init__(self, chunks, check=None, keep=None, on_end=None,
+                 close=None):
+        self.reader = Reader(chunks)
+        self.check = check
+        self.keep = keep
+        self.on_end = on_end
+        self.close = close or (lambda: None)
+        self.fields = {}
+        self.value = None
+        self.array = False
+        self.streaming = False
+        self.finished = False
+        self.buffered = []
+        self.count = 0
+        self.head = None
+        self.violations = []
+        self.homeworks = Homeworks(self)
+        try:
+            self.open()
+        except BaseException:
+            self.close()
+            raise
+
+    def open(self):
+        """Разбор ответа до массива работ или целиком."""
+        if self.reader.peek() == '{':
+            self.reader.position += 1
+            self.read_fields(first=True)
+        else:
+            self.fields = None
+            self.value = self.reader.value()
+            self.finish()
+
+    @property
+    def size(self):
+        """Прочитано байт тела ответа."""
+        return self.reader.size
+
+    def read_fields(self, first=False):
+        """Разбор ключей верхнего уровня до массива работ или до конца."""
+        reader = self.reader
+        while True:
+            if first and reader.peek() == '}':
+                reader.position += 1
+                break
+            if not first and reader.expect(',}') == '}':
+                break
+            first = False
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error(KEY_NOT_STRING)
+            reader.expect(':')
+            if key == HOMEWORKS and reader.peek() == '[':
+                reader.position += 1
+                self.array = self.streaming = True
+                return
+            self.fields[key] = reader.value()
+        self.finish()
+
+    def finish(self):
+        if self.reader.peek():
+            raise self.reader.error(EXTRA_DATA)
+        self.finished = True
+        self.close()
+        if self.on_end is not None and self.fields is not None:
+            self.on_end(self)
+
+    def next_item(self):
+        """Следующая работа без нарушений схемы или END после массива."""
+        try:
+            return self.read_item()
+        except BaseException:
+            self.close()
+            raise
+
+    def read_item(self):
+        reader = self.reader
+        while self.streaming:
+            if self.count:
+                closed = reader.expect(',]') == ']'
+            else:
+                closed = reader.peek() == ']'
+                if closed:
+                    reader.position += 1
+            if closed:
+                self.streaming = False
+                self.read_fields()
+                break
+            item = reader.value()
+            index = self.count
+            self.count += 1
+            if self.check is not None:
+                violations = self.check(index, item)
+                if violations:
+                    self.violations.extend(violations)
+                    continue
+            if self.keep is not None and isinstance(item, dict):
+                item = {key: item[key] for key in self.keep if key in item}
+            if self.head is None:
+                self.head = item
+            return item
+        return END
+
+    def peek_item(self):
+        """Разбор первой работы, если перебор ещё не начат."""
+        if self.head is None and not self.buffered:
+            item = self.next_item()
+            if item is not END:
+                self.buffered.append(item)
+
+    def drain(self):
+        """Разбор ответа до конца без хранения работ."""
+        self.buffered.clear()
+        while self.next_item() is not END:
+            pass
+
+    def __contains__(self, key):
+        return key == HOMEWORKS and self.array or key in self.fields
+
+    def __getitem__(self, key):
+        if key == HOMEWORKS and self.array:
+            return self.homeworks
+        self.drain()
+        return self.fields[key]
+
+    def get(self, key, default=None):
+        """Значение ключа верхнего уровня; ответ разбирается до конца."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
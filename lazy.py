@@ -0,0 +1,18 @@
+"""Отложенный импорт тяжёлых зависимостей."""
+import importlib.util
+import sys
+
+
+def module(name):
+    """Модуль, который загрузится при первом обращении к атрибуту."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f'No module named {name!r}', name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    lazy_module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = lazy_module
+    loader.exec_module(lazy_module)
+    return lazy_module
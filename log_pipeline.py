@@ -0,0 +1,128 @@
+"""Запись логов в фоновом потоке с ротацией, сжатием и прореживанием.
+
+Поток опроса только кладёт запись в очередь; форматирование и запись
+на диск выполняет QueueListener.
+"""
+import atexit
+import copy
+import gzip
+import logging
+from logging.handlers import (
+    QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+)
+import os
+import queue
+import shutil
+import threading
+import time
+
+
+SAMPLED_SUFFIX = ' [пропущено похожих записей: {count}]'
+
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+ROTATE_WHEN = 'midnight'
+SAMPLE_BURST = 10
+SAMPLE_INTERVAL = 60.0
+
+
+class BackgroundHandler(QueueHandler):
+    """Передача записей в очередь без форматирования в вызывающем потоке."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """Прореживание частых записей одного места вызова.
+
+    С каждой строки кода проходит burst записей подряд, дальше - одна
+    за interval секунд с числом пропущенных. Предупреждения и ошибки
+    не прореживаются.
+    """
+
+    def __init__(self, burst=SAMPLE_BURST, interval=SAMPLE_INTERVAL,
+                 clock=time.monotonic):
+        super().__init__()
+        self.burst = burst
+        self.interval = interval
+        self.clock = clock
+        self.sites = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        now = self.clock()
+        key = record.pathname, record.lineno
+        with self.lock:
+            site = self.sites.get(key)
+            if site is None:
+                site = self.sites[key] = [float(self.burst), now, 0]
+            tokens, updated, skipped = site
+            tokens = min(self.burst, tokens + (now - updated) / self.interval)
+            if tokens < 1:
+                site[:] = tokens, now, skipped + 1
+                return False
+            site[:] = tokens - 1, now, 0
+        if skipped:
+            record.msg = str(record.msg) + SAMPLED_SUFFIX.format(
+                count=skipped
+            )
+        return True
+
+
+def compress_rotated(source, dest):
+    """Сжатие файла, ушедшего в ротацию."""
+    with open(source, 'rb') as raw, gzip.open(dest, 'wb') as packed:
+        shutil.copyfileobj(raw, packed)
+    os.remove(source)
+
+
+def file_handler(path):
+    """Файловый обработчик с ротацией по LOG_ROTATION и сжатием."""
+    backups = int(os.getenv('LOG_BACKUPS', BACKUP_COUNT))
+    if os.getenv('LOG_ROTATION', 'size') == 'time':
+        handler = TimedRotatingFileHandler(
+            path, when=os.getenv('LOG_ROTATE_WHEN', ROTATE_WHEN),
+            backupCount=backups, encoding='utf-8', delay=True
+        )
+    else:
+        handler = RotatingFileHandler(
+            path, maxBytes=int(os.getenv('LOG_MAX_BYTES', MAX_BYTES)),
+            backupCount=backups, encoding='utf-8', delay=True
+        )
+    handler.namer = lambda name: name + '.gz'
+    handler.rotator = compress_rotated
+    return handler
+
+
+def stop(listener):
+    """Остановка фонового потока с дозаписью очереди."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def start(handlers, fmt=None, sampling=None):
+    """Запуск фонового потока записи; возвращает обработчик-очередь.
+
+    Обработчик-очередь подключается к логгеру, например через
+    logging.basicConfig(handlers=[...]).
+    """
+    formatter = logging.Formatter(fmt)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop, listener)
+    handler = BackgroundHandler(records)
+    handler.listener = listener
+    handler.addFilter(sampling or SamplingFilter(
+        burst=int(os.getenv('LOG_SAMPLE_BURST', SAMPLE_BURST)),
+        interval=float(os.getenv('LOG_SAMPLE_INTERVAL', SAMPLE_INTERVAL)),
+    ))
+    return handler
@@ -0,0 +1,176 @@
+from bisect import bisect_left
+import logging
+import threading
+
+
+METRICS_LISTENING = 'Метрики доступны на порту {port}: /metrics.'
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30
+)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Counter:
+    """Счётчик с необязательной меткой; безопасен для потоков."""
+
+    def __init__(self, name, documentation, label=None):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, label_value=None, amount=1):
+        """Увеличение счётчика."""
+        values = self.values
+        self.lock.acquire()
+        try:
+            values[label_value] = values.get(label_value, 0) + amount
+        finally:
+            self.lock.release()
+
+    def samples(self):
+        with self.lock:
+            values = list(self.values.items())
+        for label_value, value in sorted(
+                values, key=lambda item: str(item[0])):
+            if self.label is None:
+                yield self.name, value
+            else:
+                yield f'{self.name}{{{self.label}="{label_value}"}}', value
+
+
+class Gauge:
+    """Значение, вычисляемое в момент чтения метрик.
+
+    С меткой function возвращает словарь {значение метки: значение}.
+    """
+
+    def __init__(self, name, documentation, function, label=None):
+        self.name = name
+        self.documentation = documentation
+        self.function = function
+        self.label = label
+
+    def samples(self):
+        if self.label is None:
+            yield self.name, self.function()
+            return
+        for label_value, value in sorted(self.function().items()):
+            yield f'{self.name}{{{self.label}="{label_value}"}}', value
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин.
+
+    Корзины, сумма и число наблюдений меняются и читаются под одной
+    блокировкой, поэтому _count всегда равен корзине +Inf.
+    """
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        """Учёт одного наблюдения."""
+        index = bisect_left(self.bounds, value)
+        self.lock.acquire()
+        try:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+        finally:
+            self.lock.release()
+
+    def samples(self):
+        with self.lock:
+            counts = list(self.counts)
+            total = self.sum
+            count = self.count
+        cumulative = 0
+        for bound, bucket in zip(self.bounds, counts):
+            cumulative += bucket
+            yield f'{self.name}_bucket{{le="{bound}"}}', cumulative
+        yield f'{self.name}_bucket{{le="+Inf"}}', count
+        yield f'{self.name}_sum', total
+        yield f'{self.name}_count', count
+
+
+class Registry:
+    """Набор метрик с выводом в текстовом формате Prometheus."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric, kind):
+        self.metrics[metric.name] = (metric, kind)
+        return metric
+
+    def counter(self, name, documentation, label=None):
+        """Регистрация счётчика."""
+        return self.register(Counter(name, documentation, label), 'counter')
+
+    def gauge(self, name, documentation, function, label=None):
+        """Регистрация вычисляемого значения."""
+        return self.register(
+            Gauge(name, documentation, function, label), 'gauge'
+        )
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS):
+        """Регистрация гистограммы."""
+        return self.register(
+            Histogram(name, documentation, buckets), 'histogram'
+        )
+
+    def render(self):
+        """Текст всех метрик в формате Prometheus."""
+        lines = []
+        for metric, kind in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {kind}')
+            lines.extend(
+                f'{name} {value}' for name, value in metric.samples()
+            )
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+API_LATENCY = REGISTRY.histogram(
+    'homework_api_latency_seconds', 'Время запроса к API домашки.'
+)
+API_RESPONSE_SIZE = REGISTRY.histogram(
+    'homework_api_response_bytes', 'Размер ответа API домашки.',
+    SIZE_BUCKETS
+)
+PARSE_TIME = REGISTRY.histogram(
+    'homework_parse_seconds', 'Время проверки и разбора ответа API.'
+)
+TELEGRAM_LATENCY = REGISTRY.histogram(
+    'homework_telegram_send_seconds', 'Время отправки сообщения в Telegram.'
+)
+LOOP_LAG = REGISTRY.histogram(
+    'homework_loop_lag_seconds', 'Опоздание итерации цикла бота.'
+)
+ERRORS = REGISTRY.counter(
+    'homework_errors_total', 'Ошибки в цикле бота по классу исключения.',
+    'exception'
+)
+
+
+def serve(port, registry=REGISTRY, host='127.0.0.1'):
+    """Запуск HTTP-сервера метрик в фоновом потоке."""
+    import http_endpoints
+    server = http_endpoints.start(
+        http_endpoints.MetricsHandler, 'metrics', (host, port),
+        registry=registry
+    )
+    logging.info(METRICS_LISTENING.format(port=server.server_port))
+    return server
@@ -0,0 +1,86 @@
+"""Компактное представление отслеживаемых работ в памяти.
+
+Статус хранится кодом - небольшим целым числом, которое Python не
+создаёт заново для каждой работы. Дата в формате API хранится целым
+числом из её цифр вместо строки. Работа хранится в индексе по id, а её
+название - один раз, в самой записи, без отдельного кортежа-ключа.
+"""
+import re
+import threading
+
+
+DATE_FORMAT = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)Z')
+DATE_TEMPLATE = '{0}-{1}-{2}T{3}:{4}:{5}Z'
+
+STATUSES = []
+CODES = {}
+codes_lock = threading.Lock()
+
+
+def register_statuses(statuses):
+    """Коды статусов в порядке перечисления: 0, 1, 2..."""
+    return {status: status_code(status) for status in statuses}
+
+
+def status_code(status):
+    """Код статуса; новый статус получает следующий свободный код."""
+    code = CODES.get(status)
+    if code is None:
+        with codes_lock:
+            code = CODES.get(status)
+            if code is None:
+                code = CODES[status] = len(STATUSES)
+                STATUSES.append(status)
+    return code
+
+
+def pack_date(date_updated):
+    """Дата API целым числом из её цифр; другие значения как есть."""
+    if isinstance(date_updated, str):
+        match = DATE_FORMAT.fullmatch(date_updated)
+        if match:
+            return int(''.join(match.groups()))
+    return date_updated
+
+
+def unpack_date(date):
+    """Исходная строка даты, упакованной pack_date."""
+    if type(date) is not int:
+        return date
+    digits = f'{date:014}'
+    return DATE_TEMPLATE.format(
+        digits[:4], digits[4:6], digits[6:8],
+        digits[8:10], digits[10:12], digits[12:]
+    )
+
+
+def slot(homework_id, homework_name):
+    """Ключ работы в индексе: id, а без него - название."""
+    return homework_name if homework_id is None else homework_id
+
+
+class Tracked:
+    """Последний известный статус работы."""
+
+    __slots__ = ('name', 'code', 'date')
+
+    def __init__(self, name, status, date_updated):
+        self.name = name
+        self.code = status_code(status)
+        self.date = pack_date(date_updated)
+
+    @property
+    def status(self):
+        return STATUSES[self.code]
+
+    @property
+    def date_updated(self):
+        return unpack_date(self.date)
+
+    def matches(self, name, status, date_updated):
+        """Совпадают ли название, статус и дата работы с записью."""
+        return (
+            self.code == CODES.get(status)
+            and self.name == name
+            and self.date == pack_date(date_updated)
+        )
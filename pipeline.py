@@ -0,0 +1,116 @@
+"""Конвейер этапов с ограниченными очередями между ними.
+
+У каждого этапа свой пул потоков и своя очередь на входе. Когда очередь
+следующего этапа заполнена, поток этапа ждёт места в ней, поэтому
+медленная отправка в Telegram тормозит опрос, а не копит память.
+"""
+import logging
+import queue
+import threading
+import time
+
+import metrics
+
+
+STAGE_ERROR = 'Сбой на этапе {stage}: {error}'
+
+QUEUE_SIZE = 100
+
+STOP = object()
+
+STAGES = {}
+
+STAGE_ITEMS = metrics.REGISTRY.counter(
+    'homework_stage_items_total', 'Элементы, обработанные этапом конвейера.',
+    'stage'
+)
+STAGE_BUSY = metrics.REGISTRY.counter(
+    'homework_stage_busy_seconds_total',
+    'Время работы обработчиков этапа конвейера.', 'stage'
+)
+STAGE_BLOCKED = metrics.REGISTRY.counter(
+    'homework_stage_blocked_seconds_total',
+    'Время ожидания места в очереди следующего этапа.', 'stage'
+)
+metrics.REGISTRY.gauge(
+    'homework_stage_queue_depth', 'Элементы в очереди на входе этапа.',
+    lambda: {name: stage.queue.qsize() for name, stage in STAGES.items()},
+    'stage'
+)
+
+
+class Stage:
+    """Этап конвейера: обработчик и число потоков.
+
+    Обработчик возвращает элемент для следующего этапа или None, если
+    элемент дальше не идёт.
+    """
+
+    def __init__(self, name, handler, workers=1, queue_size=QUEUE_SIZE):
+        self.name = name
+        self.handler = handler
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads = []
+
+
+class Pipeline:
+    """Цепочка этапов; on_error(stage, item, error) вызывается при сбое."""
+
+    def __init__(self, stages, on_error=None):
+        self.stages = stages
+        self.on_error = on_error or self.log_error
+        for stage, following in zip(stages, stages[1:] + [None]):
+            for number in range(stage.workers):
+                stage.threads.append(threading.Thread(
+                    target=self.work, args=(stage, following),
+                    name=f'{stage.name}-{number}', daemon=True
+                ))
+            STAGES[stage.name] = stage
+        for stage in stages:
+            for thread in stage.threads:
+                thread.start()
+
+    def work(self, stage, following):
+        """Цикл потока этапа."""
+        while True:
+            item = stage.queue.get()
+            if item is STOP:
+                stage.queue.task_done()
+                return
+            started = time.perf_counter()
+            try:
+                result = stage.handler(item)
+            except Exception as error:
+                result = None
+                self.on_error(stage.name, item, error)
+            STAGE_BUSY.inc(stage.name, time.perf_counter() - started)
+            STAGE_ITEMS.inc(stage.name)
+            if result is not None and following is not None:
+                started = time.perf_counter()
+                following.queue.put(result)
+                STAGE_BLOCKED.inc(stage.name, time.perf_counter() - started)
+            stage.queue.task_done()
+
+    def submit(self, item):
+        """Передача элемента первому этапу; ждёт, если очередь полна."""
+        self.stages[0].queue.put(item)
+
+    def join(self):
+        """Ожидание обработки всех переданных элементов."""
+        for stage in self.stages:
+            stage.queue.join()
+
+    def stop(self):
+        """Остановка потоков после обработки очередей."""
+        for stage in self.stages:
+            for _ in stage.threads:
+                stage.queue.put(STOP)
+            for thread in stage.threads:
+                thread.join()
+            if STAGES.get(stage.name) is stage:
+                del STAGES[stage.name]
+
+    @staticmethod
+    def log_error(stage, item, error):
+        logging.error(STAGE_ERROR.format(stage=stage, error=error))
@@ -0,0 +1,157 @@
+from functools import partial
+import hmac
+import ipaddress
+import json
+import logging
+import os
+import threading
+import time
+
+import telegram
+from tornado.ioloop import IOLoop, PeriodicCallback
+import tornado.web
+
+import audio
+import cursor
+import diff
+import homework
+
+
+PUSH_LISTENING = 'Приём статусов на {host}:{port}.'
+PUSH_REJECTED = 'Отклонён push-запрос: {error}'
+PUSH_FALLBACK_POLL = 'Push-обновлений не было {idle:.0f} с, опрос API.'
+INVALID_JSON_ERROR = 'Тело запроса не является JSON: {error}'
+PUSH_TOKEN_REQUIRED = (
+    'Приём статусов на {host} доступен не только локально: задайте '
+    'PUSH_TOKEN!'
+)
+
+PUSH_HOST = '127.0.0.1'
+PUSH_PORT = 8888
+FALLBACK_AFTER = 600
+TOKEN_HEADER = 'X-Push-Token'
+
+
+class PushIngest:
+    """Общий путь обработки статусов для push-запросов и опроса API."""
+
+    def __init__(self, notify, timestamp=None):
+        self.notify = notify
+        self.index = diff.HomeworkIndex(ordered=False)
+        self.timestamp = int(time.time()) if timestamp is None else timestamp
+        self.last_update = time.monotonic()
+        self.lock = threading.Lock()
+
+    def accept(self, response):
+        """Проверка ответа и уведомление об изменившихся статусах."""
+        homeworks = homework.check_response(response)['homeworks']
+        with self.lock:
+            self.last_update = time.monotonic()
+            notified = bool(homeworks) and homework.notify_transitions(
+                self.index, homeworks, self.notify
+            )
+            self.timestamp = cursor.advance(
+                self.timestamp, response, self.index.undelivered(),
+                time.time()
+            )
+        return notified
+
+    def poll_if_idle(self, fallback_after=FALLBACK_AFTER):
+        """Опрос API, если push-обновлений давно не было."""
+        idle = time.monotonic() - self.last_update
+        if idle < fallback_after:
+            return None
+        logging.info(PUSH_FALLBACK_POLL.format(idle=idle))
+        try:
+            return self.accept(homework.get_api_answer(self.timestamp))
+        except Exception as error:
+            logging.exception(homework.EXCEPTION_ERROR.format(error=error))
+            return False
+
+
+class HomeworksHandler(tornado.web.RequestHandler):
+    """Приём статусов в формате ответа API домашки."""
+
+    def initialize(self, ingest, token=None):
+        self.ingest = ingest
+        self.token = token
+
+    def authorized(self):
+        """Совпадает ли токен запроса с PUSH_TOKEN."""
+        if not self.token:
+            return True
+        return hmac.compare_digest(
+            self.request.headers.get(TOKEN_HEADER, '').encode(),
+            self.token.encode()
+        )
+
+    async def post(self):
+        if not self.authorized():
+            raise tornado.web.HTTPError(403)
+        try:
+            payload = json.loads(self.request.body)
+        except ValueError as error:
+            self.reject(400, INVALID_JSON_ERROR.format(error=error))
+            return
+        try:
+            notified = await IOLoop.current().run_in_executor(
+                None, self.ingest.accept, payload
+            )
+        except (TypeError, KeyError, ValueError) as error:
+            self.reject(422, str(error))
+            return
+        self.write({'notified': notified})
+
+    def reject(self, status, error):
+        logging.warning(PUSH_REJECTED.format(error=error))
+        self.set_status(status)
+        self.write({'error': error})
+
+
+def make_app(ingest, token=None):
+    """Приложение tornado с обработчиком push-запросов."""
+    return tornado.web.Application([
+        (r'/homeworks/?', HomeworksHandler,
+         {'ingest': ingest, 'token': token}),
+    ])
+
+
+def is_loopback(host):
+    """Адрес доступен только с этой машины."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def check_listen_address(host, token):
+    """Без токена принимать статусы можно только на локальном адресе."""
+    if not token and not is_loopback(host):
+        raise ValueError(PUSH_TOKEN_REQUIRED.format(host=host))
+
+
+def main():
+    """Запуск бота в режиме приёма push-обновлений."""
+    homework.check_tokens()
+    bot = telegram.Bot(token=homework.TELEGRAM_TOKEN)
+    player = audio.AudioWorker(
+        homework.SOUNDS_PATH, homework.HOMEWORK_VERDICTS
+    )
+    ingest = PushIngest(partial(homework.send_status, bot, player))
+    host = os.getenv('PUSH_HOST', PUSH_HOST)
+    port = int(os.getenv('PUSH_PORT', PUSH_PORT))
+    token = os.getenv('PUSH_TOKEN')
+    check_listen_address(host, token)
+    make_app(ingest, token).listen(port, address=host)
+    logging.info(PUSH_LISTENING.format(host=host, port=port))
+    fallback_after = float(os.getenv('PUSH_FALLBACK_AFTER', FALLBACK_AFTER))
+    loop = IOLoop.current()
+    PeriodicCallback(
+        lambda: loop.run_in_executor(
+            None, ingest.poll_if_idle, fallback_after
+        ),
+        homework.RETRY_PERIOD * 1000
+    ).start()
+    loop.start()
@@ -0,0 +1,196 @@
+"""Запись ответов API домашки и их воспроизведение.
+
+Формат: JSONL, сжатый блоками. Каждый блок - отдельный член gzip, поэтому
+файл читается обычным gzip.open, а индекс рядом (<файл>.idx) хранит для
+каждого блока первый и последний момент и смещение, что позволяет начать
+чтение с нужного времени, не распаковывая файл целиком.
+"""
+from bisect import bisect_left
+from collections import Counter, namedtuple
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+
+
+RECORDING_TO = 'Ответы API записываются в {path}.'
+RECORD_TRUNCATED = 'Запись {path} оборвана, воспроизведено до обрыва.'
+REPLAY_FINISHED = (
+    'Воспроизведено опросов: {polls}, работ: {homeworks}, '
+    'ошибок: {errors} за {elapsed:.1f} с.'
+)
+
+CHUNK_SIZE = 1000
+FLUSH_INTERVAL = 60.0
+INDEX_SUFFIX = '.idx'
+
+Record = namedtuple(
+    'Record', ('moment', 'status_code', 'body', 'duration', 'from_date')
+)
+
+
+class Recorder:
+    """Дозапись ответов API блоками сжатого JSONL."""
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE,
+                 flush_interval=FLUSH_INTERVAL, clock=time.monotonic):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self.buffer = []
+        self.first = self.last = None
+        self.flushed_at = clock()
+        self.lock = threading.Lock()
+
+    def record(self, moment, status_code, duration, from_date, body):
+        """Добавление ответа; блок сбрасывается на диск по размеру или
+        по времени."""
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', 'replace')
+        line = json.dumps(
+            [moment, status_code, round(duration, 6), from_date, body],
+            ensure_ascii=False, separators=(',', ':')
+        )
+        with self.lock:
+            if not self.buffer:
+                self.first = moment
+            self.last = moment
+            self.buffer.append(line)
+            if (len(self.buffer) >= self.chunk_size
+                    or self.clock() - self.flushed_at >= self.flush_interval):
+                self.flush_locked()
+
+    def flush(self):
+        """Сброс накопленного блока на диск."""
+        with self.lock:
+            self.flush_locked()
+
+    def flush_locked(self):
+        self.flushed_at = self.clock()
+        if not self.buffer:
+            return
+        data = gzip.compress(('\n'.join(self.buffer) + '\n').encode())
+        with open(self.path, 'ab') as file:
+            offset = file.tell()
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        with open(self.path + INDEX_SUFFIX, 'a', encoding='utf-8') as index:
+            index.write(f'{self.first} {self.last} {offset}\n')
+        self.buffer = []
+
+    def close(self):
+        self.flush()
+
+
+def read_index(path):
+    """Блоки записи: (первый момент, последний момент, смещение)."""
+    try:
+        with open(path + INDEX_SUFFIX, encoding='utf-8') as index:
+            return [
+                (float(first), float(last), int(offset))
+                for first, last, offset in (
+                    line.split() for line in index if line.strip()
+                )
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def seek_offset(path, since):
+    """Смещение блока, в котором могут быть записи не раньше since.
+
+    Если since позже всех проиндексированных блоков, читать нечего:
+    возвращается конец файла. Без индекса чтение идёт с начала.
+    """
+    chunks = read_index(path)
+    if not chunks:
+        return 0
+    position = bisect_left([last for _, last, _ in chunks], since)
+    if position < len(chunks):
+        return chunks[position][2]
+    return os.path.getsize(path)
+
+
+def read_records(path, since=None):
+    """Потоковое чтение записей, начиная с момента since."""
+    with open(path, 'rb') as raw:
+        if since is not None:
+            raw.seek(seek_offset(path, since))
+        try:
+            with gzip.GzipFile(fileobj=raw) as file:
+                for line in file:
+                    moment, status_code, duration, from_date, body = (
+                        json.loads(line)
+                    )
+                    if since is not None and moment < since:
+                        continue
+                    yield Record(
+                        moment, status_code, body, duration, from_date
+                    )
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            logging.warning(RECORD_TRUNCATED.format(path=path))
+
+
+def replay(path, speed=None, since=None, sleep=time.sleep):
+    """Прогон записанных ответов через check_response и parse_status.
+
+    Без speed - так быстро, как возможно; иначе с ускорением speed
+    относительно записанных интервалов.
+    """
+    import homework
+    stats = Counter()
+    errors = Counter()
+    started = time.perf_counter()
+    previous = None
+    for record in read_records(path, since):
+        if speed and previous is not None:
+            sleep(max(0, record.moment - previous) / speed)
+        previous = record.moment
+        stats['polls'] += 1
+        if record.status_code != 200:
+            errors['HTTPStatusNotOK'] += 1
+            continue
+        try:
+            homeworks = homework.check_response(
+                json.loads(record.body)
+            )['homeworks']
+            for work in homeworks:
+                homework.parse_status(work)
+            stats['homeworks'] += len(homeworks)
+        except (TypeError, KeyError, ValueError) as error:
+            errors[type(error).__name__] += 1
+    stats['errors'] = sum(errors.values())
+    logging.info(REPLAY_FINISHED.format(
+        elapsed=time.perf_counter() - started,
+        polls=stats['polls'],
+        homeworks=stats['homeworks'],
+        errors=stats['errors']
+    ))
+    return dict(stats, by_error=dict(errors))
+
+
+def open_recorder(path):
+    """Включение записи, если задан путь."""
+    if not path:
+        return None
+    logging.info(RECORDING_TO.format(path=path))
+    return Recorder(path)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Воспроизведение записи.')
+    parser.add_argument('path')
+    parser.add_argument('--since', type=float)
+    parser.add_argument('--speed', type=float)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(json.dumps(
+        replay(args.path, args.speed, args.since), ensure_ascii=False
+    ))
@@ -0,0 +1,140 @@
+import logging
+import os
+import random
+
+
+SCHEDULER_DECISION = (
+    'Следующий запрос через {delay:.1f} с '
+    '(политика: {policy}, статус: {status}, ошибка: {error}).'
+)
+POLICY_ERROR = 'Неизвестная политика опроса: {policy}!'
+
+BACKOFF_FACTOR = 2
+BACKOFF_JITTER = 0.5
+BACKOFF_MAX_EXPONENT = 32
+MAX_DELAY_MULTIPLIER = 12
+STATUS_MULTIPLIERS = {
+    'reviewing': 1,
+    'rejected': 3,
+    'approved': 6,
+}
+
+
+class FixedInterval:
+    """Опрос через постоянный интервал."""
+
+    def __init__(self, interval):
+        self.interval = interval
+
+    def delay(self, status=None, error=None):
+        """Пауза перед следующим запросом."""
+        return self.interval
+
+
+class StatusAware:
+    """Интервал опроса зависит от последнего статуса работы."""
+
+    def __init__(self, interval, intervals=None):
+        self.interval = interval
+        if intervals is None:
+            intervals = {
+                status: interval * multiplier
+                for status, multiplier in STATUS_MULTIPLIERS.items()
+            }
+        self.intervals = intervals
+
+    def delay(self, status=None, error=None):
+        """Пауза перед следующим запросом."""
+        return self.intervals.get(status, self.interval)
+
+
+class ExponentialBackoff:
+    """Экспоненциальное увеличение паузы со случайным разбросом при ошибках.
+
+    Пока ошибок нет, решение принимает вложенная политика. Пауза
+    не превышает max_delay, а показатель степени - BACKOFF_MAX_EXPONENT,
+    сколько бы ошибок ни шло подряд.
+    """
+
+    def __init__(self, policy, factor=BACKOFF_FACTOR, jitter=BACKOFF_JITTER,
+                 rng=None, max_delay=None):
+        self.policy = policy
+        self.factor = factor
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.max_delay = max_delay
+        self.failures = 0
+
+    def delay(self, status=None, error=None):
+        """Пауза перед следующим запросом."""
+        base = self.policy.delay(status, error)
+        if error is None:
+            self.failures = 0
+            return base
+        self.failures = min(self.failures + 1, BACKOFF_MAX_EXPONENT + 1)
+        delay = base * self.factor ** (self.failures - 1)
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay * self.rng.uniform(1 - self.jitter, 1)
+
+
+class Bounded:
+    """Ограничение паузы вложенной политики снизу и сверху."""
+
+    def __init__(self, policy, min_delay=0, max_delay=None):
+        self.policy = policy
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+
+    def delay(self, status=None, error=None):
+        """Пауза перед следующим запросом."""
+        delay = max(self.min_delay, self.policy.delay(status, error))
+        if self.max_delay is not None:
+            delay = min(delay, self.max_delay)
+        return delay
+
+
+class Scheduler:
+    """Планировщик опроса, логирующий каждое решение."""
+
+    def __init__(self, policy, name=None):
+        self.policy = policy
+        self.name = name or type(policy).__name__
+
+    def delay(self, status=None, error=None):
+        """Пауза перед следующим запросом."""
+        delay = self.policy.delay(status, error)
+        logging.info(SCHEDULER_DECISION.format(
+            delay=delay,
+            policy=self.name,
+            status=status,
+            error=type(error).__name__ if error else None
+        ))
+        return delay
+
+
+def from_env(interval):
+    """Создание планировщика по переменным окружения.
+
+    Без POLL_MAX_DELAY пауза ограничена MAX_DELAY_MULTIPLIER интервалами.
+    """
+    name = os.getenv('POLL_POLICY', 'fixed')
+    max_delay = float(
+        os.getenv('POLL_MAX_DELAY') or interval * MAX_DELAY_MULTIPLIER
+    )
+    if name == 'fixed':
+        policy = FixedInterval(interval)
+    elif name == 'status':
+        policy = StatusAware(interval)
+    elif name == 'backoff':
+        policy = ExponentialBackoff(
+            StatusAware(interval), max_delay=max_delay
+        )
+    else:
+        raise ValueError(POLICY_ERROR.format(policy=name))
+    policy = Bounded(
+        policy,
+        min_delay=float(os.getenv('POLL_MIN_DELAY') or 0),
+        max_delay=max_delay
+    )
+    return Scheduler(policy, name)
@@ -0,0 +1,309 @@
+"""Распределение аккаунтов между процессами бота.
+
+Аккаунты делятся между живыми процессами консистентным хешированием,
+а аренды в общей базе SQLite гарантируют, что каждый аккаунт опрашивает
+ровно один процесс. Процессы отмечаются в базе при каждом такте; если
+процесс не отмечался дольше срока аренды, его аккаунты забирают другие.
+"""
+from bisect import bisect_right
+from contextlib import contextmanager
+import hashlib
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import homework
+import metrics
+import state
+
+
+SHARD_REBALANCED = (
+    'Процесс {worker}: аккаунтов {owned}, живых процессов {workers}, '
+    'получено {acquired}, передано {released}.'
+)
+SHARD_ROUND_DONE = 'Процесс {worker}: опрос аккаунтов {count} завершён.'
+SHARD_STATE_REQUIRED = (
+    'Для SHARD_DB нужна общая база состояния STATE_DB: без неё аккаунт, '
+    'перешедший к другому процессу, потеряет курсор и статусы!'
+)
+SHARD_RENEW_ERROR = 'Процесс {worker}: аренды не продлены: {error}'
+SHARD_DRAIN_TIMEOUT = (
+    'Процесс {worker}: очередь отправки не опустела перед передачей '
+    'аккаунтов.'
+)
+
+REPLICAS = 64
+LEASE_TTL = 90.0
+HEARTBEAT_INTERVAL = 10.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    account TEXT PRIMARY KEY,
+    worker TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+'''
+ACQUIRE = (
+    'INSERT INTO leases (account, worker, expires) VALUES (?, ?, ?) '
+    'ON CONFLICT (account) DO UPDATE SET '
+    'worker = excluded.worker, expires = excluded.expires '
+    'WHERE leases.worker = excluded.worker OR leases.expires < ?'
+)
+
+
+def point(value):
+    """Положение строки на кольце хешей."""
+    return int.from_bytes(
+        hashlib.md5(value.encode()).digest()[:8], 'big'
+    )
+
+
+class HashRing:
+    """Консистентное хеширование: у каждого процесса replicas точек."""
+
+    def __init__(self, workers, replicas=REPLICAS):
+        points = sorted(
+            (point(f'{worker}#{replica}'), worker)
+            for worker in workers for replica in range(replicas)
+        )
+        self.points = [position for position, _ in points]
+        self.workers = [worker for _, worker in points]
+
+    def owner(self, key):
+        """Процесс, которому принадлежит ключ."""
+        if not self.points:
+            return None
+        index = bisect_right(self.points, point(key)) % len(self.points)
+        return self.workers[index]
+
+
+class Coordinator:
+    """Учёт живых процессов и аренд аккаунтов в общей базе SQLite."""
+
+    def __init__(self, path, worker, lease_ttl=LEASE_TTL,
+                 clock=time.time):
+        self.worker = worker
+        self.lease_ttl = lease_ttl
+        self.clock = clock
+        self.workers = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            path, isolation_level=None, timeout=30, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Транзакция с блокировкой записи на время чтения и изменения.
+
+        Соединение общее для цикла и потока продления аренд, поэтому
+        транзакции разных потоков не пересекаются.
+        """
+        with self.lock, self.connection:
+            self.connection.execute('BEGIN IMMEDIATE')
+            yield self.connection
+
+    def heartbeat(self, keys):
+        """Отметка процесса; ключи, которые кольцо отдаёт этому процессу."""
+        now = self.clock()
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO workers (worker, heartbeat) '
+                'VALUES (?, ?)', (self.worker, now)
+            )
+            connection.execute(
+                'DELETE FROM workers WHERE heartbeat < ?',
+                (now - self.lease_ttl,)
+            )
+            workers = [
+                worker for worker, in connection.execute(
+                    'SELECT worker FROM workers'
+                )
+            ]
+        ring = HashRing(workers)
+        self.workers = len(workers)
+        return {key for key in keys if ring.owner(key) == self.worker}
+
+    def acquire(self, keys):
+        """Продление своих и захват свободных аренд; ключи в аренде."""
+        now = self.clock()
+        expires = now + self.lease_ttl
+        with self.transaction() as connection:
+            connection.executemany(ACQUIRE, [
+                (key, self.worker, expires, now) for key in keys
+            ])
+            return {
+                key for key, in connection.execute(
+                    'SELECT account FROM leases '
+                    'WHERE worker = ? AND expires > ?', (self.worker, now)
+                )
+            }
+
+    def renew(self):
+        """Отметка процесса и продление его действующих аренд."""
+        now = self.clock()
+        with self.transaction() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO workers (worker, heartbeat) '
+                'VALUES (?, ?)', (self.worker, now)
+            )
+            connection.execute(
+                'UPDATE leases SET expires = ? '
+                'WHERE worker = ? AND expires > ?',
+                (now + self.lease_ttl, self.worker, now)
+            )
+
+    def release(self, keys):
+        """Освобождение аренд для передачи другому процессу."""
+        with self.transaction() as connection:
+            connection.executemany(
+                'DELETE FROM leases WHERE account = ? AND worker = ?',
+                [(key, self.worker) for key in keys]
+            )
+
+    def leave(self):
+        """Уход процесса: аренды освобождаются сразу."""
+        with self.transaction() as connection:
+            connection.execute(
+                'DELETE FROM leases WHERE worker = ?', (self.worker,)
+            )
+            connection.execute(
+                'DELETE FROM workers WHERE worker = ?', (self.worker,)
+            )
+        self.connection.close()
+
+
+class ShardedPoller:
+    """Опрос только тех аккаунтов, которые арендованы этим процессом."""
+
+    def __init__(self, poller, accounts, coordinator, drain_timeout=None):
+        self.poller = poller
+        self.accounts = {account_key(account): account
+                         for account in accounts}
+        self.coordinator = coordinator
+        self.drain_timeout = drain_timeout
+        self.owned = set()
+
+    def settle(self):
+        """Доставка очереди и запись состояния на диск."""
+        delivery = self.poller.delivery
+        if delivery is not None and not delivery.join(self.drain_timeout):
+            logging.warning(SHARD_DRAIN_TIMEOUT.format(
+                worker=self.coordinator.worker
+            ))
+        for account in self.poller.accounts:
+            self.poller.settle_deliveries(account)
+        self.poller.store.flush()
+
+    def rebalance(self):
+        """Передача лишних и захват своих аккаунтов по кольцу."""
+        wanted = self.coordinator.heartbeat(self.accounts)
+        released = self.owned - wanted
+        if released:
+            self.settle()
+            self.coordinator.release(released)
+        owned = self.coordinator.acquire(wanted)
+        acquired = owned - self.owned
+        for key in acquired:
+            account = self.accounts[key]
+            account.reset()
+            self.poller.restore(account)
+        self.owned = owned
+        self.poller.accounts = [self.accounts[key] for key in sorted(owned)]
+        if acquired or released:
+            logging.info(SHARD_REBALANCED.format(
+                worker=self.coordinator.worker,
+                owned=len(owned),
+                workers=self.coordinator.workers,
+                acquired=len(acquired),
+                released=len(released)
+            ))
+
+    def renew(self, stopped, heartbeat_interval):
+        """Продление аренд каждые heartbeat_interval, пока идёт опрос."""
+        while not stopped.wait(heartbeat_interval):
+            try:
+                self.coordinator.renew()
+            except sqlite3.Error as error:
+                logging.error(SHARD_RENEW_ERROR.format(
+                    worker=self.coordinator.worker,
+                    error=error
+                ))
+
+    def poll(self, heartbeat_interval=HEARTBEAT_INTERVAL):
+        """Опрос арендованных аккаунтов; состояние сразу пишется на диск.
+
+        Долгий опрос не должен пережить срок аренды, поэтому аренды
+        продлеваются фоновым потоком до конца записи состояния.
+        """
+        stopped = threading.Event()
+        renewer = threading.Thread(
+            target=self.renew, args=(stopped, heartbeat_interval),
+            name='shard-renew', daemon=True
+        )
+        renewer.start()
+        try:
+            notified = self.poller.poll_all()
+            self.settle()
+        finally:
+            stopped.set()
+            renewer.join()
+        logging.info(SHARD_ROUND_DONE.format(
+            worker=self.coordinator.worker,
+            count=len(self.poller.accounts)
+        ))
+        return notified
+
+    def run(self, retry_period, heartbeat_interval=HEARTBEAT_INTERVAL):
+        """Цикл: отметка каждые heartbeat_interval, опрос раз в период."""
+        next_poll = time.monotonic()
+        try:
+            while True:
+                self.rebalance()
+                if time.monotonic() >= next_poll:
+                    metrics.LOOP_LAG.observe(time.monotonic() - next_poll)
+                    self.poll(heartbeat_interval)
+                    next_poll = time.monotonic() + retry_period
+                time.sleep(max(0, min(
+                    heartbeat_interval, next_poll - time.monotonic()
+                )))
+        finally:
+            self.settle()
+            self.coordinator.leave()
+
+
+def account_key(account):
+    """Ключ аккаунта на кольце и в таблице аренд."""
+    return account.key
+
+
+def worker_id():
+    """Имя процесса: SHARD_WORKER_ID или хост и pid."""
+    return os.getenv('SHARD_WORKER_ID') or (
+        f'{socket.gethostname()}-{os.getpid()}'
+    )
+
+
+def run(poller, accounts, path):
+    """Запуск опроса аккаунтов в режиме шардирования."""
+    if isinstance(poller.store, state.NullStore):
+        logging.critical(SHARD_STATE_REQUIRED)
+        raise ValueError(SHARD_STATE_REQUIRED)
+    heartbeat_interval = float(
+        os.getenv('SHARD_HEARTBEAT', HEARTBEAT_INTERVAL)
+    )
+    coordinator = Coordinator(
+        path, worker_id(),
+        lease_ttl=float(os.getenv('SHARD_LEASE_TTL', LEASE_TTL))
+    )
+    ShardedPoller(
+        poller, accounts, coordinator, drain_timeout=heartbeat_interval
+    ).run(homework.RETRY_PERIOD, heartbeat_interval)
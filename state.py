@@ -0,0 +1,181 @@
+from collections import namedtuple
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+
+STATE_LOADED = (
+    'Состояние аккаунта {account} загружено за {elapsed:.1f} мс: '
+    'курсор {from_date}, работ {count}.'
+)
+STATE_FLUSHED = 'Сохранено изменений состояния: {count}.'
+
+BATCH_SIZE = 100
+FLUSH_INTERVAL = 5.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cursors (
+    account TEXT PRIMARY KEY,
+    from_date INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS homeworks (
+    account TEXT NOT NULL,
+    key TEXT NOT NULL,
+    status TEXT,
+    date_updated TEXT,
+    PRIMARY KEY (account, key)
+);
+CREATE TABLE IF NOT EXISTS errors (
+    account TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL
+);
+'''
+UPSERTS = {
+    'cursors': (
+        'INSERT OR REPLACE INTO cursors (account, from_date) VALUES (?, ?)'
+    ),
+    'homeworks': (
+        'INSERT OR REPLACE INTO homeworks (account, key, status, date_updated)'
+        ' VALUES (?, ?, ?, ?)'
+    ),
+    'errors': (
+        'INSERT OR REPLACE INTO errors (account, fingerprint) VALUES (?, ?)'
+    ),
+}
+
+AccountState = namedtuple('AccountState', ('from_date', 'homeworks', 'error'))
+EMPTY_STATE = AccountState(None, {}, None)
+
+
+class StateStore:
+    """Хранилище курсоров, статусов и ошибок в SQLite (WAL).
+
+    Изменения копятся в памяти и записываются одной транзакцией, так что
+    число fsync ограничено размером пачки и интервалом сброса.
+    """
+
+    def __init__(self, path, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=FULL')
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.last_flush = time.monotonic()
+
+    def load(self, account):
+        """Загрузка сохранённого состояния аккаунта."""
+        started = time.perf_counter()
+        account = str(account)
+        execute = self.connection.execute
+        cursor = execute(
+            'SELECT from_date FROM cursors WHERE account = ?', (account,)
+        ).fetchone()
+        homeworks = {
+            tuple(json.loads(key)): (status, date_updated)
+            for key, status, date_updated in execute(
+                'SELECT key, status, date_updated FROM homeworks '
+                'WHERE account = ?', (account,)
+            )
+        }
+        error = execute(
+            'SELECT fingerprint FROM errors WHERE account = ?', (account,)
+        ).fetchone()
+        state = AccountState(
+            cursor and cursor[0], homeworks, error and error[0]
+        )
+        logging.debug(STATE_LOADED.format(
+            account=account,
+            elapsed=(time.perf_counter() - started) * 1000,
+            from_date=state.from_date,
+            count=len(homeworks)
+        ))
+        return state
+
+    def put(self, table, key, row):
+        """Постановка строки в очередь на запись."""
+        with self.lock:
+            self.pending[table, key] = row
+
+    def save_cursor(self, account, from_date):
+        """Запоминание курсора from_date аккаунта."""
+        account = str(account)
+        self.put('cursors', account, (account, from_date))
+
+    def save_homework(self, account, key, status, date_updated):
+        """Запоминание последнего статуса работы."""
+        account = str(account)
+        key = json.dumps(key, ensure_ascii=False)
+        self.put(
+            'homeworks', (account, key),
+            (account, key, status, date_updated)
+        )
+
+    def save_error(self, account, fingerprint):
+        """Запоминание отпечатка последней отправленной ошибки."""
+        account = str(account)
+        self.put('errors', account, (account, fingerprint))
+
+    def maybe_flush(self):
+        """Сброс накопленных изменений по размеру пачки или по времени."""
+        if (len(self.pending) >= self.batch_size
+                or time.monotonic() - self.last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Запись накопленных изменений одной транзакцией."""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+            if not pending:
+                return
+            rows = {}
+            for (table, _), row in pending.items():
+                rows.setdefault(table, []).append(row)
+            with self.connection:
+                self.connection.execute('BEGIN')
+                for table, table_rows in rows.items():
+                    self.connection.executemany(UPSERTS[table], table_rows)
+        logging.debug(STATE_FLUSHED.format(count=len(pending)))
+
+    def close(self):
+        """Сброс изменений и закрытие базы."""
+        self.flush()
+        self.connection.close()
+
+
+class NullStore:
+    """Хранилище-заглушка, когда база состояния не настроена."""
+
+    def load(self, account):
+        return EMPTY_STATE
+
+    def save_cursor(self, account, from_date):
+        pass
+
+    def save_homework(self, account, key, status, date_updated):
+        pass
+
+    def save_error(self, account, fingerprint):
+        pass
+
+    def maybe_flush(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def open_store(path):
+    """Открытие хранилища состояния, если задан путь к базе."""
+    return StateStore(path) if path else NullStore()
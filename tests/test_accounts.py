@@ -0,0 +1,232 @@
+import json
+import threading
+
+import pytest
+import requests
+
+import utils
+
+
+@pytest.fixture
+def accounts_module():
+    import accounts
+    return accounts
+
+
+class RecordingBot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append((chat_id, text))
+
+
+def mock_get_by_token(statuses):
+    def mocked_get(*args, headers=None, **kwargs):
+        token = headers['Authorization'].split()[-1]
+        status = statuses.get(token)
+        homeworks = [] if status is None else [
+            {'homework_name': f'hw_{token}', 'status': status}
+        ]
+        return utils.MockResponseGET(
+            random_timestamp=1000198000,
+            data={'homeworks': homeworks, 'current_date': 1000198000}
+        )
+    return mocked_get
+
+
+class TestAccounts:
+
+    def test_load_accounts(self, tmp_path, accounts_module):
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'telegram_chat_id': 1},
+            {'practicum_token': 'b', 'telegram_chat_id': 2},
+        ]))
+        accounts = accounts_module.load_accounts(str(path), timestamp=5)
+        assert [(a.token, a.chat_id, a.timestamp) for a in accounts] == [
+            ('a', 1, 5), ('b', 2, 5)
+        ], 'Проверьте загрузку реестра аккаунтов.'
+
+    def test_load_accounts_invalid(self, tmp_path, accounts_module):
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps([{'practicum_token': 'a'}]))
+        with pytest.raises(ValueError):
+            accounts_module.load_accounts(str(path))
+
+    def test_load_accounts_rejects_duplicates(self, tmp_path,
+                                              accounts_module):
+        path = tmp_path / 'accounts.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'telegram_chat_id': 1},
+            {'practicum_token': 'b', 'telegram_chat_id': 1},
+        ]))
+        first, second = accounts_module.load_accounts(str(path))
+        assert first.key != second.key, (
+            'Аккаунты одного чата с разными токенами должны различаться.'
+        )
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'telegram_chat_id': 1},
+            {'practicum_token': 'a', 'telegram_chat_id': 1},
+        ]))
+        with pytest.raises(ValueError):
+            accounts_module.load_accounts(str(path))
+
+    def test_poll_all_keeps_state_per_account(self, monkeypatch,
+                                              accounts_module):
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'a': 'approved', 'b': 'reviewing'
+        }))
+        accounts = [
+            accounts_module.Account('a', 1),
+            accounts_module.Account('b', 2),
+            accounts_module.Account('c', 3),
+        ]
+        bot = RecordingBot()
+        poller = accounts_module.AccountPoller(accounts, bot, max_workers=2)
+        notified = poller.poll_all()
+        assert notified == [True, True, False], (
+            'Аккаунт без работ не должен получать уведомлений.'
+        )
+        assert sorted(chat for chat, _ in bot.sent) == [1, 2], (
+            'Убедитесь, что каждый аккаунт уведомляется в свой чат.'
+        )
+        import cursor
+        assert accounts[0].timestamp == 1000198000 - cursor.OVERLAP, (
+            'Убедитесь, что timestamp аккаунта обновляется после отправки.'
+        )
+        poller.poll_all()
+        poller.shutdown()
+        assert len(bot.sent) == 2, (
+            'Неизменившийся статус не должен отправляться повторно.'
+        )
+
+    def test_state_is_kept_per_token(self, monkeypatch, tmp_path,
+                                     accounts_module):
+        import state
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'a': 'approved', 'b': 'reviewing'
+        }))
+        store = state.StateStore(str(tmp_path / 'state.db'))
+        accounts = [
+            accounts_module.Account('a', 1), accounts_module.Account('b', 1)
+        ]
+        poller = accounts_module.AccountPoller(
+            accounts, RecordingBot(), store=store
+        )
+        poller.poll_all()
+        poller.shutdown()
+        store.close()
+        store = state.StateStore(str(tmp_path / 'state.db'))
+        assert [
+            list(store.load(account.key).homeworks) for account in accounts
+        ] == [[(None, 'hw_a')], [(None, 'hw_b')]], (
+            'Состояние аккаунтов одного чата с разными токенами должно '
+            'храниться раздельно.'
+        )
+
+    def test_status_is_committed_after_delivery(self, monkeypatch,
+                                                accounts_module):
+        import delivery
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'a': 'approved'
+        }))
+        results = [False, True]
+        sent = []
+
+        def send(bot, chat_id, text):
+            sent.append(text)
+            return results.pop(0)
+
+        queue = delivery.DeliveryQueue(None, send=send, chat_rate=1000)
+        account = accounts_module.Account('a', 1)
+        poller = accounts_module.AccountPoller(
+            [account], None, delivery=queue
+        )
+        for _ in range(3):
+            poller.poll_all()
+            assert queue.join(timeout=1)
+        poller.shutdown()
+        assert len(sent) == 2, (
+            'Недоставленный статус должен отправляться повторно, '
+            'а доставленный - один раз.'
+        )
+        assert not account.index.undelivered()
+
+    def test_status_in_flight_is_not_queued_again(self, monkeypatch,
+                                                  accounts_module):
+        import delivery
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'a': 'approved'
+        }))
+        gate = threading.Event()
+        sent = []
+
+        def send(bot, chat_id, text):
+            gate.wait(1)
+            sent.append(text)
+            return True
+
+        queue = delivery.DeliveryQueue(None, send=send, chat_rate=1000)
+        poller = accounts_module.AccountPoller(
+            [accounts_module.Account('a', 1)], None, delivery=queue
+        )
+        poller.poll_all()
+        poller.poll_all()
+        gate.set()
+        assert queue.join(timeout=1)
+        poller.poll_all()
+        poller.shutdown()
+        assert len(sent) == 1, (
+            'Статус, ждущий доставки, не должен ставиться в очередь снова.'
+        )
+
+    def test_poll_account_error_sent_once(self, monkeypatch,
+                                          accounts_module):
+        def mock_get_with_exception(*args, **kwargs):
+            raise requests.RequestException('Something wrong')
+
+        monkeypatch.setattr(requests, 'get', mock_get_with_exception)
+        account = accounts_module.Account('a', 1)
+        bot = RecordingBot()
+        poller = accounts_module.AccountPoller([account], bot)
+        poller.poll_all()
+        poller.poll_all()
+        poller.shutdown()
+        assert len(bot.sent) == 1, (
+            'Одинаковая ошибка аккаунта не должна отправляться повторно.'
+        )
+
+    def test_poll_account_error_is_counted(self, monkeypatch,
+                                           accounts_module):
+        import metrics
+
+        def mock_get_with_exception(*args, **kwargs):
+            raise requests.RequestException('Something wrong')
+
+        monkeypatch.setattr(requests, 'get', mock_get_with_exception)
+        errors = sum(metrics.ERRORS.values.values())
+        poller = accounts_module.AccountPoller(
+            [accounts_module.Account('a', 1)], RecordingBot()
+        )
+        poller.poll_all()
+        poller.shutdown()
+        assert sum(metrics.ERRORS.values.values()) == errors + 1, (
+            'Сбой опроса аккаунта должен попадать в счётчик ошибок.'
+        )
+
+    def test_parse_time_is_measured(self, monkeypatch, accounts_module):
+        import metrics
+
+        monkeypatch.setattr(
+            requests, 'get', mock_get_by_token({'a': 'approved'})
+        )
+        parsed = metrics.PARSE_TIME.count
+        poller = accounts_module.AccountPoller(
+            [accounts_module.Account('a', 1)], RecordingBot()
+        )
+        poller.poll_all()
+        poller.shutdown()
+        assert metrics.PARSE_TIME.count == parsed + 1, (
+            'Опрос аккаунтов должен учитывать время проверки ответа API.'
+        )
@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+import requests
+
+import utils
+
+
+@pytest.fixture
+def api_cache_module():
+    import api_cache
+    return api_cache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Upstream:
+    def __init__(self, status=200, gate=None):
+        self.status = status
+        self.gate = gate
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        with self.lock:
+            self.calls.append(params)
+        if self.gate is not None:
+            self.gate.wait(1)
+        response = utils.MockResponseGET(
+            http_status=self.status,
+            data={'homeworks': [], 'current_date': 1}
+        )
+        response.content = b'{"homeworks": [], "current_date": 1}'
+        response.headers = {'Content-Type': 'application/json'}
+        return response
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_request(self, api_cache_module):
+        gate = threading.Event()
+        upstream = Upstream(gate=gate)
+        session = api_cache_module.CachingSession(upstream)
+        params = {'from_date': 0}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [
+                executor.submit(session.get, 'url', params=params)
+                for _ in range(8)
+            ]
+            while not upstream.calls:
+                gate.wait(0.01)
+            gate.set()
+            responses = {id(future.result()) for future in futures}
+        assert len(upstream.calls) == 1, (
+            'Одинаковые одновременные запросы должны выполняться один раз.'
+        )
+        assert len(responses) == 1
+        stats = session.stats()
+        assert stats['miss'] == 1
+        assert stats['coalesced'] + stats['hit'] == 7
+
+    def test_errors_are_shared_but_not_cached(self, api_cache_module):
+        flight = api_cache_module.SingleFlight()
+
+        def failing():
+            raise ConnectionError('down')
+
+        with pytest.raises(ConnectionError):
+            flight.do('key', failing)
+        assert flight.do('key', lambda: 1) == (1, False)
+
+
+class TestCachingSession:
+
+    def test_ttl_and_keys(self, api_cache_module):
+        timer = FakeTimer()
+        upstream = Upstream()
+        session = api_cache_module.CachingSession(upstream, ttl=5,
+                                                  timer=timer)
+        headers = {'Authorization': 'OAuth a'}
+        session.get('url', headers=headers, params={'from_date': 0})
+        session.get('url', headers=headers, params={'from_date': 0})
+        session.get('url', headers={'Authorization': 'OAuth b'},
+                    params={'from_date': 0})
+        assert len(upstream.calls) == 2, (
+            'Кэш должен различать токены и отдавать свежий ответ из памяти.'
+        )
+        timer.now = 6
+        session.get('url', headers=headers, params={'from_date': 0})
+        assert len(upstream.calls) == 3
+        assert session.stats()['hit'] == 1
+
+    def test_error_responses_are_not_cached(self, api_cache_module):
+        upstream = Upstream(status=502)
+        session = api_cache_module.CachingSession(upstream)
+        for _ in range(2):
+            session.get('url', params={'from_date': 0})
+        assert len(upstream.calls) == 2
+
+
+class TestProxy:
+
+    def test_bots_share_cache_through_proxy(
+            self, monkeypatch, api_cache_module, homework_module
+    ):
+        upstream = Upstream()
+        cache = api_cache_module.CachingSession(upstream)
+        server = api_cache_module.serve_proxy(cache, 'upstream', port=0)
+        proxy_url = f'http://127.0.0.1:{server.server_port}/'
+        try:
+            monkeypatch.setattr(
+                homework_module, 'API_SESSION',
+                api_cache_module.ProxyClient(requests.Session(), proxy_url)
+            )
+            for _ in range(2):
+                assert homework_module.get_api_answer(0) == {
+                    'homeworks': [], 'current_date': 1
+                }
+            assert upstream.calls == [{'from_date': '0'}]
+            assert requests.get(proxy_url + 'stats').json()['hit'] == 1
+        finally:
+            server.shutdown()
+            server.server_close()
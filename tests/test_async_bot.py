@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import threading
+from http import HTTPStatus
+
+import pytest
+import requests
+import telegram
+
+import utils
+from test_bot import create_mock_response_get_with_custom_status_and_data
+
+
+@pytest.fixture
+def async_bot_module():
+    import async_bot
+    return async_bot
+
+
+class TestAsyncBot:
+    HOMEWORK_VERDICTS = {
+        'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
+        'reviewing': 'Работа взята на проверку ревьюером.',
+        'rejected': 'Работа проверена: у ревьюера есть замечания.'
+    }
+
+    def mock_main(self, monkeypatch, random_timestamp, homework_module,
+                  mock_bot=True, response_data=None):
+        """Подмена всех внешних вызовов внутри async-цикла бота."""
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+
+        async def sleep_to_interrupt(secs):
+            assert secs == homework_module.RETRY_PERIOD, (
+                'Убедитесь, что повторный запрос к API домашки отправляется '
+                'через `RETRY_PERIOD`.'
+            )
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(asyncio, 'sleep', sleep_to_interrupt)
+        if mock_bot:
+            monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        monkeypatch.setattr(
+            requests,
+            'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=random_timestamp,
+                http_status=HTTPStatus.OK,
+                data=response_data
+            )
+        )
+
+    def test_main_without_env_vars_raise_exception(
+            self, monkeypatch, random_timestamp, homework_module,
+            async_bot_module
+    ):
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', None)
+        with pytest.raises(ValueError):
+            async_bot_module.main()
+
+    def test_main_send_request_to_api(self, monkeypatch, random_timestamp,
+                                      caplog, homework_module,
+                                      async_bot_module):
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+        with caplog.at_level(logging.WARN):
+            with pytest.raises(utils.BreakInfiniteLoop):
+                async_bot_module.main()
+        assert [
+            record for record in caplog.records
+            if record.message == utils.MockResponseGET.CALLED_LOG_MSG
+        ], (
+            'Убедитесь, что бот использует функцию `requests.get()` '
+            'для отправки запроса к API домашки.'
+        )
+
+    def test_main_check_response_is_called(self, monkeypatch,
+                                           random_timestamp,
+                                           homework_module,
+                                           async_bot_module):
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+        responses = []
+        monkeypatch.setattr(
+            homework_module, 'check_response', responses.append
+        )
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert responses == [
+            {'homeworks': [], 'current_date': random_timestamp}
+        ], 'Убедитесь, что в функцию `check_response` передан ответ API.'
+
+    def test_main_send_message_with_new_status(self, monkeypatch,
+                                               random_timestamp,
+                                               homework_module,
+                                               async_bot_module,
+                                               data_with_new_hw_status):
+        self.mock_main(
+            monkeypatch, random_timestamp, homework_module,
+            response_data=data_with_new_hw_status
+        )
+        messages = []
+
+        def mock_send_message(bot, message=''):
+            messages.append(message)
+            return True
+
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert len(messages) == 1 and messages[0].endswith(
+            self.HOMEWORK_VERDICTS['approved']
+        ), (
+            'Убедитесь, что при изменении статуса домашней работы '
+            'бот отправляет в Telegram сообщение с вердиктом '
+            'из переменной `HOMEWORK_VERDICTS`.'
+        )
+
+    def test_main_send_message_with_telegram_exception(
+            self, monkeypatch, random_timestamp, caplog, homework_module,
+            async_bot_module, data_with_new_hw_status
+    ):
+        self.mock_main(
+            monkeypatch, random_timestamp, homework_module, mock_bot=False,
+            response_data=data_with_new_hw_status
+        )
+
+        class MockedBotWithException(utils.MockTelegramBot):
+            def send_message(self, *args, **kwargs):
+                raise telegram.error.TelegramError('Something wrong')
+
+        monkeypatch.setattr(telegram, 'Bot', MockedBotWithException)
+        with utils.check_logging(caplog, level=logging.ERROR, message=(
+                'Убедитесь, что ошибка отправки сообщения в Telegram '
+                'логируется с уровнем `ERROR`.'
+        )):
+            with pytest.raises(utils.BreakInfiniteLoop):
+                async_bot_module.main()
+
+    def test_metrics_are_recorded(self, monkeypatch, random_timestamp,
+                                  homework_module, async_bot_module):
+        import metrics
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+        parsed = metrics.PARSE_TIME.count
+        lags = metrics.LOOP_LAG.count
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert metrics.PARSE_TIME.count == parsed + 1, (
+            'Режим asyncio должен учитывать время проверки ответа API.'
+        )
+        assert metrics.LOOP_LAG.count == lags + 1, (
+            'Режим asyncio должен учитывать задержку цикла опроса.'
+        )
+
+    def test_errors_are_counted(self, monkeypatch, random_timestamp,
+                                homework_module, async_bot_module):
+        import metrics
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+
+        def mock_get_with_exception(*args, **kwargs):
+            raise requests.RequestException('Something wrong')
+
+        async def sleep_to_interrupt(secs):
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(requests, 'get', mock_get_with_exception)
+        monkeypatch.setattr(asyncio, 'sleep', sleep_to_interrupt)
+        errors = sum(metrics.ERRORS.values.values())
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert sum(metrics.ERRORS.values.values()) == errors + 1, (
+            'Сбой опроса в режиме asyncio должен попадать в счётчик ошибок.'
+        )
+
+    def test_blocking_calls_run_within_budget(self, monkeypatch,
+                                              random_timestamp,
+                                              homework_module,
+                                              async_bot_module,
+                                              data_with_new_hw_status):
+        import deadline
+        self.mock_main(
+            monkeypatch, random_timestamp, homework_module,
+            response_data=data_with_new_hw_status
+        )
+        monkeypatch.setenv('ITERATION_BUDGET', '30')
+        budgets = []
+        get_api_answer = homework_module.get_api_answer
+
+        def mock_get_api_answer(timestamp):
+            budgets.append(deadline.current().budget)
+            return get_api_answer(timestamp)
+
+        def mock_send_message(bot, message=''):
+            budgets.append(deadline.current().budget)
+            return True
+
+        monkeypatch.setattr(
+            homework_module, 'get_api_answer', mock_get_api_answer
+        )
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert budgets == [30, 30], (
+            'Запрос к API и отправка сообщения в режиме asyncio должны '
+            'выполняться в пределах бюджета итерации.'
+        )
+
+    def test_state_survives_restart(self, monkeypatch, tmp_path,
+                                    random_timestamp, homework_module,
+                                    async_bot_module,
+                                    data_with_new_hw_status):
+        self.mock_main(
+            monkeypatch, random_timestamp, homework_module,
+            response_data=data_with_new_hw_status
+        )
+        monkeypatch.setenv('STATE_DB', str(tmp_path / 'state.db'))
+        messages = []
+
+        def mock_send_message(bot, message=''):
+            messages.append(message)
+            return True
+
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        for _ in range(2):
+            with pytest.raises(utils.BreakInfiniteLoop):
+                async_bot_module.main()
+        assert len(messages) == 1, (
+            'После перезапуска в режиме asyncio уже отправленный статус '
+            'не должен отправляться повторно.'
+        )
+
+    def test_store_is_used_off_event_loop(self, monkeypatch, tmp_path,
+                                          random_timestamp, homework_module,
+                                          async_bot_module):
+        import state
+        self.mock_main(monkeypatch, random_timestamp, homework_module)
+        monkeypatch.setenv('STATE_DB', str(tmp_path / 'state.db'))
+        threads = {}
+
+        def record_thread(name, func):
+            def wrapper(*args, **kwargs):
+                threads[name] = threading.current_thread()
+                return func(*args, **kwargs)
+            return wrapper
+
+        monkeypatch.setattr(
+            state, 'open_store', record_thread('open_store', state.open_store)
+        )
+        for name in ('load', 'maybe_flush', 'close'):
+            monkeypatch.setattr(
+                state.StateStore, name,
+                record_thread(name, getattr(state.StateStore, name))
+            )
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot_module.main()
+        assert sorted(threads) == ['close', 'load', 'maybe_flush',
+                                   'open_store']
+        assert threading.main_thread() not in threads.values(), (
+            'Работа с базой состояния в режиме asyncio не должна '
+            'блокировать цикл событий.'
+        )
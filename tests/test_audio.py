@@ -0,0 +1,97 @@
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+import requests
+import telegram
+
+import utils
+from test_bot import create_mock_response_get_with_custom_status_and_data
+
+old_sleep = time.sleep
+
+
+@pytest.fixture
+def audio_module():
+    import audio
+    return audio
+
+
+class BlockingBackend:
+    def __init__(self):
+        self.release = threading.Event()
+        self.played = []
+
+    def play(self, path, data):
+        self.played.append(path)
+        self.release.wait(1)
+
+
+class TestAudioWorker:
+
+    def test_sounds_are_preloaded(self, homework_module, audio_module):
+        worker = audio_module.AudioWorker(
+            homework_module.SOUNDS_PATH, homework_module.HOMEWORK_VERDICTS,
+            backend=audio_module.NullBackend()
+        )
+        assert set(worker.buffers) == set(homework_module.HOMEWORK_VERDICTS)
+        assert all(worker.buffers.values())
+        worker.stop()
+
+    def test_duplicates_are_collapsed(self, homework_module, audio_module):
+        backend = BlockingBackend()
+        worker = audio_module.AudioWorker(
+            homework_module.SOUNDS_PATH, homework_module.HOMEWORK_VERDICTS,
+            backend=backend
+        )
+        worker.play('approved')
+        while not backend.played:
+            old_sleep(0.01)
+        results = [worker.play('rejected') for _ in range(5)]
+        assert results == [True, False, False, False, False], (
+            'Одинаковые звуки в очереди должны схлопываться.'
+        )
+        backend.release.set()
+        worker.stop()
+        assert len(backend.played) == 2
+
+    def test_headless_uses_null_backend(self, monkeypatch, audio_module):
+        monkeypatch.delenv('AUDIO_BACKEND', raising=False)
+        monkeypatch.setattr(audio_module, 'has_audio_device', lambda: False)
+        assert isinstance(audio_module.select_backend(),
+                          audio_module.NullBackend)
+
+    def test_main_iteration_does_not_wait_for_audio(
+            self, monkeypatch, homework_module, data_with_new_hw_status
+    ):
+        import playsound
+
+        def slow_playsound(path):
+            old_sleep(1)
+
+        monkeypatch.setattr(playsound, 'playsound', slow_playsound)
+        monkeypatch.setenv('AUDIO_BACKEND', 'playsound')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        monkeypatch.setattr(homework_module, 'send_message',
+                            lambda bot, message: True)
+        monkeypatch.setattr(
+            requests, 'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=1000198000,
+                http_status=HTTPStatus.OK,
+                data=data_with_new_hw_status
+            )
+        )
+
+        def sleep_to_interrupt(secs):
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(time, 'sleep', sleep_to_interrupt)
+        started = time.monotonic()
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        assert time.monotonic() - started < 0.5, (
+            'Итерация `main()` не должна ждать проигрывания звука.'
+        )
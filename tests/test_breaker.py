@@ -0,0 +1,160 @@
+from http import HTTPStatus
+
+import pytest
+import requests
+
+import utils
+
+
+@pytest.fixture
+def breaker_module():
+    import breaker
+    return breaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Bot:
+    def __init__(self):
+        self.sent = []
+
+    def send_message(self, chat_id=None, text=None, **kwargs):
+        self.sent.append(text)
+
+
+class TestCircuitBreaker:
+
+    def test_opens_and_recovers_through_probe(self, breaker_module):
+        from exceptions import CircuitOpen
+        clock = FakeClock()
+        breaker = breaker_module.CircuitBreaker(
+            'api', failure_threshold=3, probe_interval=60, clock=clock
+        )
+        for _ in range(3):
+            breaker.check()
+            breaker.failed()
+        assert breaker.state == breaker_module.OPEN
+        with pytest.raises(CircuitOpen):
+            breaker.check()
+        clock.now = 60
+        assert breaker.allow(), 'После интервала должен пройти пробный вызов.'
+        assert breaker.state == breaker_module.HALF_OPEN
+        assert not breaker.allow(), 'Пробный вызов должен быть один.'
+        breaker.succeeded()
+        assert breaker.state == breaker_module.CLOSED
+        assert breaker.allow()
+
+    def test_failed_probe_reopens(self, breaker_module):
+        clock = FakeClock()
+        breaker = breaker_module.CircuitBreaker(
+            'api', failure_threshold=1, probe_interval=10, clock=clock
+        )
+        breaker.failed()
+        clock.now = 10
+        assert breaker.allow()
+        breaker.failed()
+        assert breaker.state == breaker_module.OPEN
+        clock.now = 15
+        assert not breaker.allow()
+
+    def test_state_is_exported(self, monkeypatch, breaker_module):
+        import metrics
+        breaker = breaker_module.CircuitBreaker('api', failure_threshold=1)
+        monkeypatch.setattr(breaker_module, 'BREAKERS', {'api': breaker})
+        breaker.failed()
+        assert 'homework_circuit_state{dependency="api"} 2' in (
+            metrics.REGISTRY.render()
+        )
+
+
+class TestBreakerIntegration:
+
+    def test_api_outage_stops_requests(
+            self, monkeypatch, breaker_module, homework_module
+    ):
+        from exceptions import CircuitOpen, HTTPStatusNotOK
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(kwargs)
+            return utils.MockResponseGET(
+                http_status=HTTPStatus.SERVICE_UNAVAILABLE
+            )
+
+        monkeypatch.setattr(requests, 'get', get)
+        monkeypatch.setattr(
+            homework_module, 'API_BREAKER',
+            breaker_module.CircuitBreaker('practicum', failure_threshold=2)
+        )
+        for _ in range(2):
+            with pytest.raises(HTTPStatusNotOK):
+                homework_module.get_api_answer(0)
+        for _ in range(3):
+            with pytest.raises(CircuitOpen):
+                homework_module.get_api_answer(0)
+        assert len(calls) == 2, (
+            'При открытом предохранителе запросы к API не должны уходить.'
+        )
+
+    def test_probe_without_response_is_a_failure(
+            self, monkeypatch, breaker_module, homework_module
+    ):
+        from exceptions import DeadlineExceeded
+        clock = FakeClock()
+        responses = [DeadlineExceeded('повтор не укладывается в бюджет')]
+
+        def get(*args, **kwargs):
+            if responses:
+                raise responses.pop()
+            return utils.MockResponseGET()
+
+        monkeypatch.setattr(requests, 'get', get)
+        breaker = breaker_module.CircuitBreaker(
+            'practicum', failure_threshold=1, probe_interval=10, clock=clock
+        )
+        breaker.failed()
+        monkeypatch.setattr(homework_module, 'API_BREAKER', breaker)
+        clock.now = 10
+        with pytest.raises(DeadlineExceeded):
+            homework_module.get_api_answer(0)
+        assert breaker.state == breaker_module.OPEN, (
+            'Пробный запрос, завершившийся исключением, должен снова '
+            'открывать предохранитель.'
+        )
+        clock.now = 20
+        homework_module.get_api_answer(0)
+        assert breaker.state == breaker_module.CLOSED
+
+    def test_client_errors_do_not_open_breaker(
+            self, monkeypatch, breaker_module, homework_module
+    ):
+        from exceptions import HTTPStatusNotOK
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: utils.MockResponseGET(
+                http_status=HTTPStatus.UNAUTHORIZED
+            )
+        )
+        breaker = breaker_module.CircuitBreaker('practicum',
+                                                failure_threshold=1)
+        monkeypatch.setattr(homework_module, 'API_BREAKER', breaker)
+        with pytest.raises(HTTPStatusNotOK):
+            homework_module.get_api_answer(0)
+        assert breaker.state == breaker_module.CLOSED
+
+    def test_send_message_skips_open_telegram(
+            self, monkeypatch, breaker_module, homework_module
+    ):
+        breaker = breaker_module.CircuitBreaker('telegram',
+                                                failure_threshold=1)
+        breaker.failed()
+        monkeypatch.setattr(homework_module, 'TELEGRAM_BREAKER', breaker)
+        bot = Bot()
+        assert homework_module.send_message(bot, 'text') is False
+        assert bot.sent == []
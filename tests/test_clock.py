@@ -0,0 +1,97 @@
+import json
+import time
+
+import pytest
+import requests
+import telegram
+
+import utils
+
+WEEK = 7 * 24 * 60 * 60
+START = 1_700_000_000
+
+
+@pytest.fixture
+def clock_module():
+    import clock
+    return clock
+
+
+def homeworks_payload(status, date_updated, current_date):
+    return json.dumps({
+        'homeworks': [{
+            'id': 1,
+            'homework_name': 'hw1',
+            'status': status,
+            'date_updated': date_updated,
+        }],
+        'current_date': current_date,
+    })
+
+
+class TestVirtualClock:
+
+    def test_sleep_only_moves_time(self, clock_module):
+        clock = clock_module.VirtualClock(start=100, max_sleeps=1)
+        clock.sleep(600)
+        assert clock.time() == clock.monotonic() == 700
+        with pytest.raises(clock_module.SimulationFinished):
+            clock.sleep(600)
+
+    def test_install_restores_time_module(self, clock_module,
+                                          homework_module):
+        with clock_module.install(clock_module.VirtualClock(start=0)):
+            assert homework_module.time.time() == 0
+        assert homework_module.time is time
+
+    def test_week_of_polling_runs_in_seconds(
+            self, monkeypatch, clock_module, homework_module
+    ):
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(homework_module, 'RETRY_PERIOD', 600)
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda *args, **kwargs: utils.MockResponseGET(
+                data={'homeworks': [], 'current_date': START}
+            )
+        )
+        clock = clock_module.VirtualClock(start=START, until=START + WEEK)
+        started = time.monotonic()
+        with clock_module.install(clock):
+            with pytest.raises(clock_module.SimulationFinished):
+                homework_module.main()
+        assert clock.sleeps == WEEK // 600, (
+            'За виртуальную неделю бот должен опросить API '
+            'каждые `RETRY_PERIOD` секунд.'
+        )
+        assert time.monotonic() - started < 1
+
+
+class TestReplayDriver:
+
+    def test_replay_notifies_recorded_transitions(
+            self, monkeypatch, clock_module, homework_module
+    ):
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        sent = []
+        monkeypatch.setattr(homework_module, 'send_message',
+                            lambda bot, message: sent.append(message) or True)
+        records = [
+            (START, 200, homeworks_payload(
+                'reviewing', '2023-11-14T22:00:00Z', START)),
+            (START + 3600, 502, b''),
+            (START + 7200, 200, homeworks_payload(
+                'approved', '2023-11-15T00:00:00Z', START + 7200)),
+        ]
+        driver = clock_module.ReplayDriver(
+            records, clock_module.VirtualClock(start=START)
+        )
+        assert driver.run() == 3
+        assert driver.clock.now >= START + 7200
+        assert sum('hw1' in message for message in sent) == 2, (
+            'При воспроизведении записи бот должен уведомить о каждой '
+            'смене статуса.'
+        )
+        assert homework_module.API_SESSION is None
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import telegram
+
+import utils
+
+START = 1_700_000_000
+
+
+@pytest.fixture
+def cursor_module():
+    import cursor
+    return cursor
+
+
+class TestAdvance:
+
+    def test_cursor_overlaps_previous_window(self, cursor_module):
+        assert cursor_module.advance(
+            START, {'current_date': START + 600}, now=START + 600
+        ) == START + 600 - cursor_module.OVERLAP
+
+    def test_cursor_never_moves_back(self, cursor_module):
+        assert cursor_module.advance(
+            START, {'current_date': START - 3600}, now=START
+        ) == START
+
+    def test_cursor_holds_while_undelivered(self, cursor_module):
+        assert cursor_module.advance(
+            START, {'current_date': START + 600}, held=True
+        ) == START
+        assert cursor_module.advance(START, {'homeworks': []}) == START
+
+    def test_server_clock_ahead_is_clamped(self, cursor_module):
+        assert cursor_module.advance(
+            START, {'current_date': START + 86400}, now=START
+        ) == START + cursor_module.MAX_SKEW - cursor_module.OVERLAP
+
+
+class TestMainCursor:
+
+    def test_overlap_does_not_duplicate_notifications(
+            self, monkeypatch, homework_module
+    ):
+        import clock
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        sent = []
+        monkeypatch.setattr(homework_module, 'send_message',
+                            lambda bot, message: sent.append(message) or True)
+        work = {
+            'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+            'date_updated': '2023-11-14T22:13:20Z',
+        }
+        records = [
+            (START + step * 600, 200, json.dumps({
+                'homeworks': [work] if step in (1, 2) else [],
+                'current_date': START + step * 600,
+            }))
+            for step in range(4)
+        ]
+        driver = clock.ReplayDriver(records, clock.VirtualClock(start=START))
+        requested = []
+        get = driver.get
+
+        def recording_get(url=None, headers=None, params=None, **kwargs):
+            requested.append(params['from_date'])
+            return get(url, headers, params, **kwargs)
+
+        driver.get = recording_get
+        driver.run()
+        assert len(sent) == 1, (
+            'Работа из перекрывающихся окон должна уведомляться один раз.'
+        )
+        assert requested[:4] == sorted(requested[:4])
+        assert requested[3] > requested[1], (
+            'Курсор должен сдвигаться и после ответов без изменений.'
+        )
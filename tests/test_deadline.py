@@ -0,0 +1,189 @@
+import threading
+
+import pytest
+import requests
+import telegram
+
+import utils
+
+
+@pytest.fixture
+def deadline_module():
+    import deadline
+    return deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+
+    def test_timeout_is_capped_by_budget(self, deadline_module):
+        from exceptions import DeadlineExceeded
+        clock = FakeClock()
+        with deadline_module.budget(5, clock):
+            assert deadline_module.timeout(10, 'call') == 5
+            clock.now = 4
+            assert deadline_module.timeout(10, 'call') == 1
+            clock.now = 5
+            with pytest.raises(DeadlineExceeded):
+                deadline_module.timeout(10, 'call')
+        assert deadline_module.timeout(10, 'call') == 10, (
+            'Вне бюджета таймаут вызова не должен меняться.'
+        )
+
+    def test_api_request_gets_budget_timeout(
+            self, monkeypatch, deadline_module, homework_module
+    ):
+        calls = []
+
+        def get(*args, **kwargs):
+            calls.append(kwargs)
+            return utils.MockResponseGET()
+
+        monkeypatch.setattr(requests, 'get', get)
+        with deadline_module.budget(2):
+            homework_module.get_api_answer(0)
+        assert 0 < calls[0]['timeout'] <= 2, (
+            'Запрос к API должен получать таймаут из бюджета итерации.'
+        )
+
+    def test_hung_request_raises_deadline_exceeded(
+            self, monkeypatch, deadline_module, homework_module
+    ):
+        from exceptions import DeadlineExceeded
+        clock = FakeClock()
+
+        def hung_get(*args, **kwargs):
+            clock.now = 100
+            raise requests.ReadTimeout('read timed out')
+
+        monkeypatch.setattr(requests, 'get', hung_get)
+        with deadline_module.budget(10, clock):
+            with pytest.raises(DeadlineExceeded):
+                homework_module.get_api_answer(0)
+
+    def test_telegram_timeout_raises_deadline_exceeded(
+            self, deadline_module, homework_module
+    ):
+        from exceptions import DeadlineExceeded
+        clock = FakeClock()
+
+        class Bot:
+            def send_message(self, **kwargs):
+                clock.now = 100
+                raise telegram.error.TimedOut()
+
+        with deadline_module.budget(10, clock):
+            with pytest.raises(DeadlineExceeded):
+                homework_module.send_message(Bot(), 'text')
+        assert homework_module.send_message(Bot(), 'text') is False
+
+
+class TestErrorReport:
+
+    @pytest.fixture
+    def telegram_hangs(self, monkeypatch, homework_module):
+        import deadline
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'token')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abc')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(deadline, 'ERROR_REPORT_BUDGET', 0.01)
+
+        def get(*args, **kwargs):
+            raise requests.ConnectionError('API недоступен')
+
+        class Bot:
+            def __init__(self, **kwargs):
+                pass
+
+            def send_message(self, **kwargs):
+                threading.Event().wait(0.05)
+                raise telegram.error.TimedOut()
+
+        monkeypatch.setattr(requests, 'get', get)
+        monkeypatch.setattr(telegram, 'Bot', Bot)
+
+    def test_main_survives_report_timeout(self, monkeypatch, telegram_hangs,
+                                          homework_module):
+        import time
+
+        sleeps = []
+
+        def sleep_to_interrupt(secs):
+            sleeps.append(secs)
+            if len(sleeps) == 2:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(time, 'sleep', sleep_to_interrupt)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+
+    def test_async_main_survives_report_timeout(self, monkeypatch,
+                                                telegram_hangs):
+        import asyncio
+        import async_bot
+
+        sleeps = []
+
+        async def sleep_to_interrupt(secs):
+            sleeps.append(secs)
+            if len(sleeps) == 2:
+                raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(asyncio, 'sleep', sleep_to_interrupt)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot.main()
+
+
+class TestWatchdog:
+
+    def test_stalled_iteration_is_recorded_once(self, deadline_module):
+        clock = FakeClock()
+        watchdog = deadline_module.Watchdog(10, clock=clock)
+        stalled_before = deadline_module.STALLED_ITERATIONS.values.get(None, 0)
+        watchdog.beat()
+        clock.now = 5
+        assert not watchdog.check()
+        clock.now = 15
+        assert watchdog.check()
+        assert not watchdog.check()
+        watchdog.idle()
+        clock.now = 100
+        assert not watchdog.check()
+        assert deadline_module.STALLED_ITERATIONS.values[None] == (
+            stalled_before + 1
+        )
+
+
+class TestAudioTimeout:
+
+    def test_hung_playback_is_abandoned(self, homework_module):
+        import audio
+
+        class HungBackend:
+            release = threading.Event()
+            played = []
+
+            def play(self, path, data):
+                self.played.append(path)
+                self.release.wait(1)
+
+        backend = HungBackend()
+        worker = audio.AudioWorker(
+            homework_module.SOUNDS_PATH, homework_module.HOMEWORK_VERDICTS,
+            backend=backend, play_timeout=0.05
+        )
+        assert not worker.play_with_timeout('approved')
+        assert not worker.play_with_timeout('rejected'), (
+            'Пока зависшее проигрывание не закончилось, звуки пропускаются.'
+        )
+        assert len(backend.played) == 1
+        backend.release.set()
+        worker.stop()
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def delivery_module():
+    import delivery
+    return delivery
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class GatedSender:
+    def __init__(self):
+        self.gate = threading.Event()
+        self.started = threading.Event()
+        self.sent = []
+
+    def __call__(self, bot, chat_id, text):
+        self.started.set()
+        self.gate.wait(1)
+        self.sent.append((chat_id, text))
+        return True
+
+
+class TestTokenBucket:
+
+    def test_rate_limit(self, delivery_module):
+        clock = FakeClock()
+        bucket = delivery_module.TokenBucket(rate=2, capacity=1, clock=clock)
+        assert bucket.delay() == 0
+        bucket.consume()
+        assert bucket.delay() == pytest.approx(0.5)
+        clock.now = 0.5
+        assert bucket.delay() == 0
+
+
+class TestDeliveryQueue:
+
+    def test_pending_messages_are_coalesced(self, delivery_module):
+        sender = GatedSender()
+        queue = delivery_module.DeliveryQueue(None, send=sender,
+                                              chat_rate=1000)
+        queue.submit(1, 'first')
+        assert sender.started.wait(1)
+        for text in ('second', 'third'):
+            queue.submit(1, text)
+        queue.submit(2, 'other')
+        sender.gate.set()
+        assert queue.join(timeout=1)
+        assert sorted(sender.sent) == [
+            (1, 'first'), (1, 'second\n\nthird'), (2, 'other')
+        ], 'Ждущие сообщения одного чата должны склеиваться в одно.'
+        stats = queue.stats()
+        assert stats['sent'] == 3 and stats['coalesced'] == 1
+        assert stats['depth'] == 0
+
+    def test_coalesced_message_fits_telegram_limit(self, delivery_module):
+        sender = GatedSender()
+        queue = delivery_module.DeliveryQueue(None, send=sender,
+                                              chat_rate=1000)
+        queue.submit(1, 'head')
+        assert sender.started.wait(1)
+        for _ in range(3):
+            queue.submit(1, 'x' * 3000)
+        sender.gate.set()
+        assert queue.join(timeout=1)
+        assert len(sender.sent) == 4
+        assert all(
+            len(text) <= delivery_module.MESSAGE_MAX_LENGTH
+            for _, text in sender.sent
+        )
+
+    def test_queue_is_bounded(self, delivery_module):
+        sender = GatedSender()
+        queue = delivery_module.DeliveryQueue(None, send=sender, maxsize=2)
+        assert queue.submit(1, 'a') and queue.submit(2, 'b')
+        assert not queue.submit(3, 'c'), (
+            'При переполнении очередь должна отказывать, а не расти.'
+        )
+        assert queue.stats()['dropped'] == 1
+        sender.gate.set()
+        assert queue.join(timeout=1)
+
+    def test_on_done_gets_send_result(self, delivery_module):
+        results = []
+        queue = delivery_module.DeliveryQueue(
+            None, send=lambda bot, chat_id, text: text == 'ok',
+            chat_rate=1000
+        )
+        queue.submit(1, 'ok', on_done=results.append)
+        assert queue.join(timeout=1)
+        queue.submit(2, 'fail', on_done=results.append)
+        assert queue.join(timeout=1)
+        assert results == [True, False], (
+            'on_done должна получать результат отправки сообщения.'
+        )
+
+    def test_send_message_contract_is_kept(self, homework_module):
+        def failing_sender(*args, **kwargs):
+            import telegram
+            raise telegram.error.TelegramError('Something wrong')
+
+        class Bot:
+            send_message = staticmethod(failing_sender)
+
+        assert homework_module.send_message(Bot(), 'text') is False
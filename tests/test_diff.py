@@ -0,0 +1,91 @@
+import pytest
+
+
+@pytest.fixture
+def diff_module():
+    import diff
+    return diff
+
+
+class CountingHomework(dict):
+    reads = 0
+
+    def get(self, key, default=None):
+        CountingHomework.reads += 1
+        return super().get(key, default)
+
+
+class NoIterList(list):
+    def __iter__(self):
+        raise AssertionError(
+            'При совпадении отпечатка ответ не должен разбираться.'
+        )
+
+
+def make_homeworks(count, status='approved'):
+    return [
+        {
+            'id': number,
+            'homework_name': f'hw{number}',
+            'status': status,
+            'date_updated': f'2024-01-01T00:{number // 60:02}:{number % 60:02}Z'
+        }
+        for number in reversed(range(count))
+    ]
+
+
+def commit_all(index, homeworks):
+    for homework in reversed(index.transitions(homeworks)):
+        index.commit(homework)
+
+
+class TestHomeworkIndex:
+
+    def test_all_transitions_in_one_poll(self, diff_module):
+        index = diff_module.HomeworkIndex()
+        homeworks = make_homeworks(2, status='reviewing')
+        commit_all(index, homeworks)
+        homeworks[0].update(status='approved', date_updated='2024-02-01')
+        homeworks[1].update(status='rejected', date_updated='2024-02-01')
+        changed = index.transitions(homeworks)
+        assert [hw['id'] for hw in changed] == [1, 0], (
+            'Убедитесь, что за один опрос находятся все изменения статусов.'
+        )
+
+    def test_same_fingerprint_skips_parsing(self, diff_module):
+        index = diff_module.HomeworkIndex()
+        homeworks = make_homeworks(3)
+        commit_all(index, homeworks)
+        assert index.transitions(NoIterList(homeworks)) == []
+
+    def test_uncommitted_changes_are_repeated(self, diff_module):
+        index = diff_module.HomeworkIndex()
+        homeworks = make_homeworks(2)
+        assert len(index.transitions(homeworks)) == 2
+        assert len(index.transitions(homeworks)) == 2, (
+            'Неотправленное изменение должно найтись на следующем опросе.'
+        )
+
+    def test_cost_depends_on_changed_items(self, diff_module):
+        index = diff_module.HomeworkIndex()
+        homeworks = [CountingHomework(hw) for hw in make_homeworks(500)]
+        commit_all(index, homeworks)
+        updated = CountingHomework(
+            homeworks.pop(), status='rejected', date_updated='2024-02-01'
+        )
+        homeworks.insert(0, updated)
+        CountingHomework.reads = 0
+        assert index.transitions(homeworks) == [updated]
+        assert CountingHomework.reads < 20, (
+            'Сравнение должно затрагивать только изменившиеся работы.'
+        )
+
+    def test_notify_transitions_sends_every_change(self, homework_module,
+                                                   diff_module):
+        index = diff_module.HomeworkIndex()
+        sent = []
+        homeworks = make_homeworks(2)
+        assert homework_module.notify_transitions(
+            index, homeworks, lambda hw, verdict: sent.append(verdict) or True
+        )
+        assert [message.split('"')[1] for message in sent] == ['hw0', 'hw1']
@@ -0,0 +1,101 @@
+import pytest
+import telegram
+
+import utils
+
+START = 1_700_000_000
+
+
+@pytest.fixture
+def digest_module():
+    import error_digest
+    return error_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFingerprint:
+
+    def test_volatile_details_are_normalized(self, digest_module):
+        first = ConnectionError(
+            'Ошибка при подключении к странице https://a/?from_date=1!\n'
+            "headers: {'Authorization': 'OAuth secret1'}; params: 1700000000"
+        )
+        second = ConnectionError(
+            'Ошибка при подключении к странице https://b/?from_date=2!\n'
+            "headers: {'Authorization': 'OAuth secret2'}; params: 1700000600"
+        )
+        assert digest_module.fingerprint(first) == (
+            digest_module.fingerprint(second)
+        )
+        assert 'secret' not in digest_module.fingerprint(first)
+        assert digest_module.fingerprint(first) != (
+            digest_module.fingerprint(TimeoutError(str(first)))
+        )
+
+
+class TestErrorDigest:
+
+    def test_repeats_are_sent_as_digest(self, digest_module):
+        clock = FakeClock()
+        digest = digest_module.ErrorDigest(window=600, clock=clock)
+        key = digest.add(ConnectionError('down 1'))
+        assert key, 'О первой ошибке нужно сообщить сразу.'
+        digest.mark_reported(key)
+        for number in range(36):
+            assert digest.add(ConnectionError(f'down {number}')) is None
+        assert digest.pop_digest() is None
+        clock.now = 600
+        text = digest.pop_digest()
+        assert 'ConnectionError x 37' in text
+        assert digest.pop_digest() is None
+
+    def test_quiet_error_is_reported_again(self, digest_module):
+        clock = FakeClock()
+        digest = digest_module.ErrorDigest(window=600, clock=clock)
+        digest.mark_reported(digest.add(ValueError('bad')))
+        clock.now = 600
+        digest.pop_digest()
+        clock.now = 1200
+        digest.pop_digest()
+        assert digest.add(ValueError('bad')), (
+            'Ошибка, которой не было целое окно, снова сообщается сразу.'
+        )
+
+    def test_memory_is_bounded(self, digest_module):
+        clock = FakeClock()
+        digest = digest_module.ErrorDigest(max_fingerprints=10, clock=clock)
+        for number in range(1000):
+            digest.add(KeyError(f'key {chr(65 + number % 26) * number}'))
+        assert len(digest.entries) <= 10
+        clock.now = digest_module.WINDOW
+        assert 'Прочие ошибки x 990' in digest.pop_digest()
+
+
+class TestMainDigest:
+
+    def test_flapping_outage_does_not_spam_chat(
+            self, monkeypatch, homework_module
+    ):
+        import clock
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(homework_module, 'RETRY_PERIOD', 60)
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        sent = []
+        monkeypatch.setattr(homework_module, 'send_message',
+                            lambda bot, message: sent.append(message) or True)
+        records = [
+            (START + step * 60, 500 + step % 4, b'') for step in range(30)
+        ]
+        clock.ReplayDriver(records, clock.VirtualClock(start=START)).run()
+        assert len(sent) <= 4, (
+            'Повторяющиеся ошибки должны приходить сводкой, а не '
+            'отдельными сообщениями.'
+        )
+        assert any('HTTPStatusNotOK x' in message for message in sent)
@@ -0,0 +1,132 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+
+import pytest
+
+from exceptions import DeadlineExceeded, HTTPStatusNotOK
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        server.calls += 1
+        if server.failures:
+            server.failures -= 1
+            code, body = 503, b'{}'
+        else:
+            code, body = 200, json.dumps(
+                {'homeworks': [], 'current_date': 1}
+            ).encode()
+        self.send_response(code)
+        if code == 503 and server.retry_after:
+            self.send_header('Retry-After', server.retry_after)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    server.daemon_threads = True
+    server.calls = 0
+    server.failures = 0
+    server.retry_after = None
+    server.url = f'http://127.0.0.1:{server.server_port}/'
+    threading.Thread(
+        target=server.serve_forever, args=(0.05,), daemon=True
+    ).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_session_module():
+    import http_session
+    return http_session
+
+
+class TestApiSession:
+
+    def test_connections_are_reused(self, flaky_server, http_session_module):
+        session = http_session_module.ApiSession(pool_size=2)
+        for _ in range(5):
+            assert session.get(flaky_server.url).status_code == 200
+        assert session.stats() == {
+            'requests': 5, 'connections': 1, 'reused': 4
+        }, 'Убедитесь, что соединение переиспользуется между запросами.'
+
+    def test_stats_are_exported(self, flaky_server, http_session_module):
+        import metrics
+        registry = metrics.Registry()
+        session = http_session_module.ApiSession(pool_size=2)
+        http_session_module.export_stats(session, registry)
+        for _ in range(3):
+            session.get(flaky_server.url)
+        text = registry.render()
+        assert 'homework_api_session_connections{kind="reused"} 2' in text
+        assert 'homework_api_session_connections{kind="connections"} 1' in (
+            text
+        )
+
+    def test_retry_limit_per_status(self, flaky_server, http_session_module):
+        flaky_server.failures = 2
+        session = http_session_module.ApiSession(
+            retry_statuses={503: 3}, backoff_factor=0
+        )
+        assert session.get(flaky_server.url).status_code == 200
+        assert flaky_server.calls == 3
+
+    def test_retry_after_is_bounded_by_deadline(self, flaky_server,
+                                                http_session_module):
+        import deadline
+        flaky_server.failures = 1
+        flaky_server.retry_after = '30'
+        session = http_session_module.ApiSession(retry_statuses={503: 1})
+        started = time.monotonic()
+        with deadline.budget(1):
+            with pytest.raises(DeadlineExceeded):
+                session.get(flaky_server.url)
+        assert time.monotonic() - started < 1, (
+            'Пауза Retry-After не должна выходить за бюджет итерации.'
+        )
+        assert flaky_server.calls == 1
+
+    def test_short_retry_fits_deadline(self, flaky_server,
+                                       http_session_module):
+        import deadline
+        flaky_server.failures = 1
+        flaky_server.retry_after = '0'
+        session = http_session_module.ApiSession(retry_statuses={503: 1})
+        with deadline.budget(1):
+            assert session.get(flaky_server.url).status_code == 200
+        assert flaky_server.calls == 2
+
+    def test_error_mapping_is_kept(self, monkeypatch, flaky_server,
+                                   homework_module, http_session_module):
+        flaky_server.failures = 5
+        monkeypatch.setattr(
+            homework_module, 'API_SESSION',
+            http_session_module.ApiSession(
+                retry_statuses={503: 1}, backoff_factor=0
+            )
+        )
+        monkeypatch.setattr(homework_module, 'ENDPOINT', flaky_server.url)
+        with pytest.raises(HTTPStatusNotOK):
+            homework_module.get_api_answer(0)
+        assert flaky_server.calls == 2
+
+    def test_parse_retry_statuses(self, http_session_module):
+        assert http_session_module.parse_retry_statuses('502:3,429:1') == {
+            502: 3, 429: 1
+        }
+        with pytest.raises(ValueError):
+            http_session_module.parse_retry_statuses('502')
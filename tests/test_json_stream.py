@@ -0,0 +1,255 @@
+import json
+
+import pytest
+import requests
+
+from exceptions import InvalidHomeworks, ResponseError
+
+
+@pytest.fixture
+def json_stream_module():
+    import json_stream
+    return json_stream
+
+
+def make_homeworks(count, status='approved'):
+    return [
+        {
+            'id': number,
+            'homework_name': f'hw{number}',
+            'status': status,
+            'date_updated': f'2024-01-01T00:00:{number % 60:02}Z',
+            'reviewer_comment': 'Всё хорошо, «спасибо»!',
+        }
+        for number in reversed(range(count))
+    ]
+
+
+def split(body, size):
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+class StreamedResponse:
+    status_code = 200
+
+    def __init__(self, data, chunk=7, fail_after=None):
+        self.body = json.dumps(data, ensure_ascii=False).encode()
+        self.chunk = chunk
+        self.fail_after = fail_after
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for number, chunk in enumerate(split(self.body, self.chunk)):
+            if number == self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError('обрыв')
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+    @property
+    def content(self):
+        raise AssertionError('В потоковом режиме тело целиком не читается.')
+
+
+class TestHomeworkStream:
+
+    def test_chunks_of_any_size(self, json_stream_module):
+        data = {
+            'current_date': 1700000000,
+            'homeworks': make_homeworks(3),
+            'tail': {'nested': ['}', ']']},
+        }
+        body = json.dumps(data, ensure_ascii=False).encode()
+        for size in range(1, len(body) + 1):
+            stream = json_stream_module.HomeworkStream(split(body, size))
+            assert list(stream['homeworks']) == data['homeworks'], (
+                f'Работы разобраны неверно при частях по {size} байт.'
+            )
+            assert stream['current_date'] == data['current_date']
+            assert stream.get('tail') == data['tail']
+            assert stream.size == len(body)
+
+    def test_keys_after_homeworks_are_read_on_get(self, json_stream_module):
+        body = json.dumps({
+            'homeworks': make_homeworks(2), 'current_date': 5
+        }).encode()
+        stream = json_stream_module.HomeworkStream(split(body, 16))
+        assert stream['homeworks'][0]['id'] == 1
+        assert stream.get('current_date') == 5
+        assert stream.get('missing') is None
+
+    @pytest.mark.parametrize('body', [
+        b'{"homeworks": [1,]}', b'{"current_date": 1', b'{"a": 1} x', b'{1: 2}'
+    ])
+    def test_invalid_json(self, json_stream_module, body):
+        with pytest.raises(ValueError):
+            json_stream_module.HomeworkStream(split(body, 4)).drain()
+
+    def test_invalid_items_are_skipped_and_collected(self, json_stream_module):
+        homeworks = make_homeworks(3)
+        homeworks[1] = 'not a dict'
+        ended = []
+        stream = json_stream_module.HomeworkStream(
+            split(json.dumps({'homeworks': homeworks}).encode(), 10),
+            check=lambda index, item: (
+                [] if isinstance(item, dict) else [f'{index}: bad']
+            ),
+            keep=('id', 'status'),
+            on_end=ended.append
+        )
+        assert list(stream['homeworks']) == [
+            {'id': 2, 'status': 'approved'}, {'id': 0, 'status': 'approved'}
+        ]
+        assert stream.violations == ['1: bad']
+        assert ended == [stream]
+
+
+class TestStreamMode:
+
+    @pytest.fixture
+    def stream_mode(self, monkeypatch, homework_module):
+        monkeypatch.setattr(homework_module, 'API_STREAM', True)
+        return homework_module
+
+    def test_transitions_match_list_mode(self, monkeypatch, stream_mode):
+        import diff
+        data = {'homeworks': make_homeworks(50), 'current_date': 1700000000}
+        monkeypatch.setattr(
+            requests, 'get', lambda **kwargs: StreamedResponse(data)
+        )
+        listed = diff.HomeworkIndex().transitions(data['homeworks'])
+        index = diff.HomeworkIndex()
+        response = stream_mode.check_response(stream_mode.poll_api(0))
+        changed = index.transitions(response['homeworks'])
+        assert [work['id'] for work in changed] == [
+            work['id'] for work in listed
+        ]
+        assert 'reviewer_comment' not in changed[0], (
+            'В потоковом режиме от работ остаются только поля схемы.'
+        )
+        assert response.get('current_date') == 1700000000
+        for work in reversed(changed):
+            index.commit(work)
+        response = stream_mode.check_response(stream_mode.poll_api(0))
+        assert index.transitions(response['homeworks']) == [], (
+            'Повторный ответ не должен давать изменений.'
+        )
+
+    def test_invalid_item_fails_before_notification(self, monkeypatch,
+                                                    stream_mode):
+        import diff
+        homeworks = make_homeworks(5)
+        homeworks[4]['status'] = 'unknown'
+        monkeypatch.setattr(
+            requests, 'get',
+            lambda **kwargs: StreamedResponse({'homeworks': homeworks})
+        )
+        notified = []
+        response = stream_mode.check_response(stream_mode.poll_api(0))
+        with pytest.raises(InvalidHomeworks) as error:
+            stream_mode.notify_transitions(
+                diff.HomeworkIndex(), response['homeworks'],
+                lambda work, message: notified.append(work)
+            )
+        assert notified == [], (
+            'При нарушении схемы уведомления не должны отправляться.'
+        )
+        assert error.value.violations == [
+            '4: недопустимое значение ключа "status" - \'unknown\''
+        ]
+
+    @pytest.mark.parametrize('data, exception', [
+        ({'code': 'not_authenticated', 'error': 'Токен'}, ResponseError),
+        ([], TypeError),
+        ({'current_date': 1}, KeyError),
+        ({'homeworks': {}}, TypeError),
+    ])
+    def test_response_checks_are_unchanged(self, monkeypatch, stream_mode,
+                                           data, exception):
+        monkeypatch.setattr(
+            requests, 'get', lambda **kwargs: StreamedResponse(data)
+        )
+        with pytest.raises(exception):
+            stream_mode.check_response(stream_mode.poll_api(0))
+
+    def test_broken_body_is_connection_error(self, monkeypatch, stream_mode):
+        failures = []
+
+        class Breaker:
+            def check(self):
+                pass
+
+            def succeeded(self):
+                pass
+
+            def failed(self):
+                failures.append(True)
+
+        response = StreamedResponse(
+            {'homeworks': make_homeworks(20)}, fail_after=5
+        )
+        monkeypatch.setattr(stream_mode, 'API_BREAKER', Breaker())
+        monkeypatch.setattr(requests, 'get', lambda **kwargs: response)
+        stream = stream_mode.check_response(stream_mode.poll_api(0))
+        with pytest.raises(ConnectionError):
+            list(stream['homeworks'])
+        assert failures == [True], (
+            'Обрыв тела ответа должен учитываться предохранителем.'
+        )
+        assert response.closed
+
+    @pytest.mark.parametrize('body', [
+        b'{"homeworks": [{"id": 1},,]}', b'{"current_date": 1} x'
+    ])
+    def test_response_is_closed_on_error(self, monkeypatch, stream_mode,
+                                         body):
+        response = StreamedResponse({})
+        response.body = body
+        monkeypatch.setattr(requests, 'get', lambda **kwargs: response)
+        with pytest.raises(ValueError):
+            stream_mode.check_response(stream_mode.poll_api(0)).get('x')
+        assert response.closed, (
+            'При ошибке разбора соединение должно освобождаться.'
+        )
+
+    def test_response_is_closed_at_end(self, monkeypatch, stream_mode):
+        response = StreamedResponse({'homeworks': make_homeworks(3)})
+        monkeypatch.setattr(requests, 'get', lambda **kwargs: response)
+        stream = stream_mode.check_response(stream_mode.poll_api(0))
+        list(stream['homeworks'])
+        assert response.closed
+
+    def test_async_mode_streams(self, monkeypatch, stream_mode):
+        import asyncio
+        import telegram
+        import async_bot
+        import utils
+        monkeypatch.setattr(stream_mode, 'PRACTICUM_TOKEN', 'token')
+        monkeypatch.setattr(stream_mode, 'TELEGRAM_TOKEN', '1234:abc')
+        monkeypatch.setattr(stream_mode, 'TELEGRAM_CHAT_ID', '12345')
+        monkeypatch.setenv('AUDIO_BACKEND', 'null')
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        response = StreamedResponse({'homeworks': make_homeworks(3)})
+        requested = []
+
+        def get(**kwargs):
+            requested.append(kwargs.get('stream'))
+            return response
+
+        async def sleep_to_interrupt(secs):
+            raise utils.BreakInfiniteLoop('break')
+
+        monkeypatch.setattr(requests, 'get', get)
+        monkeypatch.setattr(asyncio, 'sleep', sleep_to_interrupt)
+        messages = []
+        monkeypatch.setattr(
+            stream_mode, 'send_message',
+            lambda bot, message: messages.append(message) or True
+        )
+        with pytest.raises(utils.BreakInfiniteLoop):
+            async_bot.main()
+        assert requested == [True], (
+            'В режиме asyncio API_PARSE_MODE=stream тоже должен работать.'
+        )
+        assert len(messages) == 3 and response.closed
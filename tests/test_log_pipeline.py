@@ -0,0 +1,105 @@
+import gzip
+import logging
+import os
+
+import pytest
+
+
+@pytest.fixture
+def pipeline_module():
+    import log_pipeline
+    return log_pipeline
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger('test_log_pipeline')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    yield logger
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLogPipeline:
+
+    def test_records_are_written_by_listener(
+            self, tmp_path, logger, pipeline_module
+    ):
+        path = str(tmp_path / 'bot.log')
+        handler = pipeline_module.start(
+            [pipeline_module.file_handler(path)],
+            '%(levelname)s, %(funcName)s, %(message)s'
+        )
+        logger.addHandler(handler)
+        logger.info('Статус %s', 'approved')
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            logger.exception('Сбой')
+        pipeline_module.stop(handler.listener)
+        with open(path, encoding='utf-8') as file:
+            text = file.read()
+        assert ('INFO, test_records_are_written_by_listener, '
+                'Статус approved') in text
+        assert 'ValueError: boom' in text, (
+            'Трассировка исключения должна попадать в лог.'
+        )
+
+    def test_rotated_files_are_compressed(
+            self, tmp_path, monkeypatch, logger, pipeline_module
+    ):
+        monkeypatch.setenv('LOG_MAX_BYTES', '200')
+        path = str(tmp_path / 'bot.log')
+        handler = pipeline_module.start([pipeline_module.file_handler(path)])
+        logger.addHandler(handler)
+        for number in range(20):
+            logger.warning('строка %d %s', number, 'x' * 40)
+        pipeline_module.stop(handler.listener)
+        backups = sorted(
+            name for name in os.listdir(tmp_path) if name.endswith('.gz')
+        )
+        assert backups, 'Файлы после ротации должны сжиматься.'
+        assert len(backups) <= pipeline_module.BACKUP_COUNT
+        with gzip.open(tmp_path / backups[0], 'rt', encoding='utf-8') as file:
+            assert 'строка' in file.read()
+
+
+class TestSamplingFilter:
+
+    def test_frequent_lines_are_sampled(self, logger, pipeline_module):
+        clock = FakeClock()
+        sampling = pipeline_module.SamplingFilter(
+            burst=3, interval=60, clock=clock
+        )
+        records = []
+
+        class Collect(logging.Handler):
+            def emit(self, record):
+                records.append(record.getMessage())
+
+        handler = Collect()
+        handler.addFilter(sampling)
+        logger.addHandler(handler)
+
+        def poll():
+            logger.info('Статус проверки не изменился.')
+
+        for _ in range(100):
+            poll()
+        for _ in range(5):
+            logger.warning('Предупреждение')
+        assert len(records) == 3 + 5, (
+            'Частые info-записи должны прореживаться, предупреждения - нет.'
+        )
+        clock.now = 60
+        poll()
+        assert records[-1].endswith('[пропущено похожих записей: 97]')
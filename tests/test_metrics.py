@@ -0,0 +1,89 @@
+import threading
+import urllib.request
+
+import pytest
+
+
+@pytest.fixture
+def metrics_module():
+    import metrics
+    return metrics
+
+
+class TestMetrics:
+
+    def test_histogram_render(self, metrics_module):
+        registry = metrics_module.Registry()
+        histogram = registry.histogram('latency', 'Задержка.', (0.1, 1))
+        for value in (0.05, 0.5, 5):
+            histogram.observe(value)
+        text = registry.render()
+        assert '# TYPE latency histogram' in text
+        assert 'latency_bucket{le="0.1"} 1' in text
+        assert 'latency_bucket{le="1"} 2' in text
+        assert 'latency_bucket{le="+Inf"} 3' in text
+        assert 'latency_count 3' in text
+
+    def test_counter_with_label(self, metrics_module):
+        registry = metrics_module.Registry()
+        errors = registry.counter('errors_total', 'Ошибки.', 'exception')
+        errors.inc('HTTPStatusNotOK')
+        errors.inc('HTTPStatusNotOK')
+        errors.inc('ResponseError')
+        text = registry.render()
+        assert 'errors_total{exception="HTTPStatusNotOK"} 2' in text
+        assert 'errors_total{exception="ResponseError"} 1' in text
+
+    def test_gauge(self, metrics_module):
+        registry = metrics_module.Registry()
+        registry.gauge('depth', 'Глубина очереди.', lambda: 7)
+        assert 'depth 7' in registry.render()
+
+    def test_concurrent_updates_are_not_lost(self, metrics_module):
+        registry = metrics_module.Registry()
+        counter = registry.counter('polls_total', 'Опросы.', 'account')
+        histogram = registry.histogram('latency', 'Задержка.', (0.1, 1))
+
+        def work():
+            for number in range(5000):
+                counter.inc('a')
+                histogram.observe(number % 3 * 0.5)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        text = registry.render()
+        assert 'polls_total{account="a"} 40000' in text, (
+            'Увеличения счётчика из разных потоков не должны теряться.'
+        )
+        assert 'latency_count 40000' in text
+        assert 'latency_bucket{le="+Inf"} 40000' in text
+
+    def test_get_api_answer_is_measured(self, monkeypatch, homework_module,
+                                        metrics_module):
+        import requests
+        import utils
+
+        monkeypatch.setattr(
+            requests, 'get', lambda **kwargs: utils.MockResponseGET()
+        )
+        count = metrics_module.API_LATENCY.count
+        homework_module.get_api_answer(0)
+        assert metrics_module.API_LATENCY.count == count + 1
+
+    def test_endpoint(self, metrics_module):
+        registry = metrics_module.Registry()
+        registry.counter('polls_total', 'Опросы.').inc()
+        server = metrics_module.serve(0, registry)
+        try:
+            url = f'http://127.0.0.1:{server.server_port}/metrics'
+            with urllib.request.urlopen(url) as response:
+                body = response.read().decode()
+                content_type = response.headers['Content-Type']
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert 'polls_total 1' in body
+        assert content_type.startswith('text/plain; version=0.0.4')
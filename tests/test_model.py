@@ -0,0 +1,66 @@
+import pytest
+
+
+@pytest.fixture
+def model_module():
+    import model
+    return model
+
+
+class TestModel:
+
+    def test_verdicts_get_first_codes(self, homework_module, model_module):
+        assert [
+            model_module.status_code(status)
+            for status in homework_module.HOMEWORK_VERDICTS
+        ] == [0, 1, 2], (
+            'Статусы из HOMEWORK_VERDICTS должны получать коды по порядку.'
+        )
+
+    @pytest.mark.parametrize('date_updated', [
+        '2024-01-31T23:59:07Z', '2024-02-01', None
+    ])
+    def test_date_round_trip(self, model_module, date_updated):
+        packed = model_module.pack_date(date_updated)
+        assert model_module.unpack_date(packed) == date_updated
+
+    def test_api_date_is_packed_to_int(self, model_module):
+        assert model_module.pack_date('2024-01-31T23:59:07Z') == (
+            20240131235907
+        )
+
+    def test_tracked_record(self, model_module):
+        tracked = model_module.Tracked(
+            'hw.zip', 'approved', '2024-01-31T23:59:07Z'
+        )
+        assert not hasattr(tracked, '__dict__')
+        assert tracked.status == 'approved'
+        assert tracked.date_updated == '2024-01-31T23:59:07Z'
+        assert tracked.matches('hw.zip', 'approved', '2024-01-31T23:59:07Z')
+        assert not tracked.matches('hw.zip', 'rejected',
+                                   '2024-01-31T23:59:07Z')
+        assert not tracked.matches('other.zip', 'approved',
+                                   '2024-01-31T23:59:07Z')
+        assert not tracked.matches('hw.zip', 'unseen', None)
+
+    def test_restored_index_matches_committed(self, model_module):
+        import diff
+        homeworks = [
+            {'id': 1, 'homework_name': 'a.zip', 'status': 'approved',
+             'date_updated': '2024-01-02T00:00:00Z'},
+            {'homework_name': 'b.zip', 'status': 'reviewing',
+             'date_updated': '2024-01-01T00:00:00Z'},
+        ]
+        saved = {}
+        index = diff.HomeworkIndex(
+            on_commit=lambda key, *state: saved.__setitem__(key, state)
+        )
+        for work in reversed(index.transitions(homeworks)):
+            index.commit(work)
+        restored = diff.HomeworkIndex()
+        restored.restore(saved)
+        assert restored.watermark == '2024-01-02T00:00:00Z'
+        assert restored.transitions(homeworks) == [], (
+            'Индекс, восстановленный из хранилища, должен совпадать '
+            'с исходным.'
+        )
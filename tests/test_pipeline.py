@@ -0,0 +1,142 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from test_accounts import RecordingBot, mock_get_by_token
+
+
+@pytest.fixture
+def pipeline_module():
+    import pipeline
+    return pipeline
+
+
+@pytest.fixture
+def accounts_module():
+    import accounts
+    return accounts
+
+
+class TestPipeline:
+
+    def test_items_pass_through_stages(self, pipeline_module):
+        done = []
+        errors = []
+        stages = [
+            pipeline_module.Stage('test-parse', int, workers=2),
+            pipeline_module.Stage('test-square', lambda x: x * x, workers=2),
+            pipeline_module.Stage('test-collect', done.append),
+        ]
+        pipe = pipeline_module.Pipeline(
+            stages, on_error=lambda stage, item, error: errors.append(
+                (stage, item)
+            )
+        )
+        for item in ['1', '2', 'x', '3']:
+            pipe.submit(item)
+        pipe.join()
+        pipe.stop()
+        assert sorted(done) == [1, 4, 9]
+        assert errors == [('test-parse', 'x')], (
+            'Сбой этапа должен передаваться в on_error и не останавливать '
+            'конвейер.'
+        )
+
+    def test_slow_stage_throttles_first_stage(self, pipeline_module):
+        import metrics
+        gate = threading.Event()
+        fetched = []
+
+        def fetch(item):
+            fetched.append(item)
+            return item
+
+        pipe = pipeline_module.Pipeline([
+            pipeline_module.Stage('test-fetch', fetch, queue_size=2),
+            pipeline_module.Stage(
+                'test-send', lambda item: gate.wait(), queue_size=2
+            ),
+        ])
+        producer = threading.Thread(
+            target=lambda: [pipe.submit(number) for number in range(50)],
+            daemon=True
+        )
+        producer.start()
+        time.sleep(0.2)
+        assert len(fetched) <= 5, (
+            'При медленном последнем этапе первый не должен уходить вперёд '
+            'больше чем на размер очередей.'
+        )
+        assert 'homework_stage_queue_depth{stage="test-send"} 2' in (
+            metrics.REGISTRY.render()
+        )
+        gate.set()
+        producer.join()
+        pipe.join()
+        pipe.stop()
+        assert len(fetched) == 50
+        assert 'homework_stage_items_total{stage="test-send"} 50' in (
+            metrics.REGISTRY.render()
+        )
+
+
+class TestPipelinePoller:
+
+    def test_poll_all_keeps_state_per_account(self, monkeypatch,
+                                              accounts_module):
+        monkeypatch.setattr(requests, 'get', mock_get_by_token({
+            'a': 'approved', 'b': 'reviewing'
+        }))
+        accounts = [
+            accounts_module.Account('a', 1),
+            accounts_module.Account('b', 2),
+            accounts_module.Account('c', 3),
+        ]
+        bot = RecordingBot()
+        poller = accounts_module.PipelinePoller(accounts, bot,
+                                                fetch_workers=2)
+        assert poller.poll_all() == [True, True, False]
+        poller.poll_all()
+        poller.shutdown()
+        assert sorted(chat for chat, _ in bot.sent) == [1, 2], (
+            'Каждый изменившийся статус должен отправляться один раз.'
+        )
+
+    def test_error_is_reported_once(self, monkeypatch, accounts_module):
+        def mock_get_with_exception(*args, **kwargs):
+            raise requests.RequestException('Something wrong')
+
+        monkeypatch.setattr(requests, 'get', mock_get_with_exception)
+        bot = RecordingBot()
+        poller = accounts_module.PipelinePoller(
+            [accounts_module.Account('a', 1)], bot
+        )
+        poller.poll_all()
+        poller.poll_all()
+        poller.shutdown()
+        assert len(bot.sent) == 1
+
+
+class TestDeliveryBackpressure:
+
+    def test_submit_waits_for_space(self):
+        import delivery
+        release = threading.Event()
+
+        def send(bot, chat_id, text):
+            release.wait()
+            return True
+
+        queue = delivery.DeliveryQueue(None, maxsize=1, send=send,
+                                       chat_rate=1000, global_rate=1000)
+        queue.submit(1, 'first')
+        time.sleep(0.05)
+        queue.submit(2, 'second')
+        assert queue.submit(3, 'dropped') is False
+        threading.Timer(0.1, release.set).start()
+        assert queue.submit(3, 'waited', wait=1) is True, (
+            'С wait переполненная очередь должна дождаться места.'
+        )
+        assert queue.join(timeout=1)
@@ -0,0 +1,131 @@
+import json
+from http import HTTPStatus
+
+import pytest
+import requests
+from tornado import gen
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+import cursor
+from test_bot import create_mock_response_get_with_custom_status_and_data
+
+
+def make_payload(homework_id, status='approved'):
+    return {
+        'homeworks': [{
+            'id': homework_id,
+            'homework_name': f'hw{homework_id}',
+            'status': status,
+            'date_updated': f'2024-01-01T00:00:{homework_id:02}Z',
+        }],
+        'current_date': 1000198000 + homework_id,
+    }
+
+
+class TestPushServer(AsyncHTTPTestCase):
+
+    def get_app(self):
+        import push_server
+        self.push_server = push_server
+        self.sent = []
+        self.ingest = push_server.PushIngest(
+            lambda homework, verdict: self.sent.append(verdict) or True,
+            timestamp=0
+        )
+        return push_server.make_app(self.ingest, token='secret')
+
+    def publish(self, payload, token='secret'):
+        return self.http_client.fetch(
+            self.get_url('/homeworks'), method='POST',
+            body=json.dumps(payload), headers={'X-Push-Token': token},
+            raise_error=False
+        )
+
+    @gen_test
+    def test_status_is_delivered(self):
+        response = yield self.publish(make_payload(1))
+        assert response.code == 200
+        assert json.loads(response.body) == {'notified': True}
+        assert len(self.sent) == 1 and self.sent[0].startswith(
+            'Изменился статус проверки работы "hw1"'
+        ), 'Push-статус должен проходить через `parse_status`.'
+        assert self.ingest.timestamp == 1000198001 - cursor.OVERLAP
+
+    @gen_test
+    def test_concurrent_publishers(self):
+        responses = yield gen.multi(
+            [self.publish(make_payload(number)) for number in range(40)]
+        )
+        assert all(response.code == 200 for response in responses)
+        assert len(self.sent) == 40
+
+    @gen_test
+    def test_invalid_payload_is_rejected(self):
+        response = yield self.publish({'homeworks': {}})
+        assert response.code == 422, (
+            'Ответ, не прошедший `check_response`, должен отклоняться.'
+        )
+        response = yield self.http_client.fetch(
+            self.get_url('/homeworks'), method='POST', body='{',
+            headers={'X-Push-Token': 'secret'}, raise_error=False
+        )
+        assert response.code == 400
+        assert not self.sent
+
+    @gen_test
+    def test_token_is_required(self):
+        response = yield self.publish(make_payload(1), token='wrong')
+        assert response.code == 403
+        assert not self.sent
+
+    @gen_test
+    def test_missing_token_is_rejected(self):
+        response = yield self.http_client.fetch(
+            self.get_url('/homeworks'), method='POST',
+            body=json.dumps(make_payload(1)), raise_error=False
+        )
+        assert response.code == 403
+        assert not self.sent
+
+    def test_fallback_poll_when_idle(self):
+        mocked_get = create_mock_response_get_with_custom_status_and_data(
+            random_timestamp=1000198000,
+            http_status=HTTPStatus.OK,
+            data=make_payload(7)
+        )
+        original_get = requests.get
+        requests.get = mocked_get
+        try:
+            assert self.ingest.poll_if_idle(fallback_after=3600) is None
+            assert self.ingest.poll_if_idle(fallback_after=0)
+        finally:
+            requests.get = original_get
+        assert len(self.sent) == 1, (
+            'Без push-обновлений бот должен опрашивать API.'
+        )
+
+    @gen_test
+    def test_cursor_advances_without_changes(self):
+        yield self.publish(make_payload(1))
+        payload = make_payload(1)
+        payload['current_date'] += 500
+        response = yield self.publish(payload)
+        assert json.loads(response.body) == {'notified': False}
+        assert self.ingest.timestamp == payload['current_date'] - (
+            cursor.OVERLAP
+        ), 'Курсор должен сдвигаться после каждого проверенного ответа.'
+
+
+class TestListenAddress:
+
+    @pytest.mark.parametrize('host', ['127.0.0.1', '::1', 'localhost'])
+    def test_loopback_without_token(self, host):
+        import push_server
+        push_server.check_listen_address(host, None)
+
+    @pytest.mark.parametrize('host', ['0.0.0.0', '', '10.0.0.5', 'bot.local'])
+    def test_public_address_requires_token(self, host):
+        import push_server
+        with pytest.raises(ValueError):
+            push_server.check_listen_address(host, None)
+        push_server.check_listen_address(host, 'secret')
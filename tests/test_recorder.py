@@ -0,0 +1,106 @@
+import json
+import os
+
+import pytest
+import requests
+
+import utils
+
+
+@pytest.fixture
+def recorder_module():
+    import recorder
+    return recorder
+
+
+def body(status='approved', name='hw1'):
+    return json.dumps({
+        'homeworks': [{'homework_name': name, 'status': status}],
+        'current_date': 0,
+    }).encode()
+
+
+class TestRecorder:
+
+    def test_records_round_trip(self, tmp_path, recorder_module):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path, chunk_size=2)
+        for moment in range(5):
+            recorder.record(moment, 200, 0.01, moment - 1, body())
+        recorder.close()
+        records = list(recorder_module.read_records(path))
+        assert [record.moment for record in records] == list(range(5))
+        assert json.loads(records[0].body)['homeworks'][0]['status'] == (
+            'approved'
+        )
+        assert len(recorder_module.read_index(path)) == 3
+
+    def test_seek_by_timestamp(self, tmp_path, recorder_module):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path, chunk_size=10)
+        for moment in range(100):
+            recorder.record(moment, 200, 0.01, 0, body())
+        recorder.close()
+        assert recorder_module.seek_offset(path, 55) > 0, (
+            'Чтение с момента должно начинаться с нужного блока, '
+            'а не с начала файла.'
+        )
+        moments = [
+            record.moment
+            for record in recorder_module.read_records(path, since=55)
+        ]
+        assert moments == list(range(55, 100))
+
+    def test_seek_past_last_chunk(self, tmp_path, recorder_module):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path, chunk_size=10)
+        for moment in range(30):
+            recorder.record(moment, 200, 0.01, 0, body())
+        recorder.close()
+        assert recorder_module.seek_offset(path, 100) == (
+            os.path.getsize(path)
+        ), 'Позже последнего блока читать нечего - смещение в конец файла.'
+        assert list(recorder_module.read_records(path, since=100)) == []
+
+    def test_truncated_chunk_is_skipped(self, tmp_path, recorder_module):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path, chunk_size=3)
+        for moment in range(6):
+            recorder.record(moment, 200, 0.01, 0, body())
+        recorder.close()
+        with open(path, 'r+b') as file:
+            file.truncate(file.seek(0, 2) - 5)
+        moments = [
+            record.moment for record in recorder_module.read_records(path)
+        ]
+        assert moments[:3] == [0, 1, 2]
+
+    def test_replay_counts_errors(self, tmp_path, recorder_module):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path)
+        recorder.record(0, 200, 0.01, 0, body())
+        recorder.record(1, 200, 0.01, 0, body(status='unknown'))
+        recorder.record(2, 502, 0.01, 0, b'')
+        recorder.close()
+        stats = recorder_module.replay(path)
+        assert stats['polls'] == 3 and stats['homeworks'] == 1
+        assert stats['by_error'] == {
+            'InvalidHomeworks': 1, 'HTTPStatusNotOK': 1
+        }
+
+    def test_get_api_answer_is_recorded(
+            self, tmp_path, monkeypatch, recorder_module, homework_module
+    ):
+        path = str(tmp_path / 'api.jsonl.gz')
+        recorder = recorder_module.Recorder(path)
+        monkeypatch.setattr(homework_module, 'API_RECORDER', recorder)
+
+        class Response(utils.MockResponseGET):
+            content = body()
+
+        monkeypatch.setattr(requests, 'get', Response)
+        homework_module.get_api_answer(123)
+        recorder.close()
+        record, = recorder_module.read_records(path)
+        assert record.from_date == 123 and record.status_code == 200
+        assert record.body == body().decode()
@@ -0,0 +1,91 @@
+import logging
+import random
+
+import pytest
+
+
+@pytest.fixture
+def scheduler_module():
+    import scheduler
+    return scheduler
+
+
+class TestScheduler:
+
+    def test_fixed_interval(self, scheduler_module):
+        policy = scheduler_module.FixedInterval(10)
+        assert policy.delay('approved', ValueError()) == 10
+
+    def test_status_aware(self, scheduler_module):
+        policy = scheduler_module.StatusAware(10)
+        assert policy.delay('reviewing') < policy.delay('approved'), (
+            'Пока работа на проверке, опрос должен быть чаще, '
+            'чем после её принятия.'
+        )
+        assert policy.delay(None) == 10
+
+    def test_backoff_grows_and_resets(self, scheduler_module):
+        policy = scheduler_module.ExponentialBackoff(
+            scheduler_module.FixedInterval(10), jitter=0
+        )
+        delays = [policy.delay(error=ConnectionError()) for _ in range(3)]
+        assert delays == [10, 20, 40]
+        assert policy.delay() == 10, (
+            'После успешного запроса пауза должна сбрасываться.'
+        )
+
+    def test_backoff_jitter_within_bounds(self, scheduler_module):
+        policy = scheduler_module.ExponentialBackoff(
+            scheduler_module.FixedInterval(10), jitter=0.5,
+            rng=random.Random(1)
+        )
+        for failures in range(1, 6):
+            delay = policy.delay(error=ConnectionError())
+            full = 10 * 2 ** (failures - 1)
+            assert full / 2 <= delay <= full
+
+    def test_bounded(self, scheduler_module):
+        policy = scheduler_module.Bounded(
+            scheduler_module.ExponentialBackoff(
+                scheduler_module.FixedInterval(10), jitter=0
+            ),
+            min_delay=15, max_delay=30
+        )
+        delays = [policy.delay(error=ConnectionError()) for _ in range(4)]
+        assert delays == [15, 20, 30, 30]
+
+    def test_backoff_survives_long_outage(self, scheduler_module):
+        policy = scheduler_module.ExponentialBackoff(
+            scheduler_module.FixedInterval(10), jitter=0, max_delay=60
+        )
+        for _ in range(5000):
+            delay = policy.delay(error=ConnectionError())
+        assert delay == 60, (
+            'Пауза при долгой серии ошибок должна упираться в max_delay, '
+            'а не переполнять float.'
+        )
+
+    def test_backoff_is_bounded_by_default(self, monkeypatch,
+                                           scheduler_module):
+        monkeypatch.setenv('POLL_POLICY', 'backoff')
+        monkeypatch.delenv('POLL_MAX_DELAY', raising=False)
+        poll_scheduler = scheduler_module.from_env(10)
+        for _ in range(2000):
+            delay = poll_scheduler.policy.delay(error=ConnectionError())
+        assert delay <= 10 * scheduler_module.MAX_DELAY_MULTIPLIER
+
+    def test_decisions_are_logged(self, caplog, monkeypatch,
+                                  scheduler_module):
+        monkeypatch.setenv('POLL_POLICY', 'status')
+        poll_scheduler = scheduler_module.from_env(10)
+        with caplog.at_level(logging.INFO):
+            poll_scheduler.delay('approved', None)
+        assert any(
+            'status' in record.message and 'approved' in record.message
+            for record in caplog.records
+        ), 'Убедитесь, что каждое решение планировщика логируется.'
+
+    def test_unknown_policy(self, monkeypatch, scheduler_module):
+        monkeypatch.setenv('POLL_POLICY', 'unknown')
+        with pytest.raises(ValueError):
+            scheduler_module.from_env(10)
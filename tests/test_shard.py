@@ -0,0 +1,272 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOKENS = ('a', 'b', 'c', 'd', 'e', 'f')
+
+WORKER = '''
+import json
+import logging
+import sys
+import time
+
+sys.path.insert(0, {root!r})
+import homework
+
+statuses_path, sent_path, accounts_path = sys.argv[1:4]
+
+
+def request_homeworks(timestamp, headers, endpoint=None):
+    token = headers['Authorization'].split()[-1]
+    with open(statuses_path, encoding='utf-8') as file:
+        status = json.load(file)[token]
+    return {{
+        'homeworks': [
+            {{'id': ord(token), 'homework_name': f'hw_{{token}}',
+              'status': status}}
+        ],
+        'current_date': int(time.time()),
+    }}
+
+
+def send_chat_message(bot, chat_id, message):
+    with open(sent_path, 'a', encoding='utf-8') as file:
+        file.write(json.dumps([chat_id, message], ensure_ascii=False) + '\\n')
+    return True
+
+
+homework.request_homeworks = request_homeworks
+homework.send_chat_message = send_chat_message
+homework.RETRY_PERIOD = 0.3
+logging.basicConfig(level=logging.INFO, stream=sys.stdout,
+                    format='%(message)s')
+
+import accounts
+accounts.main(accounts_path)
+'''
+
+
+@pytest.fixture
+def shard_module():
+    import shard
+    return shard
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHashRing:
+
+    def test_join_moves_keys_only_to_new_worker(self, shard_module):
+        keys = [str(number) for number in range(2000)]
+        before = shard_module.HashRing(['w1', 'w2', 'w3'])
+        after = shard_module.HashRing(['w1', 'w2', 'w3', 'w4'])
+        moved = [key for key in keys
+                 if before.owner(key) != after.owner(key)]
+        assert all(after.owner(key) == 'w4' for key in moved), (
+            'При добавлении процесса ключи должны переходить только к нему.'
+        )
+        assert 0.15 < len(moved) / len(keys) < 0.35
+
+    def test_account_key_includes_token(self, shard_module):
+        import accounts
+        keys = {
+            shard_module.account_key(accounts.Account(token, 1))
+            for token in ('a', 'b')
+        }
+        assert len(keys) == 2, (
+            'Аккаунты одного чата с разными токенами должны арендоваться '
+            'отдельно.'
+        )
+
+
+class TestCoordinator:
+
+    def test_leases_are_exclusive(self, tmp_path, shard_module):
+        path = str(tmp_path / 'shard.db')
+        clock = FakeClock()
+        keys = [str(number) for number in range(50)]
+        first = shard_module.Coordinator(path, 'w1', lease_ttl=10,
+                                         clock=clock)
+        second = shard_module.Coordinator(path, 'w2', lease_ttl=10,
+                                          clock=clock)
+        first_owned = first.acquire(first.heartbeat(keys))
+        assert first_owned == set(keys)
+        second_wanted = second.heartbeat(keys)
+        assert second_wanted and second.acquire(second_wanted) == set(), (
+            'Аккаунт в чужой аренде нельзя захватить до её освобождения.'
+        )
+        first_wanted = first.heartbeat(keys)
+        first.release(first_owned - first_wanted)
+        first_owned = first.acquire(first_wanted)
+        second_owned = second.acquire(second_wanted)
+        assert first_owned | second_owned == set(keys)
+        assert not first_owned & second_owned
+
+    def test_dead_worker_leases_are_taken_over(self, tmp_path, shard_module):
+        path = str(tmp_path / 'shard.db')
+        clock = FakeClock()
+        keys = [str(number) for number in range(20)]
+        first = shard_module.Coordinator(path, 'w1', lease_ttl=10,
+                                         clock=clock)
+        second = shard_module.Coordinator(path, 'w2', lease_ttl=10,
+                                          clock=clock)
+        first.acquire(first.heartbeat(keys))
+        second.acquire(second.heartbeat(keys))
+        clock.now = 11
+        assert second.acquire(second.heartbeat(keys)) == set(keys), (
+            'Аккаунты процесса без отметок должны перейти к живым.'
+        )
+
+
+class SlowPoller:
+    delivery = None
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.accounts = []
+
+        class Store:
+            def flush(self):
+                pass
+
+        self.store = Store()
+
+    def restore(self, account):
+        pass
+
+    def settle_deliveries(self, account):
+        pass
+
+    def poll_all(self):
+        time.sleep(self.seconds)
+        return []
+
+
+class TestShardedPoller:
+
+    @pytest.mark.timeout(10)
+    def test_leases_are_renewed_during_long_round(self, tmp_path,
+                                                  shard_module):
+        import accounts
+        path = str(tmp_path / 'shard.db')
+        owned = [accounts.Account(token, 1) for token in TOKENS]
+        sharded = shard_module.ShardedPoller(
+            SlowPoller(1), owned,
+            shard_module.Coordinator(path, 'w1', lease_ttl=0.4)
+        )
+        sharded.rebalance()
+        assert len(sharded.owned) == len(TOKENS)
+        sharded.poll(heartbeat_interval=0.1)
+        other = shard_module.Coordinator(path, 'w2', lease_ttl=0.4)
+        assert other.acquire(sharded.owned) == set(), (
+            'Аренды должны продлеваться, пока идёт долгий опрос.'
+        )
+
+
+def wait_for(condition, timeout=15, message=''):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, message
+        time.sleep(0.02)
+
+
+class TestShardedWorkers:
+
+    @pytest.mark.timeout(60)
+    def test_kill_and_join_without_lost_or_duplicate_notifications(
+            self, tmp_path, homework_module
+    ):
+        statuses_path = tmp_path / 'statuses.json'
+        sent_path = tmp_path / 'sent.jsonl'
+        accounts_path = tmp_path / 'accounts.json'
+        worker_path = tmp_path / 'worker.py'
+        accounts_path.write_text(json.dumps([
+            {'practicum_token': token, 'telegram_chat_id': number}
+            for number, token in enumerate(TOKENS, 1)
+        ]))
+        worker_path.write_text(WORKER.format(root=ROOT_DIR),
+                               encoding='utf-8')
+        sent_path.touch()
+        environment = dict(
+            os.environ,
+            SHARD_DB=str(tmp_path / 'shard.db'),
+            STATE_DB=str(tmp_path / 'state.db'),
+            SHARD_HEARTBEAT='0.1',
+            SHARD_LEASE_TTL='0.8',
+        )
+        workers = {}
+
+        def set_status(status):
+            temporary = tmp_path / 'statuses.tmp'
+            temporary.write_text(json.dumps(dict.fromkeys(TOKENS, status)))
+            os.replace(temporary, statuses_path)
+
+        def start(name):
+            log = open(tmp_path / f'{name}.log', 'w')
+            workers[name] = subprocess.Popen(
+                [sys.executable, str(worker_path), str(statuses_path),
+                 str(sent_path), str(accounts_path)],
+                env=dict(environment, SHARD_WORKER_ID=name),
+                stdout=log, stderr=subprocess.STDOUT, cwd=str(tmp_path)
+            )
+            log.close()
+
+        def rounds(name):
+            text = (tmp_path / f'{name}.log').read_text(encoding='utf-8')
+            return text.count('завершён')
+
+        def sent(status):
+            messages = [
+                json.loads(line)[1]
+                for line in sent_path.read_text(encoding='utf-8').splitlines()
+            ]
+            return [
+                sum(message.count(homework_module.parse_status(
+                    {'homework_name': f'hw_{token}', 'status': status}
+                )) for message in messages)
+                for token in TOKENS
+            ]
+
+        def delivered(status):
+            return lambda: all(sent(status))
+
+        set_status('reviewing')
+        try:
+            for name in ('w1', 'w2', 'w3'):
+                start(name)
+            wait_for(delivered('reviewing'),
+                     message='Не все аккаунты получили первый статус.')
+            done = rounds('w2')
+            wait_for(lambda: rounds('w2') > done)
+            workers.pop('w2').kill()
+            set_status('approved')
+            wait_for(delivered('approved'), message=(
+                'Аккаунты упавшего процесса должны перейти к живым.'
+            ))
+            start('w4')
+            wait_for(lambda: rounds('w4') > 0)
+            set_status('rejected')
+            wait_for(delivered('rejected'), message=(
+                'После присоединения процесса уведомления не должны теряться.'
+            ))
+            time.sleep(1)
+        finally:
+            for process in workers.values():
+                process.kill()
+                process.wait()
+        for status in ('reviewing', 'approved', 'rejected'):
+            assert sent(status) == [1] * len(TOKENS), (
+                f'Каждый аккаунт должен получить статус {status} '
+                f'ровно один раз: {sent(status)}'
+            )
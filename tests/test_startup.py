@@ -0,0 +1,76 @@
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_VARS = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
+
+HEAVY_MODULES = ('dotenv', 'http.server', 'requests.adapters', 'telegram.bot')
+
+
+class TestStartup:
+
+    def test_import_does_not_load_heavy_modules(self):
+        loaded = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, homework; '
+             f'print(*[name for name in {HEAVY_MODULES!r} '
+             'if name in sys.modules])'],
+            cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+            timeout=10
+        ).stdout.split()
+        assert loaded == [], (
+            'Импорт homework не должен загружать тяжёлые зависимости: '
+            f'{loaded}'
+        )
+
+    @pytest.mark.timeout(10)
+    def test_lazy_module_loads_on_attribute_access(self):
+        import lazy
+        module = lazy.module('requests')
+        assert module.RequestException.__name__ == 'RequestException'
+        with pytest.raises(ModuleNotFoundError):
+            lazy.module('no_such_module_for_startup_test')
+
+    def test_configure_reads_environment(self, monkeypatch, homework_module):
+        for name in ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN',
+                     'TELEGRAM_CHAT_ID', 'HEADERS'):
+            monkeypatch.setattr(homework_module, name,
+                                getattr(homework_module, name))
+        monkeypatch.setenv('PRACTICUM_TOKEN', 'fresh')
+        homework_module.configure()
+        assert homework_module.PRACTICUM_TOKEN == 'fresh'
+        assert homework_module.HEADERS == {'Authorization': 'OAuth fresh'}
+
+
+class TestEntryPoint:
+
+    @pytest.mark.timeout(30)
+    @pytest.mark.parametrize('mode', [
+        {}, {'ACCOUNTS_FILE': 'accounts.json'}, {'BOT_MODE': 'async'},
+        {'INGEST_MODE': 'push'},
+    ])
+    def test_modes_share_script_module(self, tmp_path, mode):
+        shutil.copy(os.path.join(ROOT_DIR, 'homework.py'), tmp_path)
+        (tmp_path / '.env').write_text(
+            'PRACTICUM_TOKEN=token\n'
+            'TELEGRAM_TOKEN=invalid\n'
+            'TELEGRAM_CHAT_ID=1\n'
+        )
+        environment = {
+            name: value for name, value in os.environ.items()
+            if name not in ENV_VARS
+        }
+        environment.update(mode, PYTHONPATH=ROOT_DIR, AUDIO_BACKEND='null')
+        output = subprocess.run(
+            [sys.executable, 'homework.py'], cwd=tmp_path, env=environment,
+            capture_output=True, text=True, timeout=25
+        ).stderr
+        assert 'Не валидные переменные окружения' not in output, (
+            f'Режим {mode} должен видеть токены из .env, прочитанные '
+            'при запуске скрипта.'
+        )
+        assert 'InvalidToken' in output, output
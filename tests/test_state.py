@@ -0,0 +1,111 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+WRITER = '''
+import sys
+sys.path.insert(0, {root!r})
+import state
+store = state.StateStore({path!r}, batch_size=10 ** 9, flush_interval=10 ** 9)
+cursor = 0
+while True:
+    cursor += 1
+    store.save_cursor('acc', cursor)
+    for number in range(50):
+        store.save_homework('acc', [number, 'hw'], 'approved', str(cursor))
+    store.flush()
+    if cursor == 1:
+        print('ready', flush=True)
+'''
+
+
+@pytest.fixture
+def state_module():
+    import state
+    return state
+
+
+class TestStateStore:
+
+    def test_roundtrip(self, tmp_path, state_module):
+        path = str(tmp_path / 'state.db')
+        store = state_module.StateStore(path)
+        store.save_cursor(12345, 1000)
+        store.save_homework(12345, (1, 'hw1'), 'approved', '2024-01-01')
+        store.save_error(12345, 'Сбой')
+        store.close()
+        saved = state_module.StateStore(path).load(12345)
+        assert saved == state_module.AccountState(
+            1000, {(1, 'hw1'): ('approved', '2024-01-01')}, 'Сбой'
+        ), 'Убедитесь, что состояние восстанавливается после перезапуска.'
+
+    def test_writes_are_batched(self, tmp_path, state_module):
+        path = str(tmp_path / 'state.db')
+        store = state_module.StateStore(path, batch_size=3,
+                                        flush_interval=3600)
+        reader = state_module.StateStore(path)
+        for cursor in range(2):
+            store.save_cursor(cursor, cursor)
+            store.maybe_flush()
+        assert reader.load(0).from_date is None, (
+            'Изменения должны записываться пачками.'
+        )
+        store.save_cursor(2, 2)
+        store.maybe_flush()
+        assert reader.load(0).from_date == 0
+
+    def test_null_store(self, state_module):
+        store = state_module.open_store(None)
+        store.save_cursor(1, 1)
+        assert store.load(1) == state_module.EMPTY_STATE
+
+    @pytest.mark.timeout(10)
+    def test_crash_during_write(self, tmp_path, state_module):
+        path = str(tmp_path / 'state.db')
+        writer = subprocess.Popen(
+            [sys.executable, '-c', WRITER.format(root=ROOT_DIR, path=path)],
+            stdout=subprocess.PIPE
+        )
+        assert writer.stdout.readline().strip() == b'ready'
+        time.sleep(0.3)
+        writer.send_signal(signal.SIGKILL)
+        writer.wait()
+        writer.stdout.close()
+        connection = sqlite3.connect(path)
+        assert connection.execute(
+            'PRAGMA integrity_check'
+        ).fetchone() == ('ok',)
+        connection.close()
+        saved = state_module.StateStore(path).load('acc')
+        assert saved.from_date >= 1
+        assert {
+            date_updated for _, date_updated in saved.homeworks.values()
+        } == {str(saved.from_date)}, (
+            'Пачка изменений должна записываться атомарно.'
+        )
+
+    def test_index_resumes_from_store(self, tmp_path, state_module):
+        import diff
+        path = str(tmp_path / 'state.db')
+        store = state_module.StateStore(path)
+        index = diff.HomeworkIndex(on_commit=lambda *row: store.save_homework(
+            'acc', *row
+        ))
+        homeworks = [{'id': 1, 'homework_name': 'hw1', 'status': 'approved',
+                      'date_updated': '2024-01-01'}]
+        for homework in index.transitions(homeworks):
+            index.commit(homework)
+        store.close()
+        restored = diff.HomeworkIndex()
+        restored.restore(state_module.StateStore(path).load('acc').homeworks)
+        assert restored.transitions(homeworks) == [], (
+            'После перезапуска уже отправленный статус не должен '
+            'отправляться повторно.'
+        )
@@ -0,0 +1,87 @@
+import pytest
+
+from exceptions import InvalidHomeworks
+
+
+@pytest.fixture
+def validator_module():
+    import validator
+    return validator
+
+
+def homework(number=1, **fields):
+    item = {
+        'id': number,
+        'homework_name': f'hw{number}',
+        'status': 'approved',
+        'date_updated': '2024-01-01T00:00:00Z',
+        'lesson_name': 'lesson',
+    }
+    item.update(fields)
+    return {key: value for key, value in item.items() if value is not ...}
+
+
+class TestValidator:
+
+    def test_valid_payload(self, homework_module):
+        items = [homework(number) for number in range(1000)]
+        items.append(homework(1000, id=..., date_updated=...))
+        items.append(homework(1001, date_updated=None))
+        assert homework_module.validate_homeworks(items) == [], (
+            'Корректные работы и работы без необязательных полей должны '
+            'проходить проверку.'
+        )
+
+    @pytest.mark.parametrize('item, expected', [
+        (homework(status='unknown'), '1: недопустимое значение ключа "status"'),
+        (homework(status=['approved']), 'ключа "status"'),
+        (homework(homework_name=...), '1: нет ключа "homework_name"'),
+        (homework(homework_name=5), 'ключ "homework_name" должен быть str'),
+        (homework(id='1'), 'ключ "id" должен быть int, вместо str'),
+        (homework(id=1.5), 'ключ "id" должен быть int, вместо float'),
+        (homework(date_updated='2024-01-01'), 'ключа "date_updated"'),
+        (homework(date_updated='2024-01-01T00:00:00Z\n'
+                                '2024-01-01T00:00:00Z'), 'date_updated'),
+        (homework(date_updated='2024-01-01T00:00:0٣Z'), 'date_updated'),
+        ('hw', '1: запись должна быть словарём, вместо str'),
+    ])
+    def test_single_violation(self, item, expected, homework_module):
+        violations = homework_module.validate_homeworks([homework(0), item])
+        assert len(violations) == 1 and expected in violations[0], (
+            f'Ожидалось одно нарушение «{expected}», получено {violations}.'
+        )
+
+    def test_all_violations_are_reported(self, homework_module):
+        items = [homework(number) for number in range(100)]
+        items[10] = homework(10, status='unknown', id='10')
+        items[50] = homework(50, homework_name=...)
+        violations = homework_module.validate_homeworks(items)
+        assert [violation.split(':')[0] for violation in violations] == [
+            '10', '10', '50'
+        ], 'Все нарушения должны собираться за одну проверку.'
+
+    def test_custom_schema(self, validator_module):
+        validate = validator_module.compile_items([
+            validator_module.Field('code', {1, 2}, required=True),
+            validator_module.Field('day', validator_module.Mask('00.00')),
+        ])
+        assert validate([{'code': 1, 'day': '31.12'}, {'code': 2}]) == []
+        assert validate([{'code': 3, 'day': '1.1'}]) == [
+            '0: недопустимое значение ключа "code" - 3',
+            "0: значение ключа \"day\" не в формате 00.00 - '1.1'",
+        ]
+
+
+class TestCheckResponse:
+
+    def test_invalid_homeworks_raise_with_all_violations(
+            self, homework_module
+    ):
+        response = {'homeworks': [
+            homework(number, status='unknown') for number in range(20)
+        ], 'current_date': 0}
+        with pytest.raises(InvalidHomeworks) as error:
+            homework_module.check_response(response)
+        assert len(error.value.violations) == 20
+        assert 'нарушений 20' in str(error.value)
+        assert isinstance(error.value, ValueError)
@@ -0,0 +1,173 @@
+"""Проверка списков записей по схеме, скомпилированной в проверки столбцов.
+
+По описанию полей один раз строятся проверки, каждая из которых одним
+проходом на уровне C (map, set, join, bytes.translate) проверяет поле
+сразу во всех записях, без вызова функций Python на каждую запись.
+Подробные описания нарушений собираются, только если быстрая проверка
+не прошла.
+"""
+from collections import namedtuple
+from functools import partial
+from operator import is_not, itemgetter, methodcaller
+
+
+ITEM_NOT_DICT = '{index}: запись должна быть словарём, вместо {type}'
+FIELD_MISSING = '{index}: нет ключа "{name}"'
+FIELD_TYPE = (
+    '{index}: ключ "{name}" должен быть {expected}, вместо {type}'
+)
+FIELD_CHOICE = '{index}: недопустимое значение ключа "{name}" - {value!r}'
+FIELD_FORMAT = (
+    '{index}: значение ключа "{name}" не в формате {expected} - {value!r}'
+)
+
+Field = namedtuple('Field', ('name', 'kind', 'required'), defaults=(False,))
+Field.__doc__ = (
+    'Поле записи: kind - тип, Mask или набор допустимых значений.'
+)
+
+
+class Mask(str):
+    """Формат строки фиксированной длины: 0 - любая цифра."""
+
+
+DATE = Mask('0000-00-00T00:00:00Z')
+
+DIGITS = bytes.maketrans(b'123456789', b'000000000')
+SEPARATOR = '\n'
+
+not_none = partial(is_not, None)
+
+
+def masked(value):
+    """Строка с цифрами, заменёнными на 0; ValueError не для ASCII."""
+    try:
+        return value.encode('ascii').translate(DIGITS)
+    except UnicodeEncodeError as error:
+        raise ValueError(value) from error
+
+
+def int_check(values):
+    """Все значения - целые: сумма целых остаётся int."""
+    return type(sum(values)) is int
+
+
+def str_check(values):
+    """Все значения - строки: join принимает только строки."""
+    SEPARATOR.join(values)
+    return True
+
+
+def type_check(kind, values):
+    """Все значения ровно типа kind."""
+    return set(map(type, values)) <= {kind}
+
+
+def choice_check(allowed, values):
+    """Все значения из набора допустимых."""
+    return set(values) <= allowed
+
+
+def mask_check(pattern, values):
+    """Все строки по маске: одна замена цифр на весь столбец."""
+    values.append('')
+    return masked(SEPARATOR.join(values)) == pattern * (len(values) - 1)
+
+
+def compile_field(field):
+    """Проверка столбца значений одного поля."""
+    if isinstance(field.kind, Mask):
+        return partial(mask_check, masked(field.kind + SEPARATOR))
+    if field.kind is int:
+        return int_check
+    if field.kind is str:
+        return str_check
+    if isinstance(field.kind, type):
+        return partial(type_check, field.kind)
+    return partial(choice_check, frozenset(field.kind))
+
+
+def compile_column(field):
+    """Извлечение и проверка поля во всех записях."""
+    check = compile_field(field)
+    getter = itemgetter(field.name)
+    soft_getter = methodcaller('get', field.name)
+
+    def column(items):
+        try:
+            if check(list(map(getter, items))):
+                return True
+        except (KeyError, TypeError, ValueError):
+            pass
+        if field.required:
+            return False
+        try:
+            return check(list(filter(not_none, map(soft_getter, items))))
+        except (AttributeError, TypeError, ValueError):
+            return False
+    return column
+
+
+def compile_items(fields):
+    """Функция проверки списка записей: список нарушений или пустой."""
+    fields = tuple(fields)
+    columns = tuple(compile_column(field) for field in fields)
+
+    def validate(items):
+        if all(column(items) for column in columns):
+            return []
+        return [
+            violation for index, item in enumerate(items)
+            for violation in describe(fields, index, item)
+        ]
+    return validate
+
+
+def valid(field, value):
+    """Соответствие одного значения виду поля."""
+    if isinstance(field.kind, Mask):
+        try:
+            return isinstance(value, str) and (
+                masked(value) == masked(field.kind)
+            )
+        except ValueError:
+            return False
+    if isinstance(field.kind, type):
+        return isinstance(value, field.kind) if field.kind is int else (
+            type(value) is field.kind
+        )
+    try:
+        return value in field.kind
+    except TypeError:
+        return False
+
+
+def describe(fields, index, item):
+    """Все нарушения схемы в одной записи."""
+    if not isinstance(item, dict):
+        return [ITEM_NOT_DICT.format(index=index, type=type(item).__name__)]
+    violations = []
+    for field in fields:
+        value = item.get(field.name)
+        if value is None:
+            if field.required:
+                violations.append(
+                    FIELD_MISSING.format(index=index, name=field.name)
+                )
+        elif valid(field, value):
+            continue
+        elif isinstance(field.kind, Mask):
+            violations.append(FIELD_FORMAT.format(
+                index=index, name=field.name, expected=field.kind,
+                value=value
+            ))
+        elif isinstance(field.kind, type):
+            violations.append(FIELD_TYPE.format(
+                index=index, name=field.name,
+                expected=field.kind.__name__, type=type(value).__name__
+            ))
+        else:
+            violations.append(FIELD_CHOICE.format(
+                index=index, name=field.name, value=value
+            ))
+    return violations